@@ -0,0 +1,56 @@
+"""
+Conditional GETs from version counters (apps.workspace.utils.versions).
+
+The ETag of a response is derived from the versions of everything it renders,
+the requesting user, the full path and the renderer, all known before the view
+runs: a matching If-None-Match is answered 304 after a single cache lookup,
+without touching the database. Every write bumps the versions it affects, so a
+client can only hold a current ETag for data that is still current.
+
+That holds only if every process sees every bump: with a process-local cache
+(see apps.workspace.utils.shared_cache) responses carry no ETag and
+If-None-Match is ignored.
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from apps.workspace.utils.shared_cache import is_cache_shared
+from apps.workspace.utils.versions import get_versions
+
+
+def _etag(request, versions):
+    renderer = getattr(request, "accepted_media_type", "")
+    raw = "|".join([request.get_full_path(), str(request.user.pk), renderer, *map(str, versions)])
+    return '"%s"' % hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def versioned_etag(version_keys):
+    """
+    Decorates a GET view method. `version_keys(view, request, **kwargs)`
+    returns the version keys covering the response; permission checks have
+    already run. Responses carry ETag / Last-Modified and `private, no-cache`,
+    so browsers revalidate every poll.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            if not is_cache_shared():
+                return method(view, request, *args, **kwargs)
+            versions = get_versions(version_keys(view, request, **kwargs))
+            etag = _etag(request, versions)
+
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = method(view, request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                response.headers.setdefault("ETag", etag)
+                # Informational: one-second resolution is too coarse to
+                # answer If-Modified-Since from, so only If-None-Match is
+                response.headers.setdefault("Last-Modified", http_date(max(versions) / 1e9))
+                patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,164 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the ordering values of the row they start after rather
+than by an offset, so the database seeks straight to the page through the
+matching index: page 1000 costs what page 1 costs, and rows inserted meanwhile
+neither shift nor duplicate results. The ordering must be unique, hence the
+trailing `id`.
+"""
+import base64
+import binascii
+import datetime
+import json
+import uuid
+from functools import reduce
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.users.utils.user_cache import get_cached_page_size
+
+API_MAX_PAGE_SIZE = getattr(settings, "API_MAX_PAGE_SIZE", 100)
+
+
+def _field_value(obj, name):
+    return obj[name] if isinstance(obj, dict) else getattr(obj, name)
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def keyset_q(ordering, values):
+    """
+    Rows strictly after `values` in `ordering` ("-created_at", "-id", ...):
+    (a > x) OR (a = x AND b > y) OR ... with each comparison following the
+    direction of its field.
+    """
+    clauses = []
+    for i, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        equal = {f.lstrip("-"): v for f, v in zip(ordering[:i], values[:i])}
+        clauses.append(Q(**equal, **{f"{name}__{lookup}": values[i]}))
+    return reduce(lambda a, b: a | b, clauses)
+
+
+def _reversed(ordering):
+    return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over `ordering`, which a view overrides with a
+    `keyset_ordering` attribute. Pages may hold instances or values() dicts.
+    The page size is `?page_size=`, else the user's
+    UserSettings.items_per_page, capped at API_MAX_PAGE_SIZE.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "keyset_ordering", self.ordering))
+
+    def get_page_size(self, request):
+        size = request.query_params.get(self.page_size_query_param)
+        if size is None and request.user.is_authenticated:
+            size = get_cached_page_size(request.user.pk)
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(max(size, 1), API_MAX_PAGE_SIZE)
+
+    def decode_cursor(self, request, model):
+        """
+        Returns the cursor's (values, reverse), each value converted by the
+        model field it orders on, so a tampered cursor is a 404 rather than an
+        error from the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            values, reverse = data["v"], bool(data.get("r"))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            fields = [model._meta.get_field(f.lstrip("-")) for f in self.ordering]
+            values = [field.to_python(value) for field, value in zip(fields, values)]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound("Invalid cursor.")
+        if None in values:
+            raise NotFound("Invalid cursor.")
+        return values, reverse
+
+    def encode_cursor(self, obj, reverse):
+        values = [_encode_value(_field_value(obj, f.lstrip("-"))) for f in self.ordering]
+        data = json.dumps({"v": values, "r": int(reverse)}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.ordering = self.get_ordering(view)
+        self.base_url = request.build_absolute_uri()
+        size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, queryset.model)
+
+        ordering = _reversed(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(keyset_q(ordering, values))
+
+        rows = list(queryset[:size + 1])
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+
+        self.page = rows
+        self.has_next = has_more if not reverse else True
+        self.has_previous = values is not None if not reverse else has_more
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
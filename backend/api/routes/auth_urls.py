@@ -1,11 +1,13 @@
 from django.urls import path
-from api.views.auth_views import GoogleLogin, RequestOTPView, VerifyOTPView, ResetPasswordView
+from api.views.auth_views import GoogleLogin, LogoutView, RequestOTPView, VerifyOTPView, ResetPasswordView
 from django.urls import path, include
 # Import SimpleJWT views for standard token refresh
 from rest_framework_simplejwt.views import TokenVerifyView, TokenRefreshView
 
 urlpatterns = [
     # 1. Standard Auth (Login, Logout, Password Change, User details)
+    # Logout also revokes the access token; listed first to take over dj_rest_auth's route
+    path('logout/', LogoutView.as_view(), name='rest_logout'),
     path('', include('dj_rest_auth.urls')),
 
     # 2. Registration (Uses your CustomRegisterSerializer)
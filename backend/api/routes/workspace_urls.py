@@ -15,6 +15,8 @@ from ..views.workspace_views import (
 from api.views.dashboard_views import (
     WorkspaceDashboardView
 )
+from api.views.analytics_views import TaskAnalyticsView
+from api.views.activity_views import WorkspaceActivityView
 
 router = DefaultRouter()
 router.register(r'', WorkspaceViewSet, basename='workspace')
@@ -28,6 +30,26 @@ urlpatterns = [
         WorkspaceDashboardView.as_view(),
         name="workspace-dashboard"
     ),
+    path(
+        "<uuid:workspace_id>/activity/",
+        WorkspaceActivityView.as_view(),
+        name="workspace-activity"
+    ),
+    path(
+        "<uuid:workspace_id>/analytics/throughput/",
+        TaskAnalyticsView.as_view(metrics=("created", "started", "completed")),
+        name="workspace-analytics-throughput"
+    ),
+    path(
+        "<uuid:workspace_id>/analytics/burndown/",
+        TaskAnalyticsView.as_view(metrics=("open", "overdue", "completed")),
+        name="workspace-analytics-burndown"
+    ),
+    path(
+        "<uuid:workspace_id>/analytics/velocity/",
+        TaskAnalyticsView.as_view(metrics=("completed",), default_period="week"),
+        name="workspace-analytics-velocity"
+    ),
     path(
         "invitations/",
         GetWorkspaceInvitationsView.as_view(),
@@ -1,19 +1,28 @@
 # workspace/serializers.py
 from rest_framework import serializers
+from api.serializers.mixins import DynamicFieldsMixin
 from apps.workspace.models import Workspace, WorkspaceMember, WorkspaceInvitation, WorkspaceChannel, Project, Task, ActivityLog
-from api.serializers.user_serializers import UserSerializer 
+from operator import itemgetter
+from api.serializers.user_serializers import UserSerializer, UserCardField, user_cards
 
-class DashboardMemberSerializer(serializers.ModelSerializer):
+
+def _actor_name(card):
+    return card["full_name"] or card["username"] or card["email"]
+
+class DashboardMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = WorkspaceMember
         fields = ['id', 'user', 'role']
 
-class DashboardProjectSerializer(serializers.ModelSerializer):
+class DashboardProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     # Calculate progress percentage on the fly
     progress = serializers.SerializerMethodField()
     collaborators = serializers.SerializerMethodField()
 
+    related_sources = {"collaborators": ("members",)}
+    user_card_sources = {"collaborators": ("members.user",)}
+
     class Meta:
         model = Project
         fields = ['id', 'title', 'status', 'updated_at', 'progress', 'collaborators']
@@ -26,40 +35,28 @@ class DashboardProjectSerializer(serializers.ModelSerializer):
 
     def get_collaborators(self, obj):
         # Return first 3 members for the UI avatars
-        members = obj.members.select_related('user')[:4]
+        # Slicing .all() reads the prefetched members when the view planned them
+        members = obj.members.all()[:4]
+        cards = user_cards(self).get_many(self, (m.user_id for m in members))
         return [{
             "user": {
-                "username": m.user.profile.username, 
-                "avatar": m.user.profile.avatar.url if m.user.profile.avatar else None}
-        } for m in members]
+                "username": cards[str(m.user_id)]["username"],
+                "avatar": cards[str(m.user_id)]["avatar"]}
+        } for m in members if str(m.user_id) in cards]
 
-class DashboardTaskSerializer(serializers.ModelSerializer):
+class DashboardTaskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     project_title = serializers.CharField(source='project.title', read_only=True)
     
     class Meta:
         model = Task
         fields = ['id', 'title', 'priority', 'due_date', 'project_title', 'status']
 
-class ActivityLogSerializer(serializers.ModelSerializer):
-    actor_name = serializers.SerializerMethodField()
-    actor_username = serializers.CharField(source='actor.profile.username', read_only=True)
-    actor_avatar = serializers.SerializerMethodField()
+class ActivityLogSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Full name, else username, else email
+    actor_name = UserCardField(_actor_name, source='actor')
+    actor_username = UserCardField(itemgetter("username"), source='actor')
+    actor_avatar = UserCardField(itemgetter("avatar"), source='actor')
 
     class Meta:
         model = ActivityLog
         fields = ['id', 'actor_name', 'actor_username', 'actor_avatar', 'action_type', 'target_text', 'created_at']
-
-    def get_actor_name(self, obj):
-        if hasattr(obj.actor, 'profile'):
-            fn = (obj.actor.profile.first_name or "").strip()
-            ln = (obj.actor.profile.last_name or "").strip()
-            name = f"{fn} {ln}".strip()
-            if name:
-                return name
-            return obj.actor.profile.username
-        return obj.actor.email
-
-    def get_actor_avatar(self, obj):
-        if hasattr(obj.actor, 'profile') and obj.actor.profile.avatar:
-            return obj.actor.profile.avatar.url
-        return None
\ No newline at end of file
@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from api.serializers.mixins import DynamicFieldsMixin
 from apps.workspace.models.document import WorkspaceDocument
 from api.serializers.user_serializers import UserSerializer
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
     file_url = serializers.SerializerMethodField()
 
@@ -0,0 +1,77 @@
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_field_tree(value):
+    """"id,tasks.title,tasks.comments" -> {"id": {}, "tasks": {"title": {}, "comments": {}}}"""
+    tree = {}
+    for path in (value or "").split(","):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split("."))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets and opt-in expansion, driven by the root serializer's
+    request:
+
+    - `?fields=id,title,tasks.title` keeps only the listed fields (dotted
+      names reach into nested serializers) on safe methods;
+    - fields named in `expandable_fields` are collapsed unless requested with
+      `?expand=` (or named in `?fields=`): to their primary key when
+      single-valued, dropped otherwise.
+
+    Trimming happens in get_fields, so query planning of the same instance
+    (see QueryPlanMixin) neither joins nor prefetches what is not rendered.
+    """
+    expandable_fields = ()
+
+    # Set by a dynamic parent for its nested serializers; None means "read
+    # from the request" at the root, "everything" / "nothing" when nested
+    _requested_fields = None
+    _requested_expand = None
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _requested(self):
+        only, expand = self._requested_fields, self._requested_expand
+        if expand is None:
+            expand = {}
+            request = self.context.get("request") if self._is_root() else None
+            if request is not None:
+                params = getattr(request, "query_params", request.GET)
+                expand = parse_field_tree(params.get("expand"))
+                if request.method in SAFE_METHODS and params.get("fields"):
+                    only = parse_field_tree(params["fields"])
+        return only, expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._requested()
+
+        if only is not None:
+            fields = {name: field for name, field in fields.items() if name in only}
+
+        for name in self.expandable_fields:
+            field = fields.get(name)
+            if field is None or name in expand or (only and name in only):
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                del fields[name]
+            else:
+                fields[name] = serializers.PrimaryKeyRelatedField(
+                    source=field.source, read_only=True
+                )
+
+        for name, field in fields.items():
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, DynamicFieldsMixin):
+                nested._requested_fields = (only or {}).get(name) or None
+                nested._requested_expand = expand.get(name, {})
+        return fields
@@ -1,10 +1,11 @@
 # # serializers.py
 from rest_framework import serializers
+from api.serializers.mixins import DynamicFieldsMixin
 from apps.notifications.models import Notification
 from rest_framework import serializers
 from api.serializers.user_serializers import UserSerializer
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     actor = UserSerializer(read_only=True)
     
     # Helper fields for frontend routing
@@ -1,12 +1,14 @@
 # serializers.py
 from rest_framework import serializers
+from api.serializers.mixins import DynamicFieldsMixin
+from django.db.models import Prefetch
 from api.serializers.user_serializers import UserSerializer
 from apps.workspace.models import Workspace, Project, Task, Comment, ProjectMember, WorkspaceMember
 from django.utils import timezone
 from rest_framework.validators import UniqueTogetherValidator
 
 
-class ProjectMemberSerializer(serializers.ModelSerializer):
+class ProjectMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.UUIDField(write_only=True)
 
@@ -26,7 +28,7 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         }
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
 
     class Meta:
@@ -41,7 +43,7 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only_fields = ("id", "author", "created_at")
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     started_by = serializers.CharField(
         source="started_by.profile.username", read_only=True
     )
@@ -51,6 +53,9 @@ class TaskSerializer(serializers.ModelSerializer):
     due_date = serializers.DateField(required=False, allow_null=True)
     comments = CommentSerializer(many=True, read_only=True)
 
+    # Comments are only rendered (and fetched) with ?expand=comments
+    expandable_fields = ("comments",)
+
     class Meta:
         model = Task
         fields = "__all__"
@@ -59,6 +64,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "project",
+            "started_at",
             "completed_at",
             "started_by",
         )
@@ -73,7 +79,7 @@ class TaskWriteSerializer(serializers.ModelSerializer):
         # We hide fields that should not be touched during creation
         read_only_fields = (
             "id", "created_at", "updated_at", "project", 
-            "completed_at", "started_by", "created_by", "assigned_to"
+            "started_at", "completed_at", "started_by", "created_by", "assigned_to"
         )
 
     def validate_assign_user_id(self, value):
@@ -123,10 +129,95 @@ class TaskWriteSerializer(serializers.ModelSerializer):
 
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+# Members embedded in each project of a list
+PROJECT_MEMBER_PREVIEW_SIZE = 5
+
+
+def _user_membership_prefetch(user):
+    """The requesting user's own ProjectMember row, as project.user_memberships."""
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    return Prefetch(
+        "members",
+        queryset=ProjectMember.objects.filter(user_id=user_id),
+        to_attr="user_memberships",
+    )
+
+
+def _user_permission(serializer, obj, members):
+    request = serializer.context.get("request")
+    if not request or not request.user.is_authenticated:
+        return None
+
+    member = next((m for m in members if m.user_id == request.user.id), None)
+    if not member:
+        return None
+
+    return {
+        "permission": member.permission,
+        "joined_at": member.created_at,
+    }
+
+
+class ProjectListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact project representation for lists: counts come from the project's
+    counters row (joined by setup_queryset) and `members` is a preview of at most
+    PROJECT_MEMBER_PREVIEW_SIZE members, so a page costs a constant number of
+    queries whatever the number of tasks, comments or members.
+    """
+    task_count = serializers.IntegerField(source="counters.tasks", read_only=True)
+    completed_count = serializers.IntegerField(source="counters.tasks_completed", read_only=True)
+    member_count = serializers.IntegerField(source="counters.members", read_only=True)
+    created_by = serializers.CharField(
+        source="created_by.profile.username", read_only=True
+    )
+    members = ProjectMemberSerializer(source="member_preview", many=True, read_only=True)
+    user_permission = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project
+        fields = [
+            "id",
+            "title",
+            "description",
+            "status",
+            "visibility",
+            "task_count",
+            "completed_count",
+            "member_count",
+            "created_by",
+            "created_at",
+            "updated_at",
+            "user_permission",
+            "members",
+        ]
+        read_only_fields = fields
+
+    @staticmethod
+    def setup_queryset(queryset, user):
+        """Joins and prefetches the list representation reads."""
+        return queryset.select_related("created_by__profile", "counters").prefetch_related(
+            Prefetch(
+                "members",
+                queryset=ProjectMember.objects.order_by("created_at")[:PROJECT_MEMBER_PREVIEW_SIZE],
+                to_attr="member_preview",
+            ),
+            _user_membership_prefetch(user),
+        )
+
+    def get_user_permission(self, obj):
+        return _user_permission(self, obj, getattr(obj, "user_memberships", None) or [])
+
+
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Full project representation for detail views, with every task and member
+    (and comments with ?expand=tasks.comments). setup_queryset is the matching
+    prefetch plan; query planning adds the comments when expanded.
+    """
     tasks = TaskSerializer(many=True, read_only=True)
-    task_count = serializers.SerializerMethodField()
-    completed_count = serializers.SerializerMethodField()
+    task_count = serializers.IntegerField(source="counters.tasks", read_only=True)
+    completed_count = serializers.IntegerField(source="counters.tasks_completed", read_only=True)
     created_by = serializers.CharField(
         source="created_by.profile.username", read_only=True
     )
@@ -134,6 +225,10 @@ class ProjectSerializer(serializers.ModelSerializer):
     collaborators = ProjectMemberSerializer(source='members', many=True, read_only=True)
     user_permission = serializers.SerializerMethodField()
 
+    related_sources = {
+        "user_permission": ("members",),
+    }
+
     class Meta:
         model = Project
         fields = [
@@ -160,26 +255,21 @@ class ProjectSerializer(serializers.ModelSerializer):
             "tasks",
         )
 
-    def get_task_count(self, obj):
-        return obj.tasks.count()
-
-    def get_completed_count(self, obj):
-        return obj.tasks.filter(status=Task.StatusChoices.COMPLETED).count()
+    @staticmethod
+    def setup_queryset(queryset, user=None):
+        """Prefetch plan for tasks and members."""
+        return queryset.select_related("created_by__profile", "counters").prefetch_related(
+            Prefetch(
+                "tasks",
+                queryset=Task.objects.select_related(
+                    "started_by__profile", "assigned_to__profile"
+                ),
+            ),
+            "members",
+        )
 
-    
     def get_user_permission(self, obj):
-        request = self.context.get("request")
-        if not request or not request.user.is_authenticated:
-            return None
-
-        member = obj.members.filter(user=request.user).first()
-        if not member:
-            return None
-
-        return {
-            "permission": member.permission,
-            "joined_at": member.created_at,
-        }
+        return _user_permission(self, obj, obj.members.all())
 
 
 class ProjectWriteSerializer(serializers.ModelSerializer):
@@ -0,0 +1,184 @@
+"""
+select_related / prefetch_related planning from serializer field trees.
+
+plan_queryset walks the fields a serializer renders, follows their `source`
+paths through the model's relations and applies the joins and prefetches
+needed to render a whole page without per-row queries:
+
+- single-valued relations (forward FK / one-to-one, reverse one-to-one) are
+  select_related while the path has only crossed single-valued relations;
+- many-valued relations (reverse FK, many-to-many) become Prefetch objects,
+  whose querysets carry the plan of the nested serializer.
+
+SerializerMethodFields are opaque, so a serializer lists the relations its
+methods read in a `related_sources` class attribute, mapping field names to
+dotted paths, e.g. `related_sources = {"collaborators": ("members",)}`.
+Fields and serializers flagged `renders_from_pk` (the user card ones) only
+read the foreign key column, like PrimaryKeyRelatedField.
+
+Lookups the queryset already prefetches (custom querysets, to_attr previews)
+are left alone, and plans are cached per (serializer class, model).
+"""
+from functools import lru_cache
+
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class _Node:
+    """Relations reached from one model: accessor name -> (is_many, model, _Node)."""
+
+    __slots__ = ("children",)
+
+    def __init__(self):
+        self.children = {}
+
+    def child(self, name, many, model):
+        entry = self.children.get(name)
+        if entry is None:
+            entry = self.children[name] = (many, model, _Node())
+        return entry[2]
+
+
+@lru_cache(maxsize=None)
+def _relations(model):
+    """Maps each relation accessor of `model` to (is_many, related model)."""
+    relations = {}
+    for field in model._meta.get_fields():
+        if not field.is_relation or field.related_model is None:
+            continue
+        many = bool(field.many_to_many or field.one_to_many)
+        name = field.name if field.concrete or not field.auto_created else field.get_accessor_name()
+        if name:
+            relations[name] = (many, field.related_model)
+    return relations
+
+
+def _add_path(node, model, attrs):
+    """
+    Records the relation prefix of a source path. Returns (node, model) of the
+    path's end when every attribute is a relation, else None.
+    """
+    for attr in attrs:
+        relation = _relations(model).get(attr)
+        if relation is None:
+            return None
+        many, model = relation
+        node = node.child(attr, many, model)
+    return node, model
+
+
+def _walk(serializer, node, model):
+    hints = getattr(serializer, "related_sources", None) or {}
+    for field_name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        for path in hints.get(field_name, ()):
+            _add_path(node, model, path.split("."))
+
+        if isinstance(field, serializers.SerializerMethodField):
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            nested = field.child
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = field
+        else:
+            nested = None
+
+        if getattr(field, "renders_from_pk", False):
+            _add_path(node, model, field.source_attrs[:-1])
+        elif nested is not None:
+            end = _add_path(node, model, field.source_attrs)
+            if end is not None:
+                _walk(nested, *end)
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            # Rendered from the <fk>_id column, no join needed for the last hop
+            _add_path(node, model, field.source_attrs[:-1])
+        else:
+            _add_path(node, model, field.source_attrs)
+
+
+def _compile(node, prefix="", existing=()):
+    """
+    Returns (select_related paths, prefetch lookups) for a plan node. Relations
+    in `existing` are already prefetched by the caller's queryset, so only the
+    lookups beyond them are planned.
+    """
+    selects, prefetches = [], []
+    for name, (many, model, child) in node.children.items():
+        path = f"{prefix}{name}"
+        if many and path in existing:
+            prefetches.extend(_compile(child, f"{path}__", existing)[1])
+            continue
+        if many:
+            child_selects, child_prefetches = _compile(child)
+            if child_selects or child_prefetches:
+                queryset = model._default_manager.all()
+                if child_selects:
+                    queryset = queryset.select_related(*child_selects)
+                if child_prefetches:
+                    queryset = queryset.prefetch_related(*child_prefetches)
+                prefetches.append(Prefetch(path, queryset=queryset))
+            else:
+                prefetches.append(path)
+            continue
+
+        child_selects, child_prefetches = _compile(child, f"{path}__", existing)
+        selects.extend(child_selects or [path])
+        prefetches.extend(child_prefetches)
+    return selects, prefetches
+
+
+@lru_cache(maxsize=None)
+def _plan_for_class(serializer_class, model):
+    root = _Node()
+    _walk(serializer_class(), root, model)
+    return root
+
+
+def get_query_plan(serializer, model):
+    """The relation tree `serializer` (a class or an instance) reads from `model` rows."""
+    if isinstance(serializer, type):
+        return _plan_for_class(serializer, model)
+    root = _Node()
+    _walk(serializer, root, model)
+    return root
+
+
+def _lookup_path(lookup):
+    return lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+
+
+def plan_queryset(queryset, serializer):
+    """
+    Applies the select_related / prefetch_related calls needed to render
+    `queryset` with `serializer` (a class or an instance).
+    """
+    if queryset._fields is not None or queryset.query.combinator:
+        return queryset
+
+    # A second lookup for an already prefetched path would be rejected (or
+    # silently replace the view's own queryset), so the view's lookups win.
+    # Joins into a prefetched relation would turn that prefetch into a no-op.
+    existing = [_lookup_path(lookup) for lookup in queryset._prefetch_related_lookups]
+    selects, prefetches = _compile(get_query_plan(serializer, queryset.model), existing=existing)
+
+    prefetches = [
+        lookup for lookup in prefetches
+        if not any(
+            path == _lookup_path(lookup) or path.startswith(f"{_lookup_path(lookup)}__")
+            for path in existing
+        )
+    ]
+    selects = [
+        path for path in selects
+        if not any(path == other or path.startswith(f"{other}__") for other in existing)
+    ]
+
+    if selects:
+        queryset = queryset.select_related(*selects)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+    return queryset
@@ -1,20 +1,195 @@
 # serializers.py
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import QuerySet
 from rest_framework import serializers
+from rest_framework.fields import get_attribute
+from rest_framework.relations import PKOnlyObject
+from api.serializers.mixins import DynamicFieldsMixin
 from apps.users.models.user import User
+from apps.users.utils.user_cards import get_user_cards
 from django.utils import timezone
 import uuid
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserCards:
+    """
+    The user cards (apps.users.utils.user_cards) one response reads, shared by
+    its serializers through the root's context. The first card a root needs
+    loads the cards of every user its fields render across the root instance
+    (see _card_paths), so a response costs one cache round trip rather than a
+    Profile join and an avatar URL per row.
+    """
+
+    def __init__(self):
+        self.cards = {}
+        # id(root) -> root, kept referenced so its id isn't reused
+        self.primed = {}
+
+    def prime(self, field):
+        """Loads the cards of every user rendered below field.root, once."""
+        root = field.root
+        if id(root) not in self.primed:
+            self.primed[id(root)] = root
+            ids = set()
+            for path in _card_paths(root):
+                ids.update(_collect_user_ids(root, path))
+            self._load(ids)
+
+    def get(self, field, user_id):
+        key = str(user_id)
+        if key not in self.cards:
+            self.prime(field)
+            self._load((key,))
+        return self.cards.get(key)
+
+    def get_many(self, field, user_ids):
+        """{str(id): card} for `user_ids`, leaving out users without one."""
+        self.prime(field)
+        keys = {str(uid) for uid in user_ids if uid}
+        self._load(keys)
+        return {uid: self.cards[uid] for uid in keys if self.cards[uid] is not None}
+
+    def _load(self, user_ids):
+        missing = {str(uid) for uid in user_ids if uid}.difference(self.cards)
+        if missing:
+            loaded = get_user_cards(missing)
+            self.cards.update({uid: loaded.get(uid) for uid in missing})
+
+
+def user_cards(field) -> UserCards:
+    context = field.root._context
+    cards = context.get("_user_cards")
+    if cards is None:
+        cards = context["_user_cards"] = UserCards()
+    return cards
+
+
+def _card_paths(serializer, prefix=()):
+    """
+    Source paths, from the instance of `serializer`, of the users its fields
+    render from cards: the fields flagged `renders_from_pk`, and for method
+    fields the dotted paths listed in the serializer's `user_card_sources`,
+    e.g. `{"members": ("member_preview.user",)}`.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    sources = getattr(serializer, "user_card_sources", {})
+    for name, field in serializer.fields.items():
+        for source in sources.get(name, ()):
+            yield prefix + tuple(source.split("."))
+        if field.write_only or field.source == "*":
+            continue
+        path = prefix + tuple(field.source_attrs)
+        if getattr(field, "renders_from_pk", False):
+            yield path
+        elif isinstance(field, serializers.BaseSerializer):
+            yield from _card_paths(field, path)
+
+
+def _loaded(obj, attr):
+    """Objects `attr` of `obj` holds without a query (prefetched, to_attr or joined)."""
+    if attr in obj.__dict__:
+        value = obj.__dict__[attr]
+    elif attr in getattr(obj, "_prefetched_objects_cache", {}):
+        value = obj._prefetched_objects_cache[attr]
+    elif attr in obj._state.fields_cache:
+        value = obj._state.fields_cache[attr]
+    else:
+        return []
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple, QuerySet)) else [value]
+
+
+def _collect_user_ids(root, path):
+    if root.instance is None or not isinstance(root.instance, (list, tuple, QuerySet, models.Model)):
+        return set()  # e.g. a manager, which would be queried again
+    objects = list(root.instance) if isinstance(root, serializers.ListSerializer) else [root.instance]
+    if not path:
+        # A list of users itself
+        return {getattr(obj, "pk", None) for obj in objects}
+    for attr in path[:-1]:
+        objects = [child for obj in objects for child in _loaded(obj, attr)]
+
+    ids = set()
+    for obj in objects:
+        try:
+            field = obj._meta.get_field(path[-1])
+        except (AttributeError, FieldDoesNotExist):
+            return ids
+        if not field.concrete or not field.is_relation:
+            return ids
+        ids.add(getattr(obj, field.attname))
+    return ids
+
+
+def _user_pk(field, instance):
+    """
+    PKOnlyObject for a field sourced from a user foreign key, read from the
+    key column so the user row is never fetched; None for other sources.
+    """
+    try:
+        owner = get_attribute(instance, field.source_attrs[:-1])
+        model_field = owner._meta.get_field(field.source_attrs[-1])
+    except (AttributeError, FieldDoesNotExist):
+        return None
+    if model_field.concrete and (model_field.many_to_one or model_field.one_to_one):
+        return PKOnlyObject(pk=getattr(owner, model_field.attname))
+    return None
+
+
+class UserCardField(serializers.Field):
+    """
+    One value of the user card behind `source` (a foreign key to User):
+    `render` maps the card to the value, e.g. operator.itemgetter("avatar").
+    """
+    # Only the key column is read (see api.serializers.query_plan)
+    renders_from_pk = True
+
+    def __init__(self, render, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+        self.render = render
+
+    def get_attribute(self, instance):
+        return _user_pk(self, instance) or super().get_attribute(instance)
+
+    def to_representation(self, value):
+        card = user_cards(self).get(self, value.pk)
+        return None if card is None else self.render(card)
+
+
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Nested, rendered from the user card store rather than from the User and
+    Profile rows; at the root (the user's own details) and for users without
+    a card, from the instance.
+    """
     avatar = serializers.SerializerMethodField()
     username = serializers.CharField(source='profile.username', read_only=True)
     first_name = serializers.CharField(source='profile.first_name', read_only=True)
     last_name = serializers.CharField(source='profile.last_name', read_only=True)
     full_name = serializers.SerializerMethodField()
 
+    # Only the key column is read (see api.serializers.query_plan)
+    renders_from_pk = True
+
     class Meta:
         model = User
         fields = ['id', 'email', 'username', 'first_name', 'last_name', 'full_name', 'avatar']
-    
+
+    def get_attribute(self, instance):
+        return _user_pk(self, instance) or super().get_attribute(instance)
+
+    def to_representation(self, instance):
+        if self.parent is None:
+            return super().to_representation(instance)
+        card = user_cards(self).get(self, instance.pk)
+        if card is None:
+            return None if isinstance(instance, PKOnlyObject) else super().to_representation(instance)
+        return {field.field_name: card[field.field_name] for field in self._readable_fields}
+
     def get_avatar(self, obj):
         if hasattr(obj, 'profile') and obj.profile.avatar:
             return obj.profile.avatar.url
@@ -0,0 +1,308 @@
+"""
+Fast-path rendering of read-only serializers from .values() rows.
+
+A ModelSerializer instantiates a field tree and walks every attribute of every
+model instance; for large read-only lists that dispatch dominates the CPU
+spent per row. get_values_plan compiles a serializer (as instantiated for the
+request, so ?fields= / ?expand= apply) into the .values() lookups it reads and
+a list of per-field converters, and ValuesPlan.render maps rows to the exact
+representation the serializer would produce:
+
+- model fields convert through a converter precompiled from the serializer
+  field: none at all where to_representation is the identity on the column's
+  Python type (strings, choices, booleans, integers), str for UUIDs,
+  isoformat for dates and datetimes (against the timezone active when
+  rendering), the field's own to_representation otherwise. Dotted sources become joined lookups; a null foreign key along the path
+  drops the key (or renders None with allow_null) and a missing reverse
+  one-to-one renders None, as DRF does;
+- PrimaryKeyRelatedFields render the raw key, nested single serializers
+  render a nested dict (None when the relation is null);
+- fields and serializers flagged `renders_from_pk` (user cards) read the
+  foreign key column; render looks the cards of a page up in one batch;
+- SerializerMethodFields need a `values_methods` entry on the serializer:
+  {field name: ((lookups relative to the serializer's model), function)}, the
+  function receiving the looked-up values in order.
+
+Serializers using anything else (many=True nesting, file fields, source="*",
+method fields without a values counterpart) are not compiled and
+get_values_plan returns None, so callers fall back to the serializer.
+"""
+import datetime
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+
+from apps.users.utils.user_cards import get_user_cards
+
+_VALUE, _PATH, _NESTED, _METHOD, _CARD = range(5)
+
+# Compiled plans by (serializer class, ?fields=, ?expand=), dropped when full
+_plans = {}
+_MAX_PLANS = 256
+
+
+class Unsupported(Exception):
+    """A field the fast path cannot render from values() rows."""
+
+
+class _Bound:
+    """A converter resolved once per render, e.g. against the active timezone."""
+    __slots__ = ("factory",)
+
+    def __init__(self, factory):
+        self.factory = factory
+
+
+def _bind(entries):
+    bound = []
+    for name, kind, key, convert in entries:
+        if kind == _NESTED:
+            convert = _bind(convert)
+        elif kind == _PATH and isinstance(convert[0], _Bound):
+            convert = (convert[0].factory(), convert[1])
+        elif isinstance(convert, _Bound):
+            convert = convert.factory()
+        bound.append((name, kind, key, convert))
+    return bound
+
+
+def _card_keys(entries):
+    keys = []
+    for _, kind, key, convert in entries:
+        if kind == _CARD:
+            keys.append(key)
+        elif kind == _NESTED:
+            keys.extend(_card_keys(convert))
+    return keys
+
+
+class ValuesPlan:
+    __slots__ = ("lookups", "entries", "card_keys")
+
+    def __init__(self, lookups, entries):
+        self.lookups = lookups
+        self.entries = entries
+        self.card_keys = _card_keys(entries)
+
+    def values(self, queryset, *extra):
+        """`queryset` as dict rows with the plan's lookups plus `extra` ones."""
+        lookups = dict.fromkeys((*self.lookups, *extra))
+        return queryset.prefetch_related(None).values(*lookups)
+
+    def render(self, rows):
+        entries = _bind(self.entries)
+        cards = {}
+        if self.card_keys:
+            rows = list(rows)
+            cards = get_user_cards({row[key] for row in rows for key in self.card_keys})
+        return [_build(entries, row, cards) for row in rows]
+
+
+def _build(entries, row, cards):
+    out = {}
+    for name, kind, key, convert in entries:
+        if kind == _VALUE:
+            value = row[key]
+            out[name] = value if value is None or convert is None else convert(value)
+        elif kind == _PATH:
+            key, guards = key
+            convert, skip = convert
+            for guard, forward in guards:
+                if row[guard] is None:
+                    if forward and skip:
+                        break
+                    out[name] = None
+                    break
+            else:
+                value = row[key]
+                out[name] = value if value is None or convert is None else convert(value)
+        elif kind == _NESTED:
+            out[name] = None if row[key] is None else _build(convert, row, cards)
+        elif kind == _CARD:
+            card = cards.get(str(row[key]))
+            out[name] = None if card is None else convert(card)
+        else:
+            out[name] = convert(*[row[k] for k in key])
+    return out
+
+
+def _lookup(model, attrs, prefix):
+    """
+    Validates a source path against the model and returns its values() lookup
+    and guards: (lookup, forward) for every relation crossed before the last
+    attribute, None in a row when that relation is null (forward) or missing.
+    """
+    guards = []
+    field = None
+    for i, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise Unsupported(attr)
+        if field.is_relation:
+            if field.many_to_many or field.one_to_many:
+                raise Unsupported(attr)
+            if i < len(attrs) - 1:
+                guards.append((prefix + "__".join(attrs[:i + 1]), field.concrete))
+                model = field.related_model
+        elif i < len(attrs) - 1:
+            raise Unsupported(attr)
+    return prefix + "__".join(attrs), guards, field
+
+
+def _identity_pk(field):
+    # PrimaryKeyRelatedField renders value.pk, i.e. the raw column value
+    return None if field.pk_field is None else field.pk_field.to_representation
+
+
+def _datetime(field):
+    if hasattr(field, "timezone"):
+        return field.to_representation
+
+    def factory():
+        zone = field.default_timezone()
+        if zone is None:
+            return field.to_representation
+
+        def convert(value):
+            value = value.astimezone(zone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+        return convert
+    return _Bound(factory)
+
+
+def _converter(field, model_field):
+    """
+    What renders a non-null column value of `model_field` exactly as
+    field.to_representation does; None for the identity.
+    """
+    if isinstance(field, serializers.ChoiceField):
+        if isinstance(model_field, (models.CharField, models.TextField)) and all(
+            isinstance(key, str) for key in field.choice_strings_to_values.values()
+        ):
+            return None
+    elif isinstance(field, serializers.CharField):
+        if isinstance(model_field, (models.CharField, models.TextField)):
+            return None
+    elif isinstance(field, serializers.BooleanField):
+        if isinstance(model_field, models.BooleanField):
+            return None
+    elif isinstance(field, serializers.IntegerField):
+        if isinstance(model_field, models.IntegerField):
+            return None
+    elif isinstance(field, serializers.UUIDField):
+        if field.uuid_format == "hex_verbose" and isinstance(model_field, models.UUIDField):
+            return str
+    elif isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if isinstance(model_field, models.DateTimeField) and str(output_format).lower() == ISO_8601:
+            return _datetime(field)
+    elif isinstance(field, serializers.DateField):
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if (
+            isinstance(model_field, models.DateField)
+            and not isinstance(model_field, models.DateTimeField)
+            and str(output_format).lower() == ISO_8601
+        ):
+            return datetime.date.isoformat
+    return field.to_representation
+
+
+def _compile(serializer, model, prefix, lookups):
+    entries = []
+    methods = getattr(serializer, "values_methods", None) or {}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+
+        if getattr(field, "renders_from_pk", False):
+            if len(field.source_attrs) != 1:
+                raise Unsupported(name)
+            key, _, model_field = _lookup(model, field.source_attrs, prefix)
+            if not (model_field.concrete and model_field.is_relation):
+                raise Unsupported(name)
+            lookups.append(key)
+            if isinstance(field, serializers.BaseSerializer):
+                names = tuple(f.field_name for f in field._readable_fields)
+                render = lambda card, names=names: {n: card[n] for n in names}
+            else:
+                render = field.render
+            entries.append((name, _CARD, key, render))
+            continue
+
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in methods:
+                raise Unsupported(name)
+            sources, function = methods[name]
+            keys = tuple(prefix + source for source in sources)
+            lookups.extend(keys)
+            entries.append((name, _METHOD, keys, function))
+            continue
+
+        if field.source == "*" or isinstance(
+            field, (serializers.ListSerializer, serializers.ManyRelatedField, serializers.FileField)
+        ):
+            raise Unsupported(name)
+
+        if isinstance(field, serializers.BaseSerializer):
+            if len(field.source_attrs) != 1:
+                raise Unsupported(name)
+            nested_prefix = _lookup(model, field.source_attrs, prefix)[0] + "__"
+            nested_model = model
+            for attr in field.source_attrs:
+                nested_model = nested_model._meta.get_field(attr).related_model
+                if nested_model is None:
+                    raise Unsupported(name)
+            null_key = nested_prefix + nested_model._meta.pk.name
+            lookups.append(null_key)
+            nested = _compile(field, nested_model, nested_prefix, lookups)
+            entries.append((name, _NESTED, null_key, nested))
+            continue
+
+        key, guards, model_field = _lookup(model, field.source_attrs, prefix)
+        lookups.append(key)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            convert = _identity_pk(field)
+        elif isinstance(field, serializers.RelatedField):
+            raise Unsupported(name)
+        else:
+            convert = _converter(field, model_field)
+
+        if not guards:
+            entries.append((name, _VALUE, key, convert))
+            continue
+        # Field.get_attribute on a null relation: default, else None with
+        # allow_null, else the key is skipped
+        if field.default is not empty or field.required:
+            raise Unsupported(name)
+        lookups.extend(guard for guard, _ in guards)
+        entries.append((name, _PATH, (key, tuple(guards)), (convert, not field.allow_null)))
+    return entries
+
+
+def _plan_key(serializer):
+    request = serializer.context.get("request")
+    params = getattr(request, "query_params", None) or getattr(request, "GET", {})
+    return type(serializer), params.get("fields"), params.get("expand")
+
+
+def get_values_plan(serializer):
+    """
+    The ValuesPlan rendering `serializer` (an instance, bound to the request
+    in its context), or None when one of its fields has no fast path.
+    """
+    key = _plan_key(serializer)
+    if key not in _plans:
+        lookups = []
+        if len(_plans) >= _MAX_PLANS:
+            _plans.clear()
+        try:
+            entries = _compile(serializer, serializer.Meta.model, "", lookups)
+        except Unsupported:
+            _plans[key] = None
+        else:
+            _plans[key] = ValuesPlan(tuple(dict.fromkeys(lookups)), entries)
+    return _plans[key]
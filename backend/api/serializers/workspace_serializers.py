@@ -1,7 +1,10 @@
 from rest_framework import serializers
+from api.serializers.mixins import DynamicFieldsMixin
+from django.db.models import Case, CharField, OuterRef, Prefetch, Subquery, Value, When
 from apps.users.models import User
 from apps.workspace.models import Workspace, WorkspaceMember, WorkspaceInvitation, WorkspaceChannel
-from api.serializers.user_serializers import UserSerializer
+from apps.workspace.permissions.access import get_request_access
+from api.serializers.user_serializers import UserSerializer, user_cards
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
@@ -37,7 +40,7 @@ class WorkspaceDashboardSerializer(serializers.Serializer):
     members = serializers.IntegerField()
 
 
-class WorkspaceMemberSerializer(serializers.ModelSerializer):
+class WorkspaceMemberSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
@@ -45,13 +48,29 @@ class WorkspaceMemberSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'role', 'joined_at']
 
 
-class WorkspaceSerializer(serializers.ModelSerializer):
+# Members embedded in each workspace; the full list is the paginated `members` action
+WORKSPACE_MEMBER_PREVIEW_SIZE = 5
+
+
+class WorkspaceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    `members` is a preview of at most WORKSPACE_MEMBER_PREVIEW_SIZE members and
+    `member_count` the total, from the workspace's counters row. setup_queryset
+    annotates the role, joins the counters and prefetches the preview, so a
+    list costs a constant number of queries whatever the number of workspaces
+    or members; without it (e.g. nested in invitations) they fall back to
+    per-workspace queries.
+    """
     owner = UserSerializer(read_only=True)
-    members = WorkspaceMemberSerializer(many=True, read_only=True)
+    members = serializers.SerializerMethodField()
+    member_count = serializers.IntegerField(source="counters.members", read_only=True)
     logo = serializers.SerializerMethodField()
     is_owner = serializers.SerializerMethodField()
     user_role = serializers.SerializerMethodField()
 
+    # Users rendered by get_members (see api.serializers.user_serializers)
+    user_card_sources = {"members": ("member_preview.user",)}
+
     class Meta:
         model = Workspace
         fields = [
@@ -63,11 +82,39 @@ class WorkspaceSerializer(serializers.ModelSerializer):
             'created_at',
             'is_owner',
             'user_role',
+            'member_count',
             'members',
         ]
         read_only_fields = ['id', 'owner', 'created_at']
 
-    
+    @staticmethod
+    def setup_queryset(queryset, user):
+        """Role annotation and counters join, plus the member preview prefetch."""
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        members = WorkspaceMember.objects.filter(workspace=OuterRef("pk"))
+        return queryset.annotate(
+            user_role=Case(
+                When(owner_id=user_id, then=Value("owner")),
+                default=Subquery(members.filter(user_id=user_id).values("role")[:1]),
+                output_field=CharField(),
+            ),
+        ).select_related("counters").prefetch_related(
+            Prefetch(
+                "members",
+                queryset=WorkspaceMember.objects.order_by("joined_at", "id")[:WORKSPACE_MEMBER_PREVIEW_SIZE],
+                to_attr="member_preview",
+            ),
+        )
+
+    def get_members(self, obj):
+        preview = getattr(obj, "member_preview", None)
+        if preview is None:
+            preview = obj.members.order_by("joined_at", "id")[:WORKSPACE_MEMBER_PREVIEW_SIZE]
+        else:
+            # Loads the users of every workspace's preview in one batch
+            user_cards(self).prime(self)
+        return WorkspaceMemberSerializer(preview, many=True, context=self.context).data
+
     def get_is_owner(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
@@ -75,13 +122,11 @@ class WorkspaceSerializer(serializers.ModelSerializer):
         return False
 
     def get_user_role(self, obj):
+        if hasattr(obj, "user_role"):
+            return obj.user_role
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            membership = WorkspaceMember.objects.filter(
-                workspace=obj,
-                user=request.user
-            ).first()
-            return membership.role if membership else None
+            return get_request_access(request).workspace_role(obj.id)
         return None
 
     def get_logo(self, obj):
@@ -97,11 +142,14 @@ class CreateWorkspaceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class WorkspaceInvitationSerializer(serializers.ModelSerializer):
+class WorkspaceInvitationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     invited_user = UserSerializer(read_only=True)
     invited_by = UserSerializer(read_only=True)
     workspace = WorkspaceSerializer(read_only=True)
 
+    # The workspace id unless ?expand=workspace
+    expandable_fields = ("workspace",)
+
     class Meta:
         model = WorkspaceInvitation
         fields = [
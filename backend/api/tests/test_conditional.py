@@ -0,0 +1,120 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.notifications.notification_services import NotificationService
+from apps.users.models import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, Task
+from apps.workspace.utils.shared_cache import is_cache_shared
+
+
+@pytest.mark.django_db
+class TestVersionedETags:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, django_capture_on_commit_callbacks, monkeypatch):
+        cache.clear()
+        monkeypatch.setattr(NotificationService, "send_external_push", staticmethod(lambda **kwargs: None))
+        self.commit = lambda: django_capture_on_commit_callbacks(execute=True)
+
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.project = Project.objects.create(workspace=self.workspace, title="Board", created_by=self.owner)
+
+        self.dashboard = f"/api/workspaces/{self.workspace.id}/dashboard/"
+        self.project_url = f"/api/workspaces/{self.workspace.id}/projects/{self.project.id}/"
+
+    def _client(self, user=None):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user or self.owner)}")
+        return client
+
+    def _revalidate(self, client, url, etag):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        return response, queries
+
+    @pytest.mark.parametrize("url", ["dashboard", "project_url", "/api/notifications/"])
+    def test_unchanged_responses_are_not_modified_without_queries(self, url):
+        url = getattr(self, url, url)
+        client = self._client()
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first["ETag"].startswith('"')
+        assert "private" in first["Cache-Control"] and "no-cache" in first["Cache-Control"]
+        assert first["Last-Modified"]
+
+        response, queries = self._revalidate(client, url, first["ETag"])
+        assert response.status_code == 304
+        assert response["ETag"] == first["ETag"]
+        assert len(queries) == 0
+
+    def test_workspace_writes_change_the_etag(self):
+        client = self._client()
+        etag = client.get(self.dashboard)["ETag"]
+
+        with self.commit():
+            Task.objects.create(project=self.project, title="New", created_by=self.owner, assigned_to=self.owner)
+
+        response = client.get(self.dashboard, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+        assert [task["title"] for task in response.data["my_tasks"]] == ["New"]
+
+    def test_profile_changes_change_the_etag_of_their_workspaces(self):
+        client = self._client()
+        etag = client.get(self.project_url)["ETag"]
+
+        with self.commit():
+            self.member.profile.first_name = "Grace"
+            self.member.profile.save()
+
+        assert client.get(self.project_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_logins_keep_the_etag(self):
+        client = self._client()
+        etag = client.get(self.dashboard)["ETag"]
+
+        with self.commit():
+            self.member.save(update_fields=["last_login"])
+
+        assert self._revalidate(client, self.dashboard, etag)[0].status_code == 304
+
+    def test_notifications_change_the_recipient_etag_only(self):
+        member_client, owner_client = self._client(self.member), self._client()
+        member_etag = member_client.get("/api/notifications/")["ETag"]
+        owner_etag = owner_client.get("/api/notifications/")["ETag"]
+
+        with self.commit():
+            NotificationService.send_bulk_notification(
+                recipients=[self.member], actor=self.owner, title="Hi", message="Hello", target_obj=self.project,
+            )
+
+        assert member_client.get("/api/notifications/", HTTP_IF_NONE_MATCH=member_etag).status_code == 200
+        assert self._revalidate(owner_client, "/api/notifications/", owner_etag)[0].status_code == 304
+
+        member_etag = member_client.get("/api/notifications/")["ETag"]
+        with self.commit():
+            member_client.post("/api/notifications/mark-all-read/")
+        assert member_client.get("/api/notifications/", HTTP_IF_NONE_MATCH=member_etag).status_code == 200
+
+    def test_etags_are_per_user(self):
+        owner_etag = self._client().get(self.dashboard)["ETag"]
+        response = self._client(self.member).get(self.dashboard, HTTP_IF_NONE_MATCH=owner_etag)
+        assert response.status_code == 200
+        assert response["ETag"] != owner_etag
+
+    def test_process_local_caches_disable_etags(self, settings):
+        # LocMemCache under several workers: another process may hold an older version
+        settings.SHARED_CACHE = None
+        assert not is_cache_shared()
+
+        client = self._client()
+        response = client.get(self.dashboard, HTTP_IF_NONE_MATCH='"anything"')
+        assert response.status_code == 200
+        assert "ETag" not in response
@@ -0,0 +1,64 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.users.models import User
+from apps.workspace.models import Workspace, WorkspaceMember, WorkspaceInvitation, Project, Task, Comment
+
+
+@pytest.mark.django_db
+class TestDynamicFields:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, settings):
+        settings.CLOUDINARY_STORAGE = {"CLOUD_NAME": "test", "API_KEY": "key", "API_SECRET": "secret"}
+        cache.clear()
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.invitee = User.objects.create_user(email="invitee@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        self.project = Project.objects.create(workspace=self.workspace, title="Board", created_by=self.owner)
+        for i in range(3):
+            task = Task.objects.create(project=self.project, title=f"Task {i}", created_by=self.owner, assigned_to=self.owner)
+            Comment.objects.create(task=task, author=self.owner, content="hi")
+        WorkspaceInvitation.objects.create(
+            workspace=self.workspace, invited_user=self.invitee, invited_by=self.owner, role="member"
+        )
+
+        self.base = f"/api/workspaces/{self.workspace.id}/projects/{self.project.id}"
+
+    def _get(self, url, user=None):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user or self.owner)}")
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.status_code == 200
+        return response.data, queries
+
+    def test_fields_trim_output_and_joins(self):
+        full, _ = self._get(f"{self.base}/tasks/?page_size=10")
+        assert "comments" not in full["results"][0]
+        assert "assigned_to" in full["results"][0]
+
+        trimmed, queries = self._get(f"{self.base}/tasks/?page_size=10&fields=id,title,status")
+        assert all(set(task) == {"id", "title", "status"} for task in trimmed["results"])
+        task_query = next(q["sql"] for q in queries.captured_queries if 'FROM "tasks"' in q["sql"])
+        assert '"users"' not in task_query
+
+    def test_expand_nested_relations(self):
+        detail, _ = self._get(f"{self.base}/")
+        assert all("comments" not in task for task in detail["tasks"])
+
+        detail, _ = self._get(f"{self.base}/?expand=tasks.comments&fields=id,tasks.title,tasks.comments")
+        assert set(detail) == {"id", "tasks"}
+        assert all(set(task) == {"title", "comments"} for task in detail["tasks"])
+        assert all(task["comments"][0]["content"] == "hi" for task in detail["tasks"])
+
+    def test_collapsed_single_relation_renders_its_id(self):
+        data, _ = self._get("/api/workspaces/invitations/", user=self.invitee)
+        assert data[0]["workspace"] == self.workspace.id
+
+        data, _ = self._get("/api/workspaces/invitations/?expand=workspace", user=self.invitee)
+        assert data[0]["workspace"]["name"] == "Team"
@@ -0,0 +1,101 @@
+import base64
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.users.models import User, UserSettings
+from apps.workspace.models import Workspace, WorkspaceMember, Project, Task
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        self.project = Project.objects.create(workspace=self.workspace, title="Board", created_by=self.owner)
+        for i in range(7):
+            Task.objects.create(project=self.project, title=f"Task {i}", created_by=self.owner)
+        # Ties on created_at are broken by id
+        Task.objects.filter(title__in=["Task 2", "Task 3", "Task 4"]).update(
+            created_at=Task.objects.get(title="Task 2").created_at
+        )
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.owner)}")
+        self.url = f"/api/workspaces/{self.workspace.id}/projects/{self.project.id}/tasks/"
+
+    def _walk(self, url):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            pages.append(response.data)
+            url = response.data["next"]
+        return pages
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self._walk(f"{self.url}?page_size=2")
+
+        ids = [task["id"] for page in pages for task in page["results"]]
+        expected = [str(pk) for pk in Task.objects.order_by("-created_at", "-id").values_list("id", flat=True)]
+        assert ids == expected
+        assert [len(page["results"]) for page in pages] == [2, 2, 2, 1]
+        assert pages[0]["previous"] is None
+
+    def test_previous_link_returns_the_previous_page(self):
+        first = self.client.get(f"{self.url}?page_size=3").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+
+        assert [t["id"] for t in back["results"]] == [t["id"] for t in first["results"]]
+        assert back["next"] == first["next"]
+
+    def test_page_size_from_user_settings_and_capped(self, monkeypatch):
+        UserSettings.objects.create(user=self.owner, items_per_page=4)
+        assert len(self.client.get(self.url).data["results"]) == 4
+
+        settings_row = UserSettings.objects.get(user=self.owner)
+        settings_row.items_per_page = 500
+        settings_row.save()
+        assert len(self.client.get(self.url).data["results"]) == 7
+
+        monkeypatch.setattr("api.pagination.API_MAX_PAGE_SIZE", 5)
+        assert len(self.client.get(f"{self.url}?page_size=50").data["results"]) == 5
+
+    def test_process_local_caches_read_the_page_size_uncached(self, settings):
+        settings.SHARED_CACHE = None
+        UserSettings.objects.create(user=self.owner, items_per_page=4)
+        assert len(self.client.get(self.url).data["results"]) == 4
+        # Saved by another worker, whose signal can't reach this one's cache
+        UserSettings.objects.filter(user=self.owner).update(items_per_page=3)
+        assert len(self.client.get(self.url).data["results"]) == 3
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        first_url = f"{self.url}?page_size=2"
+        self.client.get(first_url)  # warm the user, membership and page size caches
+
+        counts = []
+        url = first_url
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                url = self.client.get(url).data["next"]
+            counts.append(len(queries))
+        assert len(set(counts)) == 1
+
+    def test_invalid_cursor_is_not_found(self):
+        assert self.client.get(f"{self.url}?cursor=garbage").status_code == 404
+
+        def cursor(values):
+            return base64.urlsafe_b64encode(json.dumps({"v": values}).encode()).decode()
+
+        # Well-formed cursors whose values do not fit the ordering fields
+        for values in (["yesterday", 1], ["2026-01-01T00:00:00Z", "abc"], [None, 1], [{}, []]):
+            assert self.client.get(f"{self.url}?cursor={cursor(values)}").status_code == 404
@@ -0,0 +1,470 @@
+"""
+Query budgets for every API route.
+
+Each route is called as the workspace owner, an admin, a member and a guest,
+against a small and a large synthetic workspace, with a real JWT header and cold
+caches. A route fails when its query count changes between the two sizes (it
+grows with the data, e.g. an N+1 in a serializer) or exceeds its budget. With
+cold caches, loading the user cards a response renders costs one query (two on
+the dashboard). Query counts and wall time are attached to the test report with
+record_property.
+
+Routes that can't be exercised here are listed in EXEMPT_ROUTES with the reason;
+test_every_route_is_budgeted fails for a route in neither table.
+"""
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Callable, NamedTuple, Optional
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, resolve
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.notifications.models import Notification
+from apps.notifications.notification_services import NotificationService
+from apps.users.models.user import User
+from apps.workspace.models import (
+    Workspace, WorkspaceMember, WorkspaceInvitation, Project, ProjectMember, Task, Comment,
+)
+from apps.workspace.models.document import WorkspaceDocument
+
+ROLES = ("owner", "admin", "member", "guest")
+
+# Size knob of the synthetic workspaces: projects, tasks per project, extra members...
+SIZES = {"small": 2, "large": 5}
+
+
+# ----------------------- SEED DATA -----------------------
+def _user(label):
+    return User.objects.create_user(email=f"{label}-{uuid.uuid4().hex[:10]}@example.com")
+
+
+def seed_workspace(size):
+    users = {role: _user(role) for role in ROLES}
+    owner = users["owner"]
+    workspace = Workspace.objects.create(name=f"Workspace {size}", owner=owner)
+    for role, user in users.items():
+        WorkspaceMember.objects.create(workspace=workspace, user=user, role=role)
+
+    extras = [_user("extra") for _ in range(size)]
+    for user in extras:
+        WorkspaceMember.objects.create(workspace=workspace, user=user, role="member")
+
+    projects = []
+    for i in range(size):
+        project = Project.objects.create(
+            workspace=workspace,
+            title=f"Project {i}",
+            visibility="public" if i == 0 else "private",
+            created_by=owner,
+        )
+        projects.append(project)
+        for user in extras:
+            ProjectMember.objects.create(project=project, user=user)
+        for j in range(size):
+            task = Task.objects.create(
+                project=project,
+                title=f"Task {i}.{j}",
+                created_by=owner,
+                assigned_to=extras[j],
+                started_by=extras[j],
+                status="in_progress",
+            )
+            for author in extras[:2]:
+                Comment.objects.create(task=task, author=author, content="Looks good")
+
+    project = projects[0]
+    for role in ("admin", "member", "guest"):
+        ProjectMember.objects.create(project=project, user=users[role], permission="write")
+
+    workspace_type = ContentType.objects.get_for_model(Workspace)
+    for i, user in enumerate(extras):
+        WorkspaceDocument.objects.create(
+            workspace=workspace,
+            title=f"Document {i}",
+            file=f"workspace_documents/document-{i}.pdf",
+            file_name=f"document-{i}.pdf",
+            uploaded_by=user,
+        )
+        WorkspaceInvitation.objects.create(workspace=workspace, invited_by=owner, invited_user=_user("invitee"))
+        for recipient in users.values():
+            Notification.objects.create(
+                recipient=recipient,
+                actor=user,
+                content_type=workspace_type,
+                object_id=workspace.id,
+                title="Update",
+                message=f"Update {i}",
+            )
+
+    task = project.tasks.order_by("title").first()
+    return SimpleNamespace(
+        workspace=workspace,
+        users=users,
+        project=project,
+        task=task,
+        comment=task.comments.first(),
+        document=workspace.documents.first(),
+    )
+
+
+def _new_member(seed):
+    user = _user("target")
+    WorkspaceMember.objects.create(workspace=seed.workspace, user=user, role="member")
+    return user
+
+
+def _new_task(seed, **fields):
+    return Task.objects.create(project=seed.project, title="Fresh task", created_by=seed.users["owner"], **fields)
+
+
+def _invite(seed, invited_user):
+    return WorkspaceInvitation.objects.create(
+        workspace=seed.workspace, invited_by=seed.users["owner"], invited_user=invited_user,
+    )
+
+
+# ----------------------- ROUTE TABLE -----------------------
+def _ws(seed):
+    return f"/api/workspaces/{seed.workspace.id}"
+
+
+def _project(seed):
+    return f"{_ws(seed)}/projects/{seed.project.id}"
+
+
+def _task(seed, task=None):
+    return f"{_project(seed)}/tasks/{(task or seed.task).id}"
+
+
+class Route(NamedTuple):
+    # URL name of the view the route exercises (see _route_key)
+    view: str
+    method: str
+    # (seed, role) -> path; may create the objects a write needs
+    path: Callable
+    # Maximum queries for a single call, for any role and workspace size
+    budget: int
+    # (seed, role) -> request body
+    data: Optional[Callable] = None
+
+    @property
+    def id(self):
+        return f"{self.method.upper()} {self.path.__name__}"
+
+
+def _route(view, method, budget, data=None):
+    def decorator(path):
+        return Route(view, method, path, budget, data)
+    return decorator
+
+
+@_route("workspace-list", "get", 4)
+def workspace_list(seed, role):
+    return "/api/workspaces/"
+
+
+# +3: one task_rollups upsert per starter task of the template
+@_route("workspace-list", "post", 28, lambda seed, role: {"name": "New workspace", "template": "agile"})
+def workspace_create(seed, role):
+    return "/api/workspaces/"
+
+
+@_route("workspace-detail", "get", 6)
+def workspace_detail(seed, role):
+    return f"{_ws(seed)}/"
+
+
+@_route("workspace-detail", "patch", 14, lambda seed, role: {"description": "Updated"})
+def workspace_update(seed, role):
+    return f"{_ws(seed)}/"
+
+
+@_route("workspace-members", "get", 7)
+def workspace_members(seed, role):
+    return f"{_ws(seed)}/members/"
+
+
+@_route("workspace-dashboard", "get", 15)
+def workspace_dashboard(seed, role):
+    return f"{_ws(seed)}/dashboard/"
+
+
+@_route("workspace-activity", "get", 5)
+def workspace_activity(seed, role):
+    return f"{_ws(seed)}/activity/"
+
+
+@_route("workspace-activity", "get", 5)
+def workspace_activity_filtered(seed, role):
+    return f"{_ws(seed)}/activity/?action_type=create_task&actor={seed.users['owner'].id}&start=2000-01-01"
+
+
+@_route("workspace-analytics-throughput", "get", 8)
+def analytics_throughput(seed, role):
+    return f"{_ws(seed)}/analytics/throughput/?period=week"
+
+
+@_route("workspace-analytics-burndown", "get", 8)
+def analytics_burndown(seed, role):
+    return f"{_ws(seed)}/analytics/burndown/?project={seed.project.id}"
+
+
+@_route("workspace-analytics-velocity", "get", 8)
+def analytics_velocity(seed, role):
+    return f"{_ws(seed)}/analytics/velocity/"
+
+
+@_route("workspace-invitations", "get", 5)
+def workspace_invitations(seed, role):
+    return f"/api/workspaces/invitations/?workspace={seed.workspace.id}"
+
+
+@_route("create-workspace-invite", "post", 11, lambda seed, role: {"email": _user("invitee").email, "role": "member"})
+def workspace_invite(seed, role):
+    return f"{_ws(seed)}/invite/"
+
+
+@_route("accept-workspace-invite", "post", 6)
+def invite_accept(seed, role):
+    return f"/api/workspaces/invites/{_invite(seed, seed.users[role]).id}/accept/"
+
+
+@_route("reject-workspace-invite", "post", 4)
+def invite_reject(seed, role):
+    return f"/api/workspaces/invites/{_invite(seed, seed.users[role]).id}/reject/"
+
+
+@_route("cancel-workspace-invite", "delete", 4)
+def invite_cancel(seed, role):
+    return f"/api/workspaces/invites/{_invite(seed, _user('invitee')).id}/cancel/"
+
+
+@_route("update-workspace-member-role", "post", 13, lambda seed, role: {"role": "guest"})
+def member_role(seed, role):
+    return f"{_ws(seed)}/{_new_member(seed).id}/member-role/"
+
+
+# +1: the member count UPDATE on workspace_counters
+@_route("remove-workspace-member", "delete", 10)
+def member_remove(seed, role):
+    return f"{_ws(seed)}/members/{_new_member(seed).id}/remove/"
+
+
+@_route("workspace-document-list", "get", 7)
+def document_list(seed, role):
+    return f"{_ws(seed)}/documents/"
+
+
+@_route("workspace-document-detail", "get", 6)
+def document_detail(seed, role):
+    return f"{_ws(seed)}/documents/{seed.document.id}/"
+
+
+@_route("workspace-projects-list", "get", 7)
+def project_list(seed, role):
+    return f"{_ws(seed)}/projects/"
+
+
+@_route("workspace-projects-list", "post", 25, lambda seed, role: {"title": "New project", "visibility": "public"})
+def project_create(seed, role):
+    return f"{_ws(seed)}/projects/"
+
+
+@_route("workspace-projects-detail", "get", 8)
+def project_detail(seed, role):
+    return f"{_project(seed)}/"
+
+
+@_route("workspace-projects-detail", "patch", 12, lambda seed, role: {"description": "Updated"})
+def project_update(seed, role):
+    return f"{_project(seed)}/"
+
+
+@_route("project-collaborators", "get", 6)
+def project_collaborators(seed, role):
+    return f"{_project(seed)}/collaborators/"
+
+
+@_route("project-collaborators", "post", 25, lambda seed, role: {"user_id": str(_new_member(seed).id), "permission": "read"})
+def project_collaborator_add(seed, role):
+    return f"{_project(seed)}/collaborators/"
+
+
+@_route("project-tasks", "get", 6)
+def task_list(seed, role):
+    return f"{_project(seed)}/tasks/"
+
+
+# +1: the task_rollups upsert
+@_route("project-tasks", "post", 9, lambda seed, role: {"title": "New task"})
+def task_create(seed, role):
+    return f"{_project(seed)}/tasks/"
+
+
+@_route("project-task-detail", "get", 5)
+def task_detail(seed, role):
+    return f"{_task(seed)}/"
+
+
+@_route("project-task-detail", "patch", 7, lambda seed, role: {"title": "Renamed"})
+def task_update(seed, role):
+    return f"{_task(seed)}/"
+
+
+# +1: the task_rollups upsert
+@_route("start-task", "post", 16)
+def task_start(seed, role):
+    return f"{_task(seed, _new_task(seed))}/start/"
+
+
+@_route("complete-task", "post", 18)
+def task_complete(seed, role):
+    return f"{_task(seed, _new_task(seed, status='in_progress', started_by=seed.users[role]))}/complete/"
+
+
+@_route("task-comment", "get", 7)
+def comment_list(seed, role):
+    return f"{_task(seed)}/comments/"
+
+
+@_route("task-comment", "post", 16, lambda seed, role: {"content": "New comment"})
+def comment_create(seed, role):
+    return f"{_task(seed)}/comments/"
+
+
+@_route("task-comment-detail", "get", 6)
+def comment_detail(seed, role):
+    return f"{_task(seed)}/comments/{seed.comment.id}/"
+
+
+@_route("task-comment-detail", "patch", 8, lambda seed, role: {"content": "Edited"})
+def comment_update(seed, role):
+    comment = Comment.objects.create(task=seed.task, author=seed.users[role], content="Draft")
+    return f"{_task(seed)}/comments/{comment.id}/"
+
+
+@_route("notification-list", "get", 4)
+def notification_list(seed, role):
+    return "/api/notifications/"
+
+
+@_route("mark-notification-read", "post", 3)
+def notification_read(seed, role):
+    notification = seed.users[role].notifications.first()
+    return f"/api/notifications/{notification.id}/read/"
+
+
+@_route("mark-all-notifications-read", "post", 2)
+def notification_read_all(seed, role):
+    return "/api/notifications/mark-all-read/"
+
+
+@_route("UserProfileView", "get", 2)
+def user_profile(seed, role):
+    return "/api/user/profile/"
+
+
+@_route("user-account", "get", 1)
+def user_account(seed, role):
+    return "/api/user/account/"
+
+
+ROUTES = [value for value in list(globals().values()) if isinstance(value, Route)]
+
+# View name -> why it isn't budgeted here
+EXEMPT_ROUTES = {
+    "api-root": "DRF router index, no data access",
+    "user-settings": "placeholder class, not a routable view",
+    "upload-workspace-icon": "multipart upload to remote media storage",
+    "workspace-document-download": "streams the file from remote media storage",
+    "UserProfileAvatarView": "multipart upload to remote media storage",
+}
+# Authentication flows (dj-rest-auth, Google, OTP, SimpleJWT) don't read workspace data
+EXEMPT_PREFIXES = ("api/auth/",)
+
+
+# ----------------------- MEASUREMENT -----------------------
+def _route_key(match):
+    view = getattr(match.func, "view_class", None) or getattr(match.func, "cls", match.func)
+    if match.url_name == "user-profile":
+        # Profile and avatar routes share a name
+        return view.__name__
+    return match.url_name
+
+
+def _call(client, seed, role, route):
+    user = seed.users[role]
+    path = route.path(seed, role)
+    data = route.data(seed, role) if route.data else None
+    assert _route_key(resolve(path.split("?")[0])) == route.view, route.id
+
+    # Cold caches: every call pays for its user, membership, throttle and content type lookups
+    cache.clear()
+    ContentType.objects.clear_cache()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = getattr(client, route.method)(path, data=data, format="json")
+        elapsed = time.perf_counter() - started
+    assert response.status_code < 500, (route.id, role, response.status_code)
+    return len(queries), elapsed, queries
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, monkeypatch, settings):
+        # Media URLs are built locally but need a cloud name; pushes would leave the process
+        settings.CLOUDINARY_STORAGE = {"CLOUD_NAME": "query-budgets", "API_KEY": "key", "API_SECRET": "secret"}
+        monkeypatch.setattr(NotificationService, "send_external_push", staticmethod(lambda *args, **kwargs: None))
+
+        self.client = APIClient()
+        self.seeds = {name: seed_workspace(size) for name, size in SIZES.items()}
+
+    @pytest.mark.parametrize("route", ROUTES, ids=lambda route: route.id)
+    def test_route_within_budget(self, route, record_property):
+        for role in ROLES:
+            counts = {}
+            for name, seed in self.seeds.items():
+                count, elapsed, queries = _call(self.client, seed, role, route)
+                counts[name] = count
+                record_property(f"{role}_{name}_queries", count)
+                record_property(f"{role}_{name}_ms", round(elapsed * 1000, 2))
+
+                sql = "\n".join(q["sql"] for q in queries.captured_queries)
+                assert count <= route.budget, (
+                    f"{route.id} as {role} ({name}): {count} queries, budget {route.budget}\n{sql}"
+                )
+
+            assert counts["small"] == counts["large"], (
+                f"{route.id} as {role}: query count depends on data size {counts}"
+            )
+
+
+def _api_routes(patterns, prefix=""):
+    for pattern in patterns:
+        route = f"{prefix}{pattern.pattern}"
+        if hasattr(pattern, "url_patterns"):
+            yield from _api_routes(pattern.url_patterns, route)
+        elif route.startswith("api/") and "format" not in route:
+            yield route, pattern
+
+
+def test_every_route_is_budgeted():
+    budgeted = {route.view for route in ROUTES}
+    missing = []
+    for route, pattern in _api_routes(get_resolver().url_patterns):
+        if route.startswith(EXEMPT_PREFIXES):
+            continue
+        key = _route_key(SimpleNamespace(func=pattern.callback, url_name=pattern.name))
+        if key not in budgeted and key not in EXEMPT_ROUTES:
+            missing.append(route)
+    assert not missing, f"Routes without a query budget: {missing}"
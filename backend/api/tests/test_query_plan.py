@@ -0,0 +1,104 @@
+import pytest
+from django.db.models import Prefetch
+from django.test import RequestFactory
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task, Comment, ActivityLog
+from api.serializers.dashboard_serializers import ActivityLogSerializer, DashboardProjectSerializer
+from api.serializers.project_serializers import ProjectSerializer, TaskSerializer
+from api.serializers.query_plan import plan_queryset
+
+
+def _lookups(queryset):
+    return {
+        lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup: lookup
+        for lookup in queryset._prefetch_related_lookups
+    }
+
+
+@pytest.mark.django_db
+class TestQueryPlan:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        self.project = Project.objects.create(workspace=self.workspace, title="Board", created_by=self.owner)
+
+    def _context(self, query=""):
+        request = RequestFactory().get(f"/?{query}")
+        request.user = self.owner
+        return {"request": request}
+
+    def _add_tasks(self, count):
+        for i in range(count):
+            user = User.objects.create_user(email=f"user{Task.objects.count()}@example.com", password="password123")
+            WorkspaceMember.objects.create(workspace=self.workspace, user=user, role="member")
+            ProjectMember.objects.create(project=self.project, user=user)
+            task = Task.objects.create(
+                project=self.project, title=f"Task {i}", created_by=self.owner,
+                started_by=user, assigned_to=user,
+            )
+            Comment.objects.create(task=task, author=user, content="hi")
+
+    def test_task_plan_follows_sources_and_nested_serializers(self):
+        serializer = TaskSerializer(context=self._context("expand=comments"))
+        queryset = plan_queryset(Task.objects.all(), serializer)
+
+        assert queryset.query.select_related == {
+            "started_by": {"profile": {}},
+            "assigned_to": {"profile": {}},
+        }
+        # Authors render from user cards, so comments need no join
+        assert _lookups(queryset)["comments"] == "comments"
+
+        # Unexpanded relations are not planned
+        assert "comments" not in _lookups(plan_queryset(Task.objects.all(), TaskSerializer))
+
+    def test_method_field_hints(self):
+        queryset = plan_queryset(Project.objects.all(), DashboardProjectSerializer)
+        assert _lookups(queryset)["members"] == "members"
+
+    def test_user_card_fields_read_the_key_column_only(self):
+        queryset = plan_queryset(ActivityLog.objects.all(), ActivityLogSerializer)
+        assert queryset.query.select_related is False
+
+    def test_query_count_does_not_grow_with_rows(self, django_assert_num_queries):
+        context = self._context("expand=comments")
+
+        def render():
+            queryset = plan_queryset(Task.objects.all(), TaskSerializer(context=context))
+            return TaskSerializer(queryset, many=True, context=context).data
+
+        # Tasks, comments and the user cards of both
+        self._add_tasks(1)
+        with django_assert_num_queries(3):
+            render()
+
+        self._add_tasks(5)
+        with django_assert_num_queries(3):
+            data = render()
+        assert all(task["started_by"] and task["comments"] for task in data)
+
+    def test_existing_prefetches_are_kept(self, django_assert_num_queries):
+        self._add_tasks(3)
+        context = self._context("expand=tasks.comments")
+        queryset = ProjectSerializer.setup_queryset(Project.objects.all())
+        planned = plan_queryset(queryset, ProjectSerializer(context=context))
+
+        # The view's tasks prefetch is kept and the comments are planned beyond it
+        lookups = _lookups(planned)
+        assert lookups["tasks"] is _lookups(queryset)["tasks"]
+        assert lookups["tasks__comments"] == "tasks__comments"
+        with django_assert_num_queries(5):
+            data = ProjectSerializer(planned, many=True, context=context).data
+        assert data[0]["task_count"] == 3
+        assert all(len(task["comments"]) == 1 for task in data[0]["tasks"])
+
+    def test_no_joins_into_prefetched_relations(self):
+        queryset = Task.objects.prefetch_related("assigned_to")
+        planned = plan_queryset(queryset, TaskSerializer)
+        assert planned.query.select_related == {"started_by": {"profile": {}}}
+
+    def test_values_querysets_are_left_alone(self):
+        queryset = Task.objects.values("id")
+        assert plan_queryset(queryset, TaskSerializer) is queryset
@@ -0,0 +1,99 @@
+import datetime
+import json
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from api.renderers import ORJSONRenderer
+from api.serializers.dashboard_serializers import ActivityLogSerializer, DashboardMemberSerializer, DashboardTaskSerializer
+from api.serializers.notification_serializers import NotificationSerializer
+from api.serializers.project_serializers import TaskSerializer, ProjectSerializer
+from api.serializers.values import get_values_plan
+from apps.notifications.models import Notification
+from apps.users.models import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, Task, ActivityLog
+
+
+@pytest.mark.django_db
+class TestValuesPlans:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, settings):
+        settings.CLOUDINARY_STORAGE = {"CLOUD_NAME": "test", "API_KEY": "key", "API_SECRET": "secret"}
+        cache.clear()
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.owner.profile.first_name = "Ada"
+        self.owner.profile.avatar = "avatars/ada.png"
+        self.owner.profile.save()
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.project = Project.objects.create(workspace=self.workspace, title="Board", created_by=self.owner)
+        Task.objects.create(
+            project=self.project, title="Assigned", created_by=self.owner, assigned_to=self.member,
+            started_by=self.owner, status="in_progress", due_date=datetime.date(2026, 3, 1),
+        )
+        Task.objects.create(project=self.project, title="Open", created_by=self.owner, priority="high")
+        ActivityLog.objects.create(workspace=self.workspace, actor=self.member, action_type="comment", target_text="Open")
+        project_type = ContentType.objects.get_for_model(Project)
+        Notification.objects.create(
+            recipient=self.member, actor=self.owner, content_type=project_type, object_id=self.project.id,
+            title="Added", message="You were added",
+        )
+        Notification.objects.create(
+            recipient=self.member, content_type=project_type, object_id=self.project.id,
+            title="System", message="Maintenance",
+        )
+
+    def _context(self, query=""):
+        request = Request(APIRequestFactory().get(f"/?{query}"))
+        request.user = self.owner
+        return {"request": request}
+
+    @pytest.mark.parametrize("serializer_class,model,query", [
+        (TaskSerializer, Task, ""),
+        (TaskSerializer, Task, "fields=id,title,assigned_to"),
+        (TaskSerializer, Task, "fields=id,comments"),
+        (NotificationSerializer, Notification, ""),
+        (NotificationSerializer, Notification, "fields=id,actor.full_name,target_type"),
+        (ActivityLogSerializer, ActivityLog, ""),
+        (DashboardTaskSerializer, Task, ""),
+        (DashboardMemberSerializer, WorkspaceMember, ""),
+    ])
+    def test_plan_matches_serializer_output(self, serializer_class, model, query):
+        context = self._context(query)
+        queryset = model.objects.order_by("pk")
+        plan = get_values_plan(serializer_class(context=context))
+        if "comments" in query:
+            # Rendering nested many relations is left to the serializer
+            assert plan is None
+            return
+
+        expected = serializer_class(queryset, many=True, context=context).data
+        assert plan.render(plan.values(queryset)) == expected
+        assert JSONRenderer().render(plan.render(plan.values(queryset))) == JSONRenderer().render(expected)
+
+    def test_serializers_with_many_nesting_have_no_plan(self):
+        assert get_values_plan(ProjectSerializer(context=self._context())) is None
+
+    def test_orjson_renderer_matches_drf(self):
+        data = TaskSerializer(Task.objects.all(), many=True).data
+        data.append({"text": "line separator", "at": datetime.datetime(2026, 1, 2, 3, 4, 5, 600000)})
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert b"\\u2028" in ORJSONRenderer().render(data)
+
+    def test_list_views_render_through_the_plan(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.member)}")
+        response = client.get("/api/notifications/")
+        assert response.status_code == 200
+        context = self._context()
+        expected = NotificationSerializer(
+            Notification.objects.order_by("is_read", "-created_at", "-id"), many=True, context=context
+        ).data
+        assert response.json()["results"] == json.loads(JSONRenderer().render(expected))
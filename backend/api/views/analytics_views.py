@@ -0,0 +1,70 @@
+# api/views/analytics_views.py
+import datetime
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from django.utils import timezone
+
+from apps.workspace.models import Project, TaskRollup
+from apps.workspace.models.project import ADMIN_ROLES
+from apps.workspace.analytics import task_series
+from apps.workspace.permissions.permissions import IsWorkspaceMemberOrAdmin
+from apps.workspace.permissions.access import get_request_access
+from api.views.params import date_param, id_param
+
+MAX_BUCKETS = 366
+DEFAULT_BUCKETS = {TaskRollup.Period.DAY: 30, TaskRollup.Period.WEEK: 12}
+
+
+class TaskAnalyticsView(APIView):
+    """
+    Task series of a workspace, read from the TaskRollup table only.
+
+    Query params: period (day / week), start and end (YYYY-MM-DD, inclusive;
+    the last 30 days or 12 weeks by default), project and assignee (ids).
+    Members who aren't admins only see the projects they can access.
+    """
+    permission_classes = [
+        IsAuthenticated,
+        IsWorkspaceMemberOrAdmin
+    ]
+    metrics = ("created", "started", "completed", "open", "overdue")
+    default_period = TaskRollup.Period.DAY
+
+    def get(self, request, workspace_id):
+        role = get_request_access(request).workspace_role(workspace_id)
+        if not role:
+            return Response({"error": "Access denied"}, status=403)
+
+        period = request.query_params.get("period", self.default_period)
+        if period not in TaskRollup.Period.values:
+            raise ValidationError({"period": f"Expected one of {', '.join(TaskRollup.Period.values)}."})
+        step = 7 if period == TaskRollup.Period.WEEK else 1
+        end = date_param(request, "end", timezone.localdate())
+        start = date_param(request, "start", end - datetime.timedelta(days=step * (DEFAULT_BUCKETS[period] - 1)))
+        if start > end:
+            raise ValidationError({"start": "Must not be after end."})
+        if (end - start).days // step >= MAX_BUCKETS:
+            raise ValidationError({"start": f"At most {MAX_BUCKETS} buckets per request."})
+
+        rollups = TaskRollup.objects.filter(workspace_id=workspace_id)
+        if role not in ADMIN_ROLES:
+            rollups = rollups.filter(
+                project__in=Project.objects.accessible_to(request.user, workspace_id, role=role).values("id")
+            )
+        project_id, assignee_id = id_param(request, "project"), id_param(request, "assignee")
+        if project_id:
+            rollups = rollups.filter(project_id=project_id)
+        if assignee_id:
+            rollups = rollups.filter(assignee_id=assignee_id)
+
+        series = task_series(rollups, period, start, end)
+        return Response({
+            "period": period,
+            "results": [
+                {"bucket": row["bucket"], **{metric: row[metric] for metric in self.metrics}}
+                for row in series
+            ],
+        })
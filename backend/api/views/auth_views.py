@@ -14,6 +14,8 @@ from apps.users.models import OTPRequest
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
+from dj_rest_auth.views import LogoutView as BaseLogoutView
+from middleware.authentication import get_request_token, revoke_token
 
 User = get_user_model()
 
@@ -39,6 +41,19 @@ class GoogleLogin(SocialLoginView):
         return response
 
     
+class LogoutView(BaseLogoutView):
+    """
+    dj-rest-auth's logout, which also revokes the access token the request was
+    made with; otherwise it stays valid until it expires.
+    """
+
+    def logout(self, request):
+        token = get_request_token(request)
+        if token is not None:
+            revoke_token(token.validated_token, token.raw_token)
+        return super().logout(request)
+
+
 class RequestOTPView(APIView):
     def post(self, request):
         email = request.data.get('email')
@@ -2,11 +2,15 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q
+from django.core.cache import cache
+from django.http import Http404
 
-from apps.workspace.models import Workspace, Project, Task, ActivityLog, WorkspaceMember
-from api.serializers.project_serializers import ProjectSerializer
+from apps.workspace.models import Project, Task
+from apps.workspace.models.project import ADMIN_ROLES
+from apps.workspace.counters import get_workspace_counters
+from api.serializers.project_serializers import ProjectListSerializer
+from api.serializers.query_plan import plan_queryset
+from api.serializers.values import get_values_plan
 from api.serializers.dashboard_serializers import (
     DashboardProjectSerializer,
     DashboardTaskSerializer,
@@ -19,69 +23,99 @@ from api.serializers.dashboard_serializers import (
 from apps.workspace.permissions.permissions import (
     IsWorkspaceMemberOrAdmin,
 )
+from apps.workspace.permissions.access import get_request_access
+from apps.workspace.utils import dashboard
+from apps.workspace.utils.versions import get_versions, workspace_version_key
+from api.conditional import versioned_etag
+
+
+def _render(serializer_class, queryset):
+    """Renders `queryset` through the serializer's values() fast path when it has one."""
+    plan = get_values_plan(serializer_class())
+    if plan is None:
+        return serializer_class(plan_queryset(queryset, serializer_class), many=True).data
+    return plan.render(plan.values(queryset))
+
+
+def _overlay(request, workspace_id, role):
+    """The role- and user-dependent part of the dashboard."""
+    user = request.user
+    accessible_projects = Project.objects.accessible_to(user, workspace_id, role=role)
+    accessible_tasks = Task.objects.accessible_to(user, workspace_id, role=role)
+
+    # Active projects
+    projects_queryset = ProjectListSerializer.setup_queryset(
+        accessible_projects.filter(status__in=['active', 'planning']),
+        user,
+    ).order_by('-updated_at')[:4]
+
+    # "My Priorities" (Tasks assigned to ME)
+    my_tasks_queryset = accessible_tasks.filter(
+        assigned_to=user,
+        status__in=['pending', 'in_progress']
+    ).order_by('due_date', '-created_at')[:5]
+
+    if role in ADMIN_ROLES:
+        # Admins see every project, so the workspace counters are their counts
+        counters = get_workspace_counters(workspace_id)
+        total_projects, total_tasks = counters.projects, counters.tasks
+    else:
+        total_projects, total_tasks = accessible_projects.count(), accessible_tasks.count()
+
+    return {
+        "total_projects": total_projects,
+        "total_tasks": total_tasks,
+        "active_projects": list(ProjectListSerializer(projects_queryset, many=True, context={'request': request}).data),
+        "my_tasks": list(_render(DashboardTaskSerializer, my_tasks_queryset)),
+    }
+
 
 class WorkspaceDashboardView(APIView):
+    """
+    Served from two cached parts (apps.workspace.utils.dashboard): the
+    workspace snapshot, shared by every member and patched in place by
+    writes, and a per-user overlay for the role-dependent counts, projects
+    and "my tasks", keyed by the workspace version.
+    """
     permission_classes = [
         IsAuthenticated,
         IsWorkspaceMemberOrAdmin
     ]
 
+    @versioned_etag(lambda view, request, workspace_id: [workspace_version_key(workspace_id)])
     def get(self, request, workspace_id):
-        user = request.user
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-
         # 1. Verify Membership
-        membership = WorkspaceMember.objects.filter(workspace=workspace, user=user).first()
-        if not membership:
+        role = get_request_access(request).workspace_role(workspace_id)
+        if not role:
             return Response({"error": "Access denied"}, status=403)
 
-        # Filter projects based on role & visibility
-        if membership.role in ['owner', 'admin']:
-            accessible_projects = Project.objects.filter(workspace=workspace)
+        snapshot = dashboard.get_dashboard_snapshot(workspace_id)
+        if snapshot is None:
+            raise Http404
+
+        # 2. Projects and tasks, filtered on role & visibility
+        if dashboard.dashboard_cache_enabled():
+            version = get_versions([workspace_version_key(workspace_id)])[0]
+            key = dashboard.dashboard_overlay_key(workspace_id, request.user.pk, version)
+            overlay = cache.get(key)
+            if overlay is None:
+                overlay = _overlay(request, workspace_id, role)
+                cache.set(key, overlay, timeout=dashboard.DASHBOARD_SNAPSHOT_TIMEOUT)
         else:
-            accessible_projects = Project.objects.filter(
-                workspace=workspace
-            ).filter(
-                Q(visibility='public') | Q(members__user=user)
-            ).distinct()
-
-        # 2. Get Active Projects
-        projects_queryset = accessible_projects.filter(
-            status__in=['active', 'planning']
-        ).annotate(
-            total_tasks=Count('tasks'),
-            completed_tasks=Count('tasks', filter=Q(tasks__status='completed'))
-        ).order_by('-updated_at')[:4]
-
-        # 3. Get "My Priorities" (Tasks assigned to ME)
-        my_tasks_queryset = Task.objects.filter(
-            project__in=accessible_projects,
-            assigned_to=user,
-            status__in=['pending', 'in_progress']
-        ).select_related('project').order_by('due_date', '-created_at')[:5]
-
-        # 4. Get Recent Activity
-        activity_queryset = ActivityLog.objects.filter(
-            workspace=workspace
-        ).select_related('actor').order_by('-created_at')[:10]
-
-        # 5. Get Recent Members (For the "Team" widget)
-        members_queryset = WorkspaceMember.objects.filter(
-            workspace=workspace
-        ).select_related('user').order_by('-joined_at')[:5]
-
-        # 6. Serialize Everything
+            overlay = _overlay(request, workspace_id, role)
+
+        # 3. Serialize Everything
         data = {
-            "workspace_name": workspace.name,
-            "workspace_logo": workspace.logo.url if workspace.logo else None,
-            "workspace_description": workspace.description,
-            "total_members": WorkspaceMember.objects.filter(workspace=workspace).count(),
-            "total_projects": accessible_projects.count(),
-            "total_tasks": Task.objects.filter(project__in=accessible_projects).count(),
-            "active_projects": ProjectSerializer(projects_queryset, many=True, context={'request': request}).data,
-            "my_tasks": DashboardTaskSerializer(my_tasks_queryset, many=True).data,
-            "activities": ActivityLogSerializer(activity_queryset, many=True).data,
-            "recent_members": DashboardMemberSerializer(members_queryset, many=True).data
+            "workspace_name": snapshot["workspace_name"],
+            "workspace_logo": snapshot["workspace_logo"],
+            "workspace_description": snapshot["workspace_description"],
+            "total_members": snapshot["total_members"],
+            "total_projects": overlay["total_projects"],
+            "total_tasks": overlay["total_tasks"],
+            "active_projects": overlay["active_projects"],
+            "my_tasks": overlay["my_tasks"],
+            "activities": ActivityLogSerializer(dashboard.activities(snapshot), many=True).data,
+            "recent_members": DashboardMemberSerializer(dashboard.members(snapshot), many=True).data,
         }
 
-        return Response(data)
\ No newline at end of file
+        return Response(data)
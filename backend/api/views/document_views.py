@@ -7,15 +7,18 @@ from django.shortcuts import get_object_or_404
 from django.http import FileResponse
 from django.db.models import Q
 
-from apps.workspace.models import Workspace, WorkspaceMember
+from apps.workspace.models import Workspace
+from apps.workspace.permissions.access import get_request_access
 from apps.workspace.models.document import WorkspaceDocument
 from api.serializers.document_serializers import (
     DocumentSerializer,
     CreateDocumentSerializer,
 )
+from api.views.mixins import QueryPlanMixin
+from api.pagination import KeysetPagination
 
 
-class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
+class WorkspaceDocumentViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     """
     CRUD for workspace documents.
     
@@ -27,51 +30,33 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
     """
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_serializer_class(self):
         if self.action == 'create':
             return CreateDocumentSerializer
         return DocumentSerializer
 
-    def _get_workspace_and_membership(self):
-        """Helper to get workspace and current user's membership."""
+    def _get_workspace_and_role(self):
+        """Helper to get workspace and current user's workspace role."""
         workspace_id = self.kwargs.get('workspace_id')
         workspace = get_object_or_404(Workspace, id=workspace_id)
-        membership = WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=self.request.user,
-        ).first()
-        return workspace, membership
+        role = get_request_access(self.request).workspace_role(workspace.id)
+        return workspace, role
 
     def get_queryset(self):
         workspace_id = self.kwargs.get('workspace_id')
-        user = self.request.user
-
-        # Get membership
-        membership = WorkspaceMember.objects.filter(
-            workspace_id=workspace_id,
-            user=user,
-        ).first()
-
-        if not membership:
-            return WorkspaceDocument.objects.none()
-
-        # Admin/Owner can see everything
-        if membership.role in ['admin', 'owner']:
-            return WorkspaceDocument.objects.filter(
-                workspace_id=workspace_id
-            ).select_related('uploaded_by')
-
-        # Regular members: public docs + their own private docs
-        return WorkspaceDocument.objects.filter(
-            workspace_id=workspace_id
-        ).filter(
-            Q(visibility='public') | Q(uploaded_by=user)
+        role = get_request_access(self.request).workspace_role(workspace_id)
+
+        # Admin/Owner can see everything, regular members: public docs + their own private docs
+        return WorkspaceDocument.objects.accessible_to(
+            self.request.user, workspace_id, role=role
         ).select_related('uploaded_by')
 
     def list(self, request, *args, **kwargs):
-        workspace, membership = self._get_workspace_and_membership()
-        if not membership:
+        workspace, role = self._get_workspace_and_role()
+        if not role:
             return Response(
                 {"error": "You are not a member of this workspace."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -79,8 +64,8 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
-        workspace, membership = self._get_workspace_and_membership()
-        if not membership:
+        workspace, role = self._get_workspace_and_role()
+        if not role:
             return Response(
                 {"error": "You are not a member of this workspace."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -101,8 +86,8 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
     def retrieve(self, request, *args, **kwargs):
-        workspace, membership = self._get_workspace_and_membership()
-        if not membership:
+        workspace, role = self._get_workspace_and_role()
+        if not role:
             return Response(
                 {"error": "You are not a member of this workspace."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -112,7 +97,7 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
 
         # Private doc: only uploader + admin/owner
         if document.visibility == 'private':
-            if document.uploaded_by != request.user and membership.role not in ['admin', 'owner']:
+            if document.uploaded_by_id != request.user.id and role not in ['admin', 'owner']:
                 return Response(
                     {"error": "You don't have permission to view this document."},
                     status=status.HTTP_403_FORBIDDEN,
@@ -122,8 +107,8 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     def destroy(self, request, *args, **kwargs):
-        workspace, membership = self._get_workspace_and_membership()
-        if not membership:
+        workspace, role = self._get_workspace_and_role()
+        if not role:
             return Response(
                 {"error": "You are not a member of this workspace."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -132,7 +117,7 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
         document = self.get_object()
 
         # Only uploader or admin/owner can delete
-        if document.uploaded_by != request.user and membership.role not in ['admin', 'owner']:
+        if document.uploaded_by_id != request.user.id and role not in ['admin', 'owner']:
             return Response(
                 {"error": "You don't have permission to delete this document."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -148,8 +133,8 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], url_path='download')
     def download(self, request, *args, **kwargs):
         """Serve the document file for download."""
-        workspace, membership = self._get_workspace_and_membership()
-        if not membership:
+        workspace, role = self._get_workspace_and_role()
+        if not role:
             return Response(
                 {"error": "You are not a member of this workspace."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -159,7 +144,7 @@ class WorkspaceDocumentViewSet(viewsets.ModelViewSet):
 
         # Private doc: only uploader + admin/owner
         if document.visibility == 'private':
-            if document.uploaded_by != request.user and membership.role not in ['admin', 'owner']:
+            if document.uploaded_by_id != request.user.id and role not in ['admin', 'owner']:
                 return Response(
                     {"error": "You don't have permission to download this document."},
                     status=status.HTTP_403_FORBIDDEN,
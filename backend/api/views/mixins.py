@@ -0,0 +1,55 @@
+from rest_framework.response import Response
+
+from api.serializers.mixins import DynamicFieldsMixin
+from api.serializers.query_plan import plan_queryset
+from api.serializers.values import get_values_plan
+
+
+class QueryPlanMixin:
+    """
+    Applies the select_related / prefetch_related plan of the view's serializer
+    (see api.serializers.query_plan) to the queryset used by list and get_object,
+    so nested fields don't add per-row queries. Serializers with ?fields= /
+    ?expand= support are planned as instantiated for the request.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, DynamicFieldsMixin):
+            return plan_queryset(queryset, self.get_serializer())
+        return plan_queryset(queryset, serializer_class)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        # UpdateModelMixin drops the instance's prefetch cache after saving, so the
+        # response is rendered from the instance reloaded through the planned queryset
+        instance = self.filter_queryset(self.get_queryset()).filter(pk=serializer.instance.pk).first()
+        if instance is not None:
+            serializer.instance = instance
+
+
+class ValuesListMixin:
+    """
+    Renders list responses through the serializer's values() fast path (see
+    api.serializers.values): same output, without building model instances
+    or walking the field tree per row. Serializers without a fast path use the
+    regular list().
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = get_values_plan(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        # The cursor pagination reads its ordering fields from the rows
+        ordering = getattr(self, "keyset_ordering", ())
+        rows = plan.values(
+            self.filter_queryset(self.get_queryset()),
+            *(field.lstrip("-") for field in ordering),
+        )
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
@@ -12,14 +12,24 @@ from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from apps.notifications.models import Notification
 from api.serializers.notification_serializers import NotificationSerializer
+from api.views.mixins import QueryPlanMixin, ValuesListMixin
+from api.pagination import KeysetPagination
+from api.conditional import versioned_etag
+from apps.workspace.utils.versions import bump_user_versions, user_version_key
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(ValuesListMixin, QueryPlanMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    # Unread first, then newest
+    keyset_ordering = ("is_read", "-created_at", "-id")
 
     def get_queryset(self):
-        # Return unread first, then newest
-        return Notification.objects.filter(recipient=self.request.user).order_by('is_read', '-created_at')
+        return Notification.objects.filter(recipient=self.request.user).order_by(*self.keyset_ordering)
+
+    @versioned_etag(lambda view, request: [user_version_key(request.user.pk)])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
 class MarkNotificationReadView(views.APIView):
     permission_classes = [IsAuthenticated]
@@ -43,4 +53,5 @@ class MarkAllReadView(views.APIView):
             is_read=True, 
             read_at=timezone.now()
         )
+        bump_user_versions([request.user.pk])
         return Response({"status": "all marked as read"})
\ No newline at end of file
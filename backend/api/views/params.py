@@ -0,0 +1,26 @@
+# api/views/params.py
+"""Parsing of query params shared by the views; bad values raise a 400."""
+import datetime
+import uuid
+
+from rest_framework.exceptions import ValidationError
+
+
+def date_param(request, name, default=None):
+    value = request.query_params.get(name)
+    if not value:
+        return default
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: "Expected a date as YYYY-MM-DD."})
+
+
+def id_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        raise ValidationError({name: "Expected an id."})
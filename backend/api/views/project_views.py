@@ -6,7 +6,7 @@ from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
 # from apps.workspace.permissions.project_permissions import HasProjectAccess
 # from apps.workspace.permissions.workspace_permissions import IsWorkspaceMember
 from apps.workspace.permissions.permissions import (
@@ -24,9 +24,11 @@ from apps.workspace.models import (
     Comment
 )
 from apps.users.models import User
+from apps.workspace.permissions.access import get_request_access
 
 from api.serializers.project_serializers import (
     ProjectSerializer,
+    ProjectListSerializer,
     ProjectWriteSerializer,
     TaskSerializer,
     TaskWriteSerializer,
@@ -34,6 +36,11 @@ from api.serializers.project_serializers import (
     ProjectMemberSerializer
 )
 from apps.notifications.notification_services import NotificationService
+from api.views.mixins import QueryPlanMixin, ValuesListMixin
+from api.pagination import KeysetPagination
+from api.conditional import versioned_etag
+from apps.workspace.utils.versions import bump_workspace_versions, workspace_version_key
+from apps.workspace import analytics, counters
 from apps.workspace.services import (
     create_project_service,
     start_task_service, 
@@ -45,7 +52,7 @@ from django.db.models import Q
 
 
 # ----------------------- PROJECT -----------------------
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(QueryPlanMixin, viewsets.ModelViewSet):
 
     permission_classes = [
         IsAuthenticated, 
@@ -55,29 +62,34 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ["create"]:
             return ProjectWriteSerializer
+        if self.action == "list":
+            return ProjectListSerializer
         return ProjectSerializer
 
     def get_queryset(self):
         workspace_id = self.kwargs.get("workspace_id")
-        user = self.request.user
+        role = get_request_access(self.request).workspace_role(workspace_id)
 
-        try:
-            membership = getattr(self.request, 'workspace_memberships', None) or \
-                WorkspaceMember.objects.get(workspace_id=workspace_id, user=user)
-        except WorkspaceMember.DoesNotExist:
-            return Project.objects.all()
-        
-        base_qs = Project.objects.filter(workspace_id=workspace_id)
-        
-        # Admins see everything
-        if membership.role in ['owner', 'admin']:
-            return base_qs
-        
-        # Members see Public + Their Projects
-        return base_qs.filter(
-            Q(visibility='public') | 
-            Q(members__user=user)
-        ).distinct()
+        # Admins see everything, members see Public + Their Projects
+        queryset = Project.objects.accessible_to(self.request.user, workspace_id, role=role)
+
+        # Prefetch plan of the representation being rendered
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "setup_queryset"):
+            queryset = serializer_class.setup_queryset(queryset, self.request.user)
+        return queryset
+
+    # The ETag binds the user and the path, and access changes bump the
+    # workspace, so a 304 never reveals a project the user can no longer see
+    @versioned_etag(lambda view, request, workspace_id, pk: [workspace_version_key(workspace_id)])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            counters.project_deleted(instance)
+            instance.delete()
+        bump_workspace_versions([instance.workspace_id])
 
     def perform_create(self, serializer):
         workspace_id = self.kwargs.get("workspace_id")
@@ -90,10 +102,12 @@ class ProjectViewSet(viewsets.ModelViewSet):
         )
 
 
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(ValuesListMixin, QueryPlanMixin, generics.ListCreateAPIView):
     permission_classes = [
         IsTaskCollaboratorOrProjectAdmin
     ]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-created_at", "-id")
 
     def get_serializer_class(self):
         # "self.action" does not exist in Generic Views, use request.method
@@ -108,7 +122,7 @@ class TaskListCreateView(generics.ListCreateAPIView):
         return Task.objects.filter(
             project__id=self.kwargs["project_id"], 
             project__workspace_id=self.kwargs["workspace_id"]
-        ).order_by("-created_at")
+        ).order_by("-created_at", "-id")
 
     def perform_create(self, serializer):
         workspace_id = self.kwargs.get("workspace_id")
@@ -144,7 +158,7 @@ class TaskListCreateView(generics.ListCreateAPIView):
                 category='task_assigned',
             )
 
-class TaskRetrieveUpdateView(generics.RetrieveUpdateDestroyAPIView):
+class TaskRetrieveUpdateView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [
         IsAuthenticated,
@@ -155,43 +169,27 @@ class TaskRetrieveUpdateView(generics.RetrieveUpdateDestroyAPIView):
     lookup_url_kwarg = "task_id"
 
     def get_queryset(self):
-        workspace_id = self.kwargs.get("workspace_id")
-        project_id = self.kwargs.get("project_id")
-        user = self.request.user
-
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-        project = get_object_or_404(Project, id=project_id, workspace=workspace)
-
-
-        return Task.objects.filter(project=project)
+        # The permission check has already resolved the project within the workspace;
+        # the project is joined for the version bump on save (see signals.py)
+        return Task.objects.filter(
+            project_id=self.kwargs.get("project_id"),
+            project__workspace_id=self.kwargs.get("workspace_id"),
+        ).select_related("project")
 
     def perform_update(self, serializer):
-        workspace_id = self.kwargs.get("workspace_id")
-        project_id = self.kwargs.get("project_id")
-        task_id = self.kwargs.get("task_id")
-        user = self.request.user
-
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-        project = get_object_or_404(Project, id=project_id, workspace=workspace)
-        task = get_object_or_404(Task, id=task_id, project=project)
-
-
-        serializer.save(project=project)
+        # The task was looked up within the project, so it stays there
+        super().perform_update(serializer)
 
     def perform_destroy(self, instance):
-        workspace_id = self.kwargs.get("workspace_id")
-        project_id = self.kwargs.get("project_id")
-        user = self.request.user
-
-        workspace = get_object_or_404(Workspace, id=workspace_id)
-        project = get_object_or_404(Project, id=project_id, workspace=workspace)
-
-
-        instance.delete()
+        with transaction.atomic():
+            counters.task_deleted(instance, instance.project.workspace_id)
+            analytics.task_deleted(instance, instance.project.workspace_id)
+            instance.delete()
+        bump_workspace_versions([self.kwargs.get("workspace_id")])
 
 
 # ----------------------- PROJECT MEMBERS -----------------------
-class ProjectMemberView(generics.ListCreateAPIView):
+class ProjectMemberView(QueryPlanMixin, generics.ListCreateAPIView):
     serializer_class = ProjectMemberSerializer
     permission_classes = [
         IsAuthenticated,
@@ -207,13 +205,7 @@ class ProjectMemberView(generics.ListCreateAPIView):
         workspace_id = self.kwargs.get("workspace_id")
         project_id = self.kwargs.get("project_id")
         
-        is_admin = WorkspaceMember.objects.filter(
-            workspace_id=workspace_id,
-            user=request.user,
-            role__in=["owner", "admin", "moderator"]
-        ).exists()
-        
-        if not is_admin:
+        if not get_request_access(request).is_workspace_admin(workspace_id):
             raise PermissionDenied("Only admins can add members.")
 
         # 2. Get Data
@@ -288,8 +280,8 @@ class CompleteTaskView(APIView):
         if task.status != 'in_progress':
              return Response({"detail": "Task is not in progress."}, status=status.HTTP_400_BAD_REQUEST)
              
-        workspace_member = WorkspaceMember.objects.filter(workspace=task.project.workspace, user=request.user).first()
-        if task.started_by != request.user and getattr(workspace_member, 'role', None) not in ['owner', 'admin']:
+        is_admin = get_request_access(request).is_workspace_admin(workspace_id)
+        if task.started_by_id != request.user.id and not is_admin:
             return Response({"detail": "You are not the user that started this task."}, status=status.HTTP_403_FORBIDDEN)
 
         # Service Call
@@ -299,18 +291,20 @@ class CompleteTaskView(APIView):
 
 
 # ----------------------- COMMENTS -----------------------
-class CommentListCreateView(generics.ListCreateAPIView):
+class CommentListCreateView(QueryPlanMixin, generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     permission_classes = [
         IsAuthenticated, 
         IsTaskCollaboratorOrProjectAdmin
     ]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("created_at", "id")
     
     def get_queryset(self):
         # We don't need the service for GET, just standard optimization
         return Comment.objects.filter(
             task_id=self.kwargs.get("task_id")
-        ).select_related('author').order_by("created_at")
+        ).select_related('author').order_by("created_at", "id")
 
     def perform_create(self, serializer):
         # Get the Task object
@@ -328,7 +322,7 @@ class CommentListCreateView(generics.ListCreateAPIView):
         )
 
 
-class CommentRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class CommentRetrieveUpdateDestroyView(QueryPlanMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CommentSerializer
     permission_classes = [
         IsAuthenticated,
@@ -348,7 +342,7 @@ class CommentRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             task__id=task_id,
             task__project__id=project_id,
             task__project__workspace__id=workspace_id
-        )
+        ).select_related('task__project')
 
     def check_object_permissions(self, request, obj):
         super().check_object_permissions(request, obj)
@@ -358,16 +352,16 @@ class CommentRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         # 2. Admins/Owners can delete (but maybe not edit content?)
         
         if request.method in ['PUT', 'PATCH']:
-            if obj.author != request.user:
+            if obj.author_id != request.user.id:
                 raise PermissionDenied("You can only edit your own comments.")
         
         if request.method == 'DELETE':
             # Check if admin/owner of workspace
-            is_admin = WorkspaceMember.objects.filter(
-                workspace_id=self.kwargs.get("workspace_id"),
-                user=request.user,
-                role__in=['admin', 'owner']
-            ).exists()
-            
-            if obj.author != request.user and not is_admin:
-                raise PermissionDenied("You can only delete your own comments.")
\ No newline at end of file
+            is_admin = get_request_access(request).is_workspace_admin(self.kwargs.get("workspace_id"))
+
+            if obj.author_id != request.user.id and not is_admin:
+                raise PermissionDenied("You can only delete your own comments.")
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        bump_workspace_versions([self.kwargs.get("workspace_id")])
\ No newline at end of file
@@ -10,6 +10,7 @@ from api.serializers.profile_serializers import (
     AccountProfileSerializer,
     AccountProfileAvatarSerializer
 )
+from api.views.mixins import QueryPlanMixin
 
 
 # catching
@@ -20,7 +21,7 @@ from django.utils.decorators import method_decorator
 # rate limiting
 from rest_framework.throttling import ScopedRateThrottle
 
-class PublicUserProfileView(generics.RetrieveAPIView):
+class PublicUserProfileView(QueryPlanMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = AccountProfileSerializer
     lookup_field = "username"
@@ -4,13 +4,16 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Prefetch
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.exceptions import NotFound
 
 from apps.workspace.permissions.permissions import (
     IsWorkspaceMemberOrAdmin,
 )
+from apps.workspace.permissions.access import get_request_access
+from apps.workspace import counters
 
 from apps.workspace.models import (
     Workspace,
@@ -31,76 +34,88 @@ from api.serializers.workspace_serializers import (
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from apps.notifications.notification_services import NotificationService
+from api.serializers.mixins import parse_field_tree
+from api.serializers.query_plan import plan_queryset
+from api.views.mixins import QueryPlanMixin
+from api.pagination import KeysetPagination
 
 
 User = get_user_model()
 
     
-class WorkspaceViewSet(viewsets.ModelViewSet):
+class WorkspaceViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     permission_classes = [
         IsAuthenticated,
         IsWorkspaceMemberOrAdmin
     ]
+    # Cursor order of the paginated members action
+    keyset_ordering = ("joined_at", "id")
 
     def get_serializer_class(self):
         if self.action == "create":
             return CreateWorkspaceSerializer
+        if self.action == "members":
+            return WorkspaceMemberSerializer
         return WorkspaceSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        return Workspace.objects.filter(
-            Q(owner=user) |
-            Q(members__user=user)
-        ).distinct()
+        queryset = Workspace.objects.accessible_to(self.request.user)
+
+        # Role, member count and member preview of the representation
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, "setup_queryset"):
+            queryset = serializer_class.setup_queryset(queryset, self.request.user)
+        return queryset
 
     def perform_create(self, serializer):
         template = self.request.data.get("template", "agile")
-        workspace = serializer.save(owner=self.request.user)
-
-        # Ensure owner is also a member
-        WorkspaceMember.objects.create(
-            workspace=workspace,
-            user=self.request.user,
-            role="owner",
-        )
+        # Counted once at the end (see counters.batched)
+        with transaction.atomic(), counters.batched():
+            workspace = serializer.save(owner=self.request.user)
 
-        # Create starter project & tasks based on selected template
-        if template == "agile":
-            project = Project.objects.create(
-                workspace=workspace,
-                title="Sprint 1 - Agile Board",
-                description="Agile sprint board with Backlog, Active Sprint, In Review, and Done tasks.",
-                status="active",
-                created_by=self.request.user,
-            )
-            ProjectMember.objects.create(project=project, user=self.request.user, permission="write")
-            Task.objects.create(project=project, title="Design Database Schema", description="Setup initial model relations and migrations.", status="completed", priority="high", created_by=self.request.user)
-            Task.objects.create(project=project, title="Implement Auth Flow", description="Frontend & backend authentication integration.", status="in_progress", priority="high", created_by=self.request.user)
-            Task.objects.create(project=project, title="Build User Dashboard UI", description="Modern dashboard widgets and task cards.", status="pending", priority="medium", created_by=self.request.user)
-        elif template == "kanban":
-            project = Project.objects.create(
-                workspace=workspace,
-                title="Kanban Task Tracker",
-                description="Kanban workflow tracking To Do, In Progress, Blocked, and Completed items.",
-                status="active",
-                created_by=self.request.user,
-            )
-            ProjectMember.objects.create(project=project, user=self.request.user, permission="write")
-            Task.objects.create(project=project, title="Setup Project Repository", description="Initialize Git workspace repo and dependencies.", status="completed", priority="medium", created_by=self.request.user)
-            Task.objects.create(project=project, title="Integrate REST API Client", description="Connect React Query with DRF endpoints.", status="in_progress", priority="high", created_by=self.request.user)
-            Task.objects.create(project=project, title="Write E2E Integration Tests", description="Ensure key user flows pass testing.", status="pending", priority="low", created_by=self.request.user)
-        elif template == "roadmap":
-            project = Project.objects.create(
+            # Ensure owner is also a member
+            WorkspaceMember.objects.create(
                 workspace=workspace,
-                title="Product Roadmap Q1/Q2",
-                description="High-level product vision, quarter objectives, and feature release milestones.",
-                status="active",
-                created_by=self.request.user,
+                user=self.request.user,
+                role="owner",
             )
-            ProjectMember.objects.create(project=project, user=self.request.user, permission="write")
-            Task.objects.create(project=project, title="Q1 Release Milestone", description="Deliver v1.0 MVP with workspace & messaging features.", status="in_progress", priority="high", created_by=self.request.user)
-            Task.objects.create(project=project, title="Q2 Analytics Expansion", description="Deliver team analytics dashboard and export features.", status="pending", priority="medium", created_by=self.request.user)
+
+            # Create starter project & tasks based on selected template
+            if template == "agile":
+                project = Project.objects.create(
+                    workspace=workspace,
+                    title="Sprint 1 - Agile Board",
+                    description="Agile sprint board with Backlog, Active Sprint, In Review, and Done tasks.",
+                    status="active",
+                    created_by=self.request.user,
+                )
+                ProjectMember.objects.create(project=project, user=self.request.user, permission="write")
+                Task.objects.create(project=project, title="Design Database Schema", description="Setup initial model relations and migrations.", status="completed", priority="high", created_by=self.request.user)
+                Task.objects.create(project=project, title="Implement Auth Flow", description="Frontend & backend authentication integration.", status="in_progress", priority="high", created_by=self.request.user)
+                Task.objects.create(project=project, title="Build User Dashboard UI", description="Modern dashboard widgets and task cards.", status="pending", priority="medium", created_by=self.request.user)
+            elif template == "kanban":
+                project = Project.objects.create(
+                    workspace=workspace,
+                    title="Kanban Task Tracker",
+                    description="Kanban workflow tracking To Do, In Progress, Blocked, and Completed items.",
+                    status="active",
+                    created_by=self.request.user,
+                )
+                ProjectMember.objects.create(project=project, user=self.request.user, permission="write")
+                Task.objects.create(project=project, title="Setup Project Repository", description="Initialize Git workspace repo and dependencies.", status="completed", priority="medium", created_by=self.request.user)
+                Task.objects.create(project=project, title="Integrate REST API Client", description="Connect React Query with DRF endpoints.", status="in_progress", priority="high", created_by=self.request.user)
+                Task.objects.create(project=project, title="Write E2E Integration Tests", description="Ensure key user flows pass testing.", status="pending", priority="low", created_by=self.request.user)
+            elif template == "roadmap":
+                project = Project.objects.create(
+                    workspace=workspace,
+                    title="Product Roadmap Q1/Q2",
+                    description="High-level product vision, quarter objectives, and feature release milestones.",
+                    status="active",
+                    created_by=self.request.user,
+                )
+                ProjectMember.objects.create(project=project, user=self.request.user, permission="write")
+                Task.objects.create(project=project, title="Q1 Release Milestone", description="Deliver v1.0 MVP with workspace & messaging features.", status="in_progress", priority="high", created_by=self.request.user)
+                Task.objects.create(project=project, title="Q2 Analytics Expansion", description="Deliver team analytics dashboard and export features.", status="pending", priority="medium", created_by=self.request.user)
 
         return workspace
 
@@ -110,12 +125,15 @@ class WorkspaceViewSet(viewsets.ModelViewSet):
         workspace = self.get_object()
         self.check_object_permissions(request, workspace)
 
-        members = WorkspaceMember.objects.filter(
-            workspace=workspace
-        ).select_related("user")
+        members = plan_queryset(
+            WorkspaceMember.objects.filter(workspace=workspace),
+            WorkspaceMemberSerializer,
+        )
 
-        serializer = WorkspaceMemberSerializer(members, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(members, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 class CreateWorkspaceInvitationView(generics.CreateAPIView):
     serializer_class = CreateWorkspaceInvitationSerializer
@@ -137,16 +155,12 @@ class CreateWorkspaceInvitationView(generics.CreateAPIView):
         workspace = get_object_or_404(Workspace, id=workspace_id)
         
         # Check permissions: Is the requester an Admin or Owner?
-        try:
-            member = WorkspaceMember.objects.get(
-                workspace=workspace,
-                user=self.request.user
-            )
-            if member.role not in ["owner", "admin"]:
-                # We raise a PermissionDenied or return Response (GenericAPIView prefers exceptions usually)
-                raise serializers.ValidationError({"detail": "Only admins can invite users."})
-        except WorkspaceMember.DoesNotExist:
-             raise serializers.ValidationError({"detail": "You are not a member of this workspace."})
+        role = get_request_access(self.request).workspace_role(workspace.id)
+        if not role:
+            raise serializers.ValidationError({"detail": "You are not a member of this workspace."})
+        if role not in ["owner", "admin"]:
+            # We raise a PermissionDenied or return Response (GenericAPIView prefers exceptions usually)
+            raise serializers.ValidationError({"detail": "Only admins can invite users."})
 
         # Save with the missing fields that aren't in the request body
         serializer.save(
@@ -170,20 +184,16 @@ class RemoveWorkspaceMemberView(generics.DestroyAPIView):
 
         workspace = get_object_or_404(Workspace, id=workspace_id)
         
-        # 1. Get the member record of the requester (You)
-        try:
-            requester_membership = WorkspaceMember.objects.get(
-                workspace=workspace, 
-                user=request.user
-            )
-        except WorkspaceMember.DoesNotExist:
+        # 1. Get the role of the requester (You)
+        requester_role = get_request_access(request).workspace_role(workspace.id)
+        if not requester_role:
             return Response(
                 {"error": "You are not a member of this workspace."}, 
                 status=status.HTTP_403_FORBIDDEN
             )
 
         # 2. Check if requester has permission (Admin/Owner only)
-        if requester_membership.role not in ['owner', 'admin']:
+        if requester_role not in ['owner', 'admin']:
             return Response(
                 {"error": "Only admins and owners can remove members."}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -215,7 +225,7 @@ class RemoveWorkspaceMemberView(generics.DestroyAPIView):
 
         # Prevent Admins from kicking other Admins (Optional, usually reserved for Owner)
         # If you want Admins to kick other Admins, remove this block.
-        if requester_membership.role == 'admin' and target_membership.role == 'admin':
+        if requester_role == 'admin' and target_membership.role == 'admin':
              return Response(
                 {"error": "Admins cannot remove other admins. Contact the Owner."}, 
                 status=status.HTTP_403_FORBIDDEN
@@ -239,20 +249,16 @@ class LeaveWorkspaceView(generics.DestroyAPIView):
         workspace_id = self.kwargs.get('workspace_id')
         workspace = get_object_or_404(Workspace, id=workspace_id)
         
-        # 1. Find the membership for the current user
-        try:
-            membership = WorkspaceMember.objects.get(
-                workspace=workspace,
-                user=request.user
-            )
-        except WorkspaceMember.DoesNotExist:
+        # 1. Find the role of the current user
+        role = get_request_access(request).workspace_role(workspace.id)
+        if not role:
             return Response(
                 {"error": "You are not a member of this workspace."}, 
                 status=status.HTTP_404_NOT_FOUND
             )
 
         # 2. Critical Check: Owners cannot leave
-        if membership.role == 'owner':
+        if role == 'owner':
             return Response(
                 {
                     "error": "Owners cannot leave their workspace. You must transfer ownership to another member or delete the workspace."
@@ -260,15 +266,16 @@ class LeaveWorkspaceView(generics.DestroyAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 3. Process the leave action
-        membership.delete()
+        # 3. Process the leave action (per instance, so membership signals fire)
+        for membership in WorkspaceMember.objects.filter(workspace=workspace, user=request.user):
+            membership.delete()
 
         return Response(
             {"message": f"You have successfully left {workspace.name}."},
             status=status.HTTP_200_OK
         )
 
-class GetWorkspaceInvitationsView(generics.ListAPIView):
+class GetWorkspaceInvitationsView(QueryPlanMixin, generics.ListAPIView):
     serializer_class = WorkspaceInvitationSerializer
     permission_classes = [
         IsAuthenticated,
@@ -277,10 +284,20 @@ class GetWorkspaceInvitationsView(generics.ListAPIView):
     def get_queryset(self):
         workspace_id = self.request.query_params.get("workspace")
         if workspace_id:
-            return WorkspaceInvitation.objects.filter(workspace_id=workspace_id).select_related("invited_user", "invited_by", "workspace")
-        return WorkspaceInvitation.objects.filter(
-            invited_user=self.request.user
-        ).select_related("invited_user", "invited_by", "workspace")
+            queryset = WorkspaceInvitation.objects.filter(workspace_id=workspace_id)
+        else:
+            queryset = WorkspaceInvitation.objects.filter(invited_user=self.request.user)
+        queryset = queryset.select_related("invited_user", "invited_by")
+
+        # The workspace is rendered as its id unless expanded
+        if "workspace" in parse_field_tree(self.request.query_params.get("expand")):
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "workspace",
+                    queryset=WorkspaceSerializer.setup_queryset(Workspace.objects.all(), self.request.user),
+                )
+            )
+        return queryset
 
 
 class CancelWorkspaceInvitationView(APIView):
@@ -288,9 +305,8 @@ class CancelWorkspaceInvitationView(APIView):
 
     def delete(self, request, invite_id, *args, **kwargs):
         invite = get_object_or_404(WorkspaceInvitation, id=invite_id)
-        membership = WorkspaceMember.objects.filter(workspace=invite.workspace, user=request.user).first()
-        is_inviter = invite.invited_by == request.user
-        is_admin_or_owner = membership and membership.role in ["owner", "admin"]
+        is_inviter = invite.invited_by_id == request.user.id
+        is_admin_or_owner = get_request_access(request).is_workspace_admin(invite.workspace_id)
 
         if not (is_admin_or_owner or is_inviter):
             return Response({"error": "Permission denied."}, status=status.HTTP_403_FORBIDDEN)
@@ -379,13 +395,11 @@ class WorkspaceImageUploadView(generics.UpdateAPIView):
         workspace = get_object_or_404(Workspace, id=workspace_id)
 
         # Only owner/admin
-        member = get_object_or_404(
-            WorkspaceMember,
-            workspace=workspace,
-            user=self.request.user,
-        )
+        role = get_request_access(self.request).workspace_role(workspace.id)
+        if not role:
+            raise NotFound()
 
-        if member.role not in ["owner", "admin"]:
+        if role not in ["owner", "admin"]:
             raise permissions.PermissionDenied(
                 "You do not have permission to update this workspace."
             )
@@ -404,13 +418,11 @@ class WorkspaceMemberRoleView(APIView):
     def post(self, request, workspace_id, user_id):
         workspace = get_object_or_404(Workspace, id=workspace_id)
 
-        requester = get_object_or_404(
-            WorkspaceMember,
-            workspace=workspace,
-            user=request.user,
-        )
+        requester_role = get_request_access(request).workspace_role(workspace.id)
+        if not requester_role:
+            raise NotFound()
 
-        if requester.role not in ["owner", "admin"]:
+        if requester_role not in ["owner", "admin"]:
             return Response(
                 {"error": "Only admins can update roles."},
                 status=status.HTTP_403_FORBIDDEN,
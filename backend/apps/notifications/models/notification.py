@@ -47,7 +47,8 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient', 'is_read']), # Optimize "Unread" queries
+            # "Unread" queries and keyset pages (unread first, then newest)
+            models.Index(fields=['recipient', 'is_read', '-created_at', '-id'], name='notification_inbox_idx'),
         ]
 
     def __str__(self):
@@ -2,6 +2,7 @@ import logging
 import threading
 import requests
 from django.contrib.contenttypes.models import ContentType
+from apps.workspace.utils.versions import bump_user_versions
 from .models import Notification
 
 import os
@@ -116,6 +117,8 @@ class NotificationService:
         ]
         
         created_notifications = Notification.objects.bulk_create(notifications)
+        # bulk_create sends no post_save
+        bump_user_versions(user.pk for user in valid_recipients)
 
         # Send push notifications for each recipient asynchronously
         for notification in created_notifications:
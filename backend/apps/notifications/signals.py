@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.workspace.utils.versions import bump_user_versions
+from .models import Notification
+
+
+@receiver(post_save, sender=Notification)
+def bump_recipient_version(sender, instance, **kwargs):
+    # bulk_create and update() skip this; NotificationService and the
+    # mark-all-read view bump those recipients themselves
+    bump_user_versions([instance.recipient_id])
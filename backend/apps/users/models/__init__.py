@@ -1,4 +1,4 @@
 from .profile import Profile
 from .user import User
 from .settings import UserSettings
-from .auth import OTPRequest
\ No newline at end of file
+from .auth import OTPRequest, RevokedToken
\ No newline at end of file
@@ -17,4 +17,15 @@ class OTPRequest(models.Model):
 
     @staticmethod
     def generate_code():
-        return f"{secrets.randbelow(1000000):06d}"
\ No newline at end of file
+        return f"{secrets.randbelow(1000000):06d}"
+
+
+class RevokedToken(models.Model):
+    """
+    Access tokens revoked before they expire (logout). The durable record that
+    authentication checks; rows past expires_at are no longer needed and are
+    purged on the next revocation.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
@@ -1,10 +1,13 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from django.core.cache import cache
+from django.db import transaction
 from allauth.socialaccount.signals import pre_social_login, social_account_added
 from allauth.account.signals import user_signed_up
-from .models import Profile
+from .models import Profile, UserSettings
+from .utils.user_cache import invalidate_user_cache, invalidate_page_size_cache
+from .utils.user_cards import invalidate_user_cards, write_user_card
 
 User = get_user_model()
 
@@ -14,6 +17,37 @@ def create_user_profile(sender, instance, created, **kwargs):
         Profile.objects.get_or_create(user=instance)
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Covers deactivation, password changes and deletion
+    invalidate_user_cache(instance.pk)
+
+
+@receiver(post_save, sender=UserSettings)
+@receiver(post_delete, sender=UserSettings)
+def invalidate_cached_page_size(sender, instance, **kwargs):
+    invalidate_page_size_cache(instance.user_id)
+
+
+@receiver(post_save, sender=Profile)
+def write_through_user_card(sender, instance, **kwargs):
+    # After commit, so a rolled back save never reaches the cache
+    transaction.on_commit(lambda: write_user_card(instance))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_user_card(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "email" not in update_fields:
+        return  # e.g. logins, which only save last_login
+    user_id = instance.pk if sender is User else instance.user_id
+    # After commit too, so a card read meanwhile can't outlive the change
+    invalidate_user_cards([user_id])
+    transaction.on_commit(lambda: invalidate_user_cards([user_id]))
+
+
 def format_person_name(name_str):
     if not name_str:
         return ""
@@ -86,6 +120,7 @@ def sync_google_profile_data(user, extra_data):
     if updated:
         profile.save()
         cache.delete(f"user_profile:{user.id}")
+        invalidate_user_cards([user.id])
 
 
 @receiver(social_account_added)
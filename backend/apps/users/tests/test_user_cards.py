@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from api.serializers.dashboard_serializers import ActivityLogSerializer
+from api.serializers.notification_serializers import NotificationSerializer
+from apps.notifications.models import Notification
+from apps.users.models import User
+from apps.users.signals import sync_google_profile_data
+from apps.users.utils.user_cards import get_user_cards, user_card_key
+from apps.workspace.models import Workspace, ActivityLog
+
+
+@pytest.mark.django_db
+class TestUserCards:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, django_capture_on_commit_callbacks):
+        cache.clear()
+        self.commit = lambda: django_capture_on_commit_callbacks(execute=True)
+        self.user = User.objects.create_user(email="ada@example.com", password="password123")
+        self.other = User.objects.create_user(email="grace@example.com", password="password123")
+
+    def test_cards_are_loaded_in_one_query_then_cached(self):
+        with CaptureQueriesContext(connection) as queries:
+            cards = get_user_cards([self.user.id, self.other.id])
+        assert len(queries) == 1
+        assert cards[str(self.user.id)]["email"] == "ada@example.com"
+        assert cards[str(self.user.id)]["username"] == self.user.profile.username
+
+        with CaptureQueriesContext(connection) as queries:
+            assert get_user_cards([self.user.id, self.other.id]) == cards
+        assert len(queries) == 0
+
+    def test_process_local_caches_load_cards_uncached(self, settings):
+        # LocMemCache is per worker: a rename in one would not reach the others
+        settings.SHARED_CACHE = None
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                get_user_cards([self.user.id])
+            assert len(queries) == 1
+        assert cache.get(user_card_key(self.user.id)) is None
+
+    def test_profile_saves_write_through(self):
+        get_user_cards([self.user.id])
+        with self.commit():
+            self.user.profile.first_name = "Ada"
+            self.user.profile.last_name = "Lovelace"
+            self.user.profile.save()
+
+        card = cache.get(user_card_key(self.user.id))
+        assert card["first_name"] == "Ada"
+        assert card["full_name"] == "Ada Lovelace"
+
+    def test_email_changes_drop_the_card_and_logins_keep_it(self):
+        get_user_cards([self.user.id])
+        with self.commit():
+            self.user.save(update_fields=["last_login"])
+        assert cache.get(user_card_key(self.user.id)) is not None
+
+        with self.commit():
+            self.user.email = "lovelace@example.com"
+            self.user.save()
+        assert cache.get(user_card_key(self.user.id)) is None
+        assert get_user_cards([self.user.id])[str(self.user.id)]["email"] == "lovelace@example.com"
+
+    def test_google_profile_sync_refreshes_the_card(self):
+        get_user_cards([self.user.id])
+        with self.commit():
+            sync_google_profile_data(self.user, {"given_name": "ada", "family_name": "lovelace"})
+        assert get_user_cards([self.user.id])[str(self.user.id)]["full_name"] == "Ada Lovelace"
+
+    def test_serializers_read_cards_without_joining_profiles(self):
+        workspace = Workspace.objects.create(name="Team", owner=self.user)
+        workspace_type = ContentType.objects.get_for_model(Workspace)
+        for actor in (self.user, self.other, self.user):
+            ActivityLog.objects.create(workspace=workspace, actor=actor, action_type="comment", target_text="x")
+            Notification.objects.create(
+                recipient=self.other, actor=actor, content_type=workspace_type, object_id=workspace.id,
+                title="Hi", message="Hello",
+            )
+        request = RequestFactory().get("/")
+        request.user = self.user
+
+        with CaptureQueriesContext(connection) as queries:
+            activity = ActivityLogSerializer(ActivityLog.objects.all(), many=True).data
+            notifications = NotificationSerializer(
+                Notification.objects.select_related("content_type"), many=True, context={"request": request}
+            ).data
+        sql = [query["sql"] for query in queries.captured_queries]
+        # The two lists and one batch of cards, which the second list finds cached
+        assert len(sql) == 3
+        assert [s for s in sql if "user_profiles" in s] == [sql[1]]
+        assert {row["actor_username"] for row in activity} == {self.user.profile.username, self.other.profile.username}
+        assert {row["actor"]["email"] for row in notifications} == {self.user.email, self.other.email}
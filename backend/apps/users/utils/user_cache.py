@@ -0,0 +1,82 @@
+# utils/user_cache.py
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from apps.workspace.utils.shared_cache import is_cache_shared
+
+# Seconds an authenticated user object stays cached; 0 disables the cache. The
+# signals only drop entries from this process's cache, so on a process-local
+# backend (see is_cache_shared) users are loaded uncached on every request.
+AUTH_USER_CACHE_TIMEOUT = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", 300)
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth_user:{user_id}"
+
+
+def get_cached_user(user_id):
+    """
+    Returns the active-or-not User for user_id, from cache when possible.
+    Raises User.DoesNotExist when the user is gone.
+    Entries are dropped by the User post_save / post_delete signals, so a
+    deactivated user or a changed password applies on their next request.
+    """
+    return get_cached_user_with(user_id)[0]
+
+
+def get_cached_user_with(user_id, extra_keys=(), annotations=None):
+    """
+    Like get_cached_user, but also fetches `extra_keys` in the same cache round trip.
+    `annotations` ({name: expression}) are evaluated in the user query when the
+    user is loaded from the database; they are returned, not cached with the user.
+    Returns (user, {key: value} for the extra keys found and annotations evaluated).
+    """
+    User = get_user_model()
+    key = user_cache_key(user_id)
+    cached = bool(AUTH_USER_CACHE_TIMEOUT) and is_cache_shared()
+    keys = list(extra_keys)
+    if cached:
+        keys.append(key)
+
+    found = cache.get_many(keys) if keys else {}
+    user = found.pop(key, None)
+    if user is None:
+        user = User.objects.annotate(**(annotations or {})).get(id=user_id)
+        for name in annotations or ():
+            found[name] = user.__dict__.pop(name)
+        if cached:
+            cache.set(key, user, timeout=AUTH_USER_CACHE_TIMEOUT)
+    return user, found
+
+
+def invalidate_user_cache(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def page_size_cache_key(user_id) -> str:
+    return f"user_page_size:{user_id}"
+
+
+def get_cached_page_size(user_id):
+    """
+    The user's UserSettings.items_per_page, or None without settings, from
+    cache when possible (a shared one, like the user). Entries are dropped by
+    the UserSettings signals.
+    """
+    from apps.users.models import UserSettings
+
+    key = page_size_cache_key(user_id)
+    cached = bool(AUTH_USER_CACHE_TIMEOUT) and is_cache_shared()
+    size = cache.get(key) if cached else None
+    if size is None:
+        size = UserSettings.objects.filter(user_id=user_id).values_list(
+            "items_per_page", flat=True
+        ).first() or 0
+        if cached:
+            cache.set(key, size, timeout=AUTH_USER_CACHE_TIMEOUT)
+    return size or None
+
+
+def invalidate_page_size_cache(user_id):
+    cache.delete(page_size_cache_key(user_id))
@@ -0,0 +1,89 @@
+# utils/user_cards.py
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.users.models import Profile, User
+from apps.workspace.utils.shared_cache import is_cache_shared
+
+# Seconds a user card stays cached; 0 disables the cache. Write-through and
+# invalidation only reach this process's cache, so on a process-local backend
+# (see is_cache_shared) cards are loaded uncached.
+USER_CARD_CACHE_TIMEOUT = getattr(settings, "USER_CARD_CACHE_TIMEOUT", 3600)
+
+_CARD_FIELDS = ("id", "email", "profile__id", "profile__username", "profile__first_name", "profile__last_name", "profile__avatar")
+
+
+def user_card_key(user_id) -> str:
+    return f"user_card:{user_id}"
+
+
+def avatar_url(name):
+    """Profile.avatar URL from the stored file name (None without avatar)."""
+    if name:
+        return Profile._meta.get_field("avatar").storage.url(name)
+    return None
+
+
+def build_user_card(user_id, email, profile_id, username, first_name, last_name, avatar) -> dict:
+    """
+    A user's public identity, as UserSerializer renders it. The avatar URL is
+    built once here rather than for every row that shows the user.
+    """
+    full_name = None
+    if profile_id is not None:
+        full_name = f"{(first_name or '').strip()} {(last_name or '').strip()}".strip() or None
+    return {
+        "id": str(user_id),
+        "email": email,
+        "username": username,
+        "first_name": first_name,
+        "last_name": last_name,
+        "full_name": full_name,
+        "avatar": avatar_url(avatar),
+    }
+
+
+def load_user_cards(user_ids) -> dict:
+    """Builds the cards of `user_ids` from the database in one query, keyed by str(id)."""
+    rows = User.objects.filter(id__in=list(user_ids)).values_list(*_CARD_FIELDS)
+    return {str(row[0]): build_user_card(*row) for row in rows}
+
+
+def get_user_cards(user_ids) -> dict:
+    """
+    The cards of `user_ids` keyed by str(id), from one cache round trip plus
+    one query for the misses. Users that don't exist are left out.
+    Profile saves write their card through; user edits drop it.
+    """
+    ids = {str(uid) for uid in user_ids if uid}
+    if not ids:
+        return {}
+    if not USER_CARD_CACHE_TIMEOUT or not is_cache_shared():
+        return load_user_cards(ids)
+
+    found = cache.get_many([user_card_key(uid) for uid in ids])
+    cards = {card["id"]: card for card in found.values()}
+    missing = ids.difference(cards)
+    if missing:
+        loaded = load_user_cards(missing)
+        for uid, card in loaded.items():
+            # add: a card written through by a concurrent profile save wins
+            cache.add(user_card_key(uid), card, timeout=USER_CARD_CACHE_TIMEOUT)
+        cards.update(loaded)
+    return cards
+
+
+def write_user_card(profile):
+    """Writes the card of profile.user through to the cache."""
+    if not USER_CARD_CACHE_TIMEOUT or not is_cache_shared():
+        return
+    user = profile.user
+    card = build_user_card(
+        user.pk, user.email, profile.pk, profile.username,
+        profile.first_name, profile.last_name, profile.avatar.name,
+    )
+    cache.set(user_card_key(user.pk), card, timeout=USER_CARD_CACHE_TIMEOUT)
+
+
+def invalidate_user_cards(user_ids):
+    cache.delete_many([user_card_key(uid) for uid in user_ids if uid])
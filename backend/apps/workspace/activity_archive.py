@@ -0,0 +1,267 @@
+# workspace/activity_archive.py
+"""
+Storage lifecycle of the ActivityLog table.
+
+On PostgreSQL the table is range-partitioned by month on created_at
+(migration 0009), with a DEFAULT partition catching rows no month partition
+covers; ensure_partitions() creates the coming months ahead of time. Reads
+of the latest activity of a workspace only touch the newest partitions'
+(workspace, created_at, id) indexes, whatever the size of the history. On
+other databases (SQLite in development and tests) it stays a plain table and
+the same functions work on row ranges.
+
+apply_retention() moves months older than ACTIVITY_LOG_RETENTION_MONTHS out
+of the database: each month is written as one gzipped JSON-lines file per
+workspace (newest first), then its partition is dropped (rows deleted on a
+plain table). read_archived_activity() pages through a workspace's archive.
+
+`manage.py maintain_activity_log` runs both, e.g. daily.
+"""
+import datetime
+import gzip
+import itertools
+import json
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import ActivityLog
+
+ACTIVITY_LOG_RETENTION_MONTHS = getattr(settings, "ACTIVITY_LOG_RETENTION_MONTHS", 12)
+ACTIVITY_LOG_PARTITIONS_AHEAD = getattr(settings, "ACTIVITY_LOG_PARTITIONS_AHEAD", 3)
+ACTIVITY_ARCHIVE_ROOT = getattr(settings, "ACTIVITY_ARCHIVE_ROOT", settings.BASE_DIR / "activity_archive")
+
+ARCHIVE_FIELDS = ("id", "workspace_id", "actor_id", "action_type", "target_id", "target_text", "created_at")
+
+
+# --- Months ---
+
+def month_start(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        value = value.astimezone(datetime.timezone.utc)
+    return datetime.date(value.year, value.month, 1)
+
+
+def add_months(month: datetime.date, n: int) -> datetime.date:
+    index = month.year * 12 + month.month - 1 + n
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _bounds(month: datetime.date):
+    start = datetime.datetime(month.year, month.month, 1, tzinfo=datetime.timezone.utc)
+    end = datetime.datetime.combine(add_months(month, 1), datetime.time(), tzinfo=datetime.timezone.utc)
+    return start, end
+
+
+def _label(month: datetime.date) -> str:
+    return f"{month.year}-{month.month:02d}"
+
+
+# --- Partitions (PostgreSQL) ---
+
+def _table() -> str:
+    return ActivityLog._meta.db_table
+
+
+def partition_name(month: datetime.date) -> str:
+    return f"{_table()}_{month.year}_{month.month:02d}"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)", [_table()])
+        return cursor.fetchone() is not None
+
+
+def partitions() -> set:
+    """Names of the table's partitions (empty when it isn't partitioned)."""
+    if not is_partitioned():
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(%s)",
+            [_table()],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def create_partition(month: datetime.date) -> bool:
+    """
+    Creates the partition of `month` unless it exists. Rows of the month that
+    already landed in the DEFAULT partition are moved into it. Returns
+    whether it was created.
+    """
+    name = partition_name(month)
+    if name in partitions():
+        return False
+    table, default = _table(), f"{_table()}_default"
+    start, end = _bounds(month)
+    # Bounds are formatted from dates computed here, never from input
+    bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM "{default}" WHERE created_at >= %s AND created_at < %s)', [start, end]
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES {bounds}')
+            return True
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{default}"')
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES {bounds}')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{default}" WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO "{name}" SELECT * FROM moved',
+            [start, end],
+        )
+        cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{default}" DEFAULT')
+    return True
+
+
+def ensure_partitions(ahead=None, now=None) -> list:
+    """Creates the partitions of this month and the `ahead` next ones; returns the months created."""
+    if not is_partitioned():
+        return []
+    ahead = ACTIVITY_LOG_PARTITIONS_AHEAD if ahead is None else ahead
+    current = month_start(now or timezone.now())
+    return [
+        month for month in (add_months(current, n) for n in range(ahead + 1))
+        if create_partition(month)
+    ]
+
+
+# --- Archive ---
+
+def get_archive_storage():
+    if "activity_archive" in settings.STORAGES:
+        return storages["activity_archive"]
+    return FileSystemStorage(location=ACTIVITY_ARCHIVE_ROOT)
+
+
+def archive_path(workspace_id, month: datetime.date) -> str:
+    return f"{workspace_id}/{_label(month)}.jsonl.gz"
+
+
+def _save(storage, path, lines):
+    with tempfile.TemporaryFile() as buffer:
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as archive:
+            for line in lines:
+                archive.write(line)
+        buffer.seek(0)
+        if storage.exists(path):
+            storage.delete(path)  # re-archiving a month replaces its file
+        storage.save(path, File(buffer))
+
+
+def archive_month(month: datetime.date, storage=None, chunk_size=2000) -> dict:
+    """
+    Writes the month's activity to one archive file per workspace, streaming
+    the rows in chunks. Returns {workspace_id: row count}.
+    """
+    storage = storage or get_archive_storage()
+    start, end = _bounds(month)
+    rows = ActivityLog.objects.filter(created_at__gte=start, created_at__lt=end).order_by(
+        "workspace_id", "-created_at", "-id"
+    ).values(*ARCHIVE_FIELDS).iterator(chunk_size=chunk_size)
+
+    counts = {}
+    for workspace_id, workspace_rows in itertools.groupby(rows, key=lambda row: row["workspace_id"]):
+        count = 0
+
+        def lines():
+            nonlocal count
+            for row in workspace_rows:
+                count += 1
+                yield json.dumps(row, cls=DjangoJSONEncoder).encode() + b"\n"
+        _save(storage, archive_path(workspace_id, month), lines())
+        counts[workspace_id] = count
+    return counts
+
+
+def drop_month(month: datetime.date) -> None:
+    """Removes the month's rows: drops its partition, and deletes what else (e.g. DEFAULT) holds."""
+    name = partition_name(month)
+    if name in partitions():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP TABLE "{name}"')
+    start, end = _bounds(month)
+    ActivityLog.objects.filter(created_at__gte=start, created_at__lt=end).delete()
+
+
+def apply_retention(months=None, archive=True, storage=None, now=None) -> list:
+    """
+    Archives (unless archive is False) and drops every month older than the
+    last `months` (ACTIVITY_LOG_RETENTION_MONTHS by default; 0 keeps
+    everything). Returns the months removed, oldest first.
+    """
+    months = ACTIVITY_LOG_RETENTION_MONTHS if months is None else months
+    if not months:
+        return []
+    cutoff = add_months(month_start(now or timezone.now()), -months)
+    # Months holding rows; on a partitioned table only the expired partitions are read
+    candidates = {
+        value.date() for value in ActivityLog.objects.filter(created_at__lt=_bounds(cutoff)[0]).datetimes(
+            "created_at", "month", tzinfo=datetime.timezone.utc
+        )
+    }
+    prefix = f"{_table()}_"
+    for name in partitions():
+        suffix = name[len(prefix):]
+        if suffix != "default":
+            month = datetime.date(int(suffix[:4]), int(suffix[5:7]), 1)
+            if month < cutoff:
+                candidates.add(month)
+
+    removed = sorted(candidates)
+    for month in removed:
+        if archive:
+            archive_month(month, storage=storage)
+        drop_month(month)
+    return removed
+
+
+# --- Reading the archive ---
+
+def archived_months(workspace_id, storage=None) -> list:
+    """Archived months of a workspace, newest first, as "YYYY-MM"."""
+    storage = storage or get_archive_storage()
+    directory = str(workspace_id)
+    if not storage.exists(directory):
+        return []
+    _, files = storage.listdir(directory)
+    return sorted((name.split(".")[0] for name in files if name.endswith(".jsonl.gz")), reverse=True)
+
+
+def read_archived_activity(workspace_id, cursor=None, limit=50, storage=None):
+    """
+    One page of a workspace's archived activity, newest first: (rows,
+    next_cursor), next_cursor being None after the oldest row. A cursor is
+    "YYYY-MM:offset" (the month and the rows of it already read).
+    """
+    storage = storage or get_archive_storage()
+    months = archived_months(workspace_id, storage)
+    if cursor:
+        label, _, offset = cursor.partition(":")
+        months = [m for m in months if m <= label]
+        offset = int(offset or 0) if months and months[0] == label else 0
+    else:
+        offset = 0
+
+    rows = []
+    for label in months:
+        path = f"{workspace_id}/{label}.jsonl.gz"
+        with storage.open(path, "rb") as handle, gzip.GzipFile(fileobj=handle) as archive:
+            for index, line in enumerate(archive):
+                if index < offset:
+                    continue
+                if len(rows) == limit:
+                    return rows, f"{label}:{index}"
+                rows.append(json.loads(line))
+        offset = 0
+    return rows, None
@@ -0,0 +1,226 @@
+# workspace/analytics.py
+"""
+Maintenance and reads of the TaskRollup table.
+
+A task contributes a fixed set of increments to the rollups, derived from its
+current state (see _contribution): created and open at its creation date,
+started at started_at, completed (and no longer open) at completed_at, and
+overdue from the day after its due date until it is completed. A write
+applies the difference between the contributions of the task's old and new
+state inside the write's transaction, with upserts that add to the existing
+rows (see _upsert), so the rollups always equal what a backfill would
+compute from the tasks. Deletes of tasks are applied by their view, like the
+counters (see counters.py).
+"""
+import datetime
+import uuid
+from collections import Counter, defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Project, Task, TaskRollup, Workspace
+from .models.task import ROLLUP_FIELDS
+
+PERIODS = tuple(TaskRollup.Period.values)
+ROLLUP_METRICS = ("created", "started", "completed", "open_delta", "overdue_delta")
+ROLLUP_COLUMNS = ("workspace_id", "project_id", "assignee_id", "period", "bucket", *ROLLUP_METRICS)
+
+
+def bucket_of(day: datetime.date, period: str) -> datetime.date:
+    """The day itself, or the Monday of its week."""
+    if period == TaskRollup.Period.WEEK:
+        return day - datetime.timedelta(days=day.weekday())
+    return day
+
+
+def _day(value) -> datetime.date:
+    return timezone.localtime(value).date()
+
+
+def _contribution(state) -> dict:
+    """{(project_id, assignee_id, period, bucket): Counter of metrics} of a task state."""
+    if state is None or state["created_at"] is None or state["status"] == Task.StatusChoices.CANCELLED:
+        return {}
+
+    events = [(_day(state["created_at"]), {"created": 1, "open_delta": 1})]
+    if state["started_at"]:
+        events.append((_day(state["started_at"]), {"started": 1}))
+    done = None
+    if state["status"] == Task.StatusChoices.COMPLETED and state["completed_at"]:
+        done = _day(state["completed_at"])
+        events.append((done, {"completed": 1, "open_delta": -1}))
+    due = state["due_date"]
+    if due and (done is None or done > due):
+        events.append((due + datetime.timedelta(days=1), {"overdue_delta": 1}))
+        if done is not None:
+            events.append((done, {"overdue_delta": -1}))
+
+    contribution = defaultdict(Counter)
+    for day, metrics in events:
+        for period in PERIODS:
+            contribution[(state["project_id"], state["assigned_to_id"], period, bucket_of(day, period))].update(metrics)
+    return contribution
+
+
+def _difference(old, new) -> dict:
+    deltas = defaultdict(Counter)
+    for key, metrics in _contribution(new).items():
+        deltas[key].update(metrics)
+    for key, metrics in _contribution(old).items():
+        deltas[key].subtract(metrics)
+    return {key: {m: n for m, n in metrics.items() if n} for key, metrics in deltas.items()}
+
+
+def _upsert(rows):
+    """
+    Adds the deltas of `rows`, (workspace_id, key, deltas) tuples with
+    distinct keys, to their TaskRollup rows, creating the missing ones: one
+    INSERT ... ON CONFLICT DO UPDATE per kind of assignee, as the unique
+    constraints are partial on the assignee being set or not.
+    """
+    table, quote = TaskRollup._meta.db_table, connection.ops.quote_name
+    fields = [TaskRollup._meta.get_field(column) for column in ROLLUP_COLUMNS]
+    increments = ", ".join(
+        f"{quote(metric)} = {quote(table)}.{quote(metric)} + EXCLUDED.{quote(metric)}" for metric in ROLLUP_METRICS
+    )
+    for assigned in (False, True):
+        group = [(workspace_id, key, deltas) for workspace_id, key, deltas in rows if (key[1] is not None) == assigned]
+        if not group:
+            continue
+        params = []
+        for workspace_id, key, deltas in group:
+            values = (workspace_id, *key, *(deltas.get(metric, 0) for metric in ROLLUP_METRICS))
+            params.extend(field.get_db_prep_value(value, connection) for field, value in zip(fields, values))
+        target = "project_id, assignee_id, period, bucket" if assigned else "project_id, period, bucket"
+        condition = "IS NOT NULL" if assigned else "IS NULL"
+        placeholders = ", ".join(["(" + ", ".join(["%s"] * len(fields)) + ")"] * len(group))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {quote(table)} ({', '.join(quote(f.column) for f in fields)}) VALUES {placeholders} "
+                f"ON CONFLICT ({target}) WHERE assignee_id {condition} DO UPDATE SET {increments}",
+                params,
+            )
+
+
+def _apply(old, new, workspace_ids: dict):
+    """Applies the change from task state `old` to `new`; workspace_ids maps project ids to workspaces."""
+    rows = []
+    for key, deltas in _difference(old, new).items():
+        if not deltas:
+            continue
+        project_id = key[0]
+        if project_id not in workspace_ids:
+            workspace_ids[project_id] = Project.objects.filter(pk=project_id).values_list(
+                "workspace_id", flat=True
+            ).first()
+        rows.append((workspace_ids[project_id], key, deltas))
+    _upsert(rows)
+
+
+# --- Write paths (called from signals.py and the task delete view) ---
+
+def task_saved(task, created):
+    new = task.rollup_state()
+    old = None if created else getattr(task, "_loaded_rollup", None)
+    if not created and old is None:
+        return  # state it was counted with unknown; left to backfill_task_rollups
+    _apply(old, new, {task.project_id: task.project.workspace_id})
+    task._loaded_rollup = new
+
+
+def task_deleted(task, workspace_id):
+    _apply(getattr(task, "_loaded_rollup", None) or task.rollup_state(), None, {task.project_id: workspace_id})
+
+
+def user_deleted(user):
+    """Moves a deleted user's rows to the unassigned ones, as their tasks are; call before deleting them."""
+    rows = TaskRollup.objects.filter(assignee=user)
+    _upsert([
+        (row["workspace_id"], (row["project_id"], None, row["period"], row["bucket"]), row)
+        for row in rows.values("workspace_id", "project_id", "period", "bucket", *ROLLUP_METRICS)
+    ])
+    rows.delete()
+
+
+# --- Backfill ---
+
+def build_workspace_rollups(workspace_id, chunk_size=2000, models=None) -> list:
+    """
+    All TaskRollup rows of a workspace, computed from its tasks streamed in chunks.
+    `models` is a (Task, TaskRollup) pair to use instead, e.g. a migration's
+    historical models.
+    """
+    task_model, rollup_model = models or (Task, TaskRollup)
+    totals = defaultdict(Counter)
+    tasks = task_model.objects.filter(project__workspace_id=workspace_id).order_by().values(*ROLLUP_FIELDS)
+    for state in tasks.iterator(chunk_size=chunk_size):
+        for key, metrics in _contribution(state).items():
+            totals[key].update(metrics)
+
+    return [
+        rollup_model(
+            workspace_id=workspace_id, project_id=project_id, assignee_id=assignee_id, period=period, bucket=bucket,
+            **{metric: metrics[metric] for metric in ROLLUP_METRICS},
+        )
+        for (project_id, assignee_id, period, bucket), metrics in totals.items()
+        if any(metrics.values())
+    ]
+
+
+def backfill_task_rollups(workspace_ids=None, chunk_size=2000, batch_size=1000) -> int:
+    """Rebuilds the rollups of the given workspaces (all when None). Returns the row count."""
+    if workspace_ids is None:
+        workspace_ids = Workspace.objects.values_list("id", flat=True)
+
+    total = 0
+    for workspace_id in list(workspace_ids):
+        workspace_id = uuid.UUID(str(workspace_id))
+        with transaction.atomic():
+            TaskRollup.objects.filter(workspace_id=workspace_id).delete()
+            rows = build_workspace_rollups(workspace_id, chunk_size=chunk_size)
+            TaskRollup.objects.bulk_create(rows, batch_size=batch_size)
+        total += len(rows)
+    return total
+
+
+# --- Reads ---
+
+def task_series(rollups, period, start: datetime.date, end: datetime.date) -> list:
+    """
+    One dict per bucket of `period` from start to end: the created, started
+    and completed counts in the bucket and the open and overdue counts at its
+    end, summed over the `rollups` queryset. Two queries, whatever the number
+    of tasks.
+    """
+    rollups = rollups.filter(period=period).order_by()
+    start, end = bucket_of(start, period), bucket_of(end, period)
+
+    opening = rollups.filter(bucket__lt=start).aggregate(open=Sum("open_delta"), overdue=Sum("overdue_delta"))
+    open_count, overdue_count = opening["open"] or 0, opening["overdue"] or 0
+    rows = {
+        row["bucket"]: row
+        for row in rollups.filter(bucket__range=(start, end)).values("bucket").annotate(
+            **{f"sum_{metric}": Sum(metric) for metric in ROLLUP_METRICS}
+        )
+    }
+
+    step = datetime.timedelta(days=7 if period == TaskRollup.Period.WEEK else 1)
+    series = []
+    bucket = start
+    while bucket <= end:
+        row = rows.get(bucket)
+        sums = {metric: row[f"sum_{metric}"] if row else 0 for metric in ROLLUP_METRICS}
+        open_count += sums["open_delta"]
+        overdue_count += sums["overdue_delta"]
+        series.append({
+            "bucket": bucket,
+            "created": sums["created"],
+            "started": sums["started"],
+            "completed": sums["completed"],
+            "open": open_count,
+            "overdue": overdue_count,
+        })
+        bucket += step
+    return series
@@ -0,0 +1,240 @@
+# workspace/counters.py
+"""
+Maintenance of the WorkspaceCounters and ProjectCounters tables.
+
+Writes move the counters with `UPDATE ... SET n = n + delta` inside the
+write's transaction, so concurrent writers never lose an increment and a
+rolled back write takes its change with it. A missing row (e.g. one removed
+by hand) is recounted from the tables after commit instead, once cascades
+are done with it. Deletes of projects and tasks are applied by their views,
+like the version bumps (see signals.py); `manage.py reconcile_counters`
+repairs whatever else drifts (e.g. raw SQL or queryset updates).
+
+Writes that move the same rows many times, e.g. a workspace created with a
+starter project and tasks, run in batched(): its changes are summed and
+written once at the end of the block.
+"""
+import threading
+import uuid
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import (
+    Project, ProjectMember, Task, Workspace, WorkspaceMember, WorkspaceCounters, ProjectCounters,
+)
+
+TASK_STATUSES = tuple(Task.StatusChoices.values)
+TASK_FIELDS = ("tasks", *(f"tasks_{status}" for status in TASK_STATUSES))
+WORKSPACE_FIELDS = ("members", "projects", *TASK_FIELDS)
+PROJECT_FIELDS = ("members", *TASK_FIELDS)
+
+
+def _task_deltas(status, delta) -> dict:
+    deltas = {"tasks": delta}
+    if status in TASK_STATUSES:
+        deltas[f"tasks_{status}"] = delta
+    return deltas
+
+
+_local = threading.local()
+
+
+class _Batch:
+    """The counter changes of a batched() block."""
+
+    def __init__(self):
+        self.created = []
+        self.deltas = defaultdict(Counter)
+
+
+@contextmanager
+def batched():
+    """
+    Sums the counter changes of the block and writes them when it exits: one
+    INSERT, with its final counts, per row created in it, and one UPDATE per
+    other row moved. Nested blocks join the outer one; a block left by an
+    exception writes nothing.
+    """
+    if getattr(_local, "batch", None) is not None:
+        yield
+        return
+    batch = _local.batch = _Batch()
+    try:
+        yield
+    finally:
+        _local.batch = None
+    for model, pk in batch.created:
+        counts = batch.deltas.pop((model, pk), {})
+        model.objects.create(pk=pk, **{field: n for field, n in counts.items() if n})
+    for (model, pk), deltas in batch.deltas.items():
+        _change(model, pk, deltas)
+
+
+def _create(model, pk):
+    batch = getattr(_local, "batch", None)
+    if batch is not None:
+        batch.created.append((model, pk))
+    else:
+        model.objects.create(pk=pk)
+
+
+def _change(model, pk, deltas: dict):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    batch = getattr(_local, "batch", None)
+    if batch is not None:
+        batch.deltas[(model, pk)].update(deltas)
+        return
+    updated = model.objects.filter(pk=pk).update(**{field: F(field) + delta for field, delta in deltas.items()})
+    if not updated:
+        transaction.on_commit(lambda: recount(model, pk))
+
+
+def _change_task_counters(project_id, workspace_id, deltas: dict):
+    _change(ProjectCounters, project_id, deltas)
+    _change(WorkspaceCounters, workspace_id, deltas)
+
+
+# --- Write paths (called from signals.py and the delete views) ---
+# A new workspace or project has no counters row yet: it is a plain insert.
+
+def workspace_created(workspace):
+    _create(WorkspaceCounters, workspace.pk)
+
+
+def project_created(project):
+    _create(ProjectCounters, project.pk)
+    _change(WorkspaceCounters, project.workspace_id, {"projects": 1})
+
+
+def project_deleted(project):
+    """Takes the project and its tasks out of the workspace counts; call before deleting it."""
+    counters = ProjectCounters.objects.filter(project_id=project.pk).values(*TASK_FIELDS).first()
+    if counters is None:
+        transaction.on_commit(lambda: recount(WorkspaceCounters, project.workspace_id))
+        return
+    _change(WorkspaceCounters, project.workspace_id, {
+        "projects": -1, **{field: -count for field, count in counters.items()},
+    })
+
+
+def task_saved(task, created):
+    loaded = getattr(task, "_loaded_status", None)
+    if created:
+        deltas = _task_deltas(task.status, 1)
+    elif loaded is not None and loaded != task.status:
+        deltas = {**_task_deltas(loaded, -1), **_task_deltas(task.status, 1)}
+        deltas["tasks"] = 0
+    else:
+        return
+    task._loaded_status = task.status
+    _change_task_counters(task.project_id, task.project.workspace_id, deltas)
+
+
+def task_deleted(task, workspace_id):
+    _change_task_counters(task.project_id, workspace_id, _task_deltas(task.status, -1))
+
+
+def workspace_member_changed(member, delta):
+    _change(WorkspaceCounters, member.workspace_id, {"members": delta})
+
+
+def project_member_changed(member, delta):
+    _change(ProjectCounters, member.project_id, {"members": delta})
+
+
+# --- Reads ---
+
+def get_workspace_counters(workspace_id):
+    """The WorkspaceCounters row of workspace_id, recounted first if missing; None when the workspace is gone."""
+    row = WorkspaceCounters.objects.filter(workspace_id=workspace_id).first()
+    if row is None:
+        recount(WorkspaceCounters, workspace_id)
+        row = WorkspaceCounters.objects.filter(workspace_id=workspace_id).first()
+    return row
+
+
+# --- Recounting ---
+
+def _expected(workspace_ids=None):
+    """
+    ({workspace_id: counts}, {project_id: counts}) from the tables, in five
+    grouped queries; for all workspaces or only `workspace_ids`.
+    """
+    workspaces = Workspace.objects.all()
+    if workspace_ids is not None:
+        workspaces = workspaces.filter(id__in=[uuid.UUID(str(workspace_id)) for workspace_id in workspace_ids])
+    projects = Project.objects.filter(workspace__in=workspaces)
+
+    workspace_counts = {
+        workspace_id: dict.fromkeys(WORKSPACE_FIELDS, 0) for workspace_id in workspaces.values_list("id", flat=True)
+    }
+    project_counts = {}
+    for project_id, workspace_id in projects.values_list("id", "workspace_id"):
+        project_counts[project_id] = dict.fromkeys(PROJECT_FIELDS, 0)
+        workspace_counts[workspace_id]["projects"] += 1
+
+    for workspace_id, n in WorkspaceMember.objects.filter(workspace__in=workspaces).order_by().values_list(
+        "workspace_id"
+    ).annotate(n=Count("pk")):
+        workspace_counts[workspace_id]["members"] = n
+    for project_id, n in ProjectMember.objects.filter(project__in=projects).order_by().values_list(
+        "project_id"
+    ).annotate(n=Count("pk")):
+        project_counts[project_id]["members"] = n
+
+    tasks = Task.objects.filter(project__in=projects).order_by()
+    for project_id, workspace_id, status, n in tasks.values_list(
+        "project_id", "project__workspace_id", "status"
+    ).annotate(n=Count("pk")):
+        for counts in (project_counts[project_id], workspace_counts[workspace_id]):
+            for field, delta in _task_deltas(status, n).items():
+                counts[field] += delta
+    return workspace_counts, project_counts
+
+
+def recount(model, pk):
+    """Sets one counters row to the counts in the tables, creating it if missing."""
+    pk = uuid.UUID(str(pk))
+    if model is WorkspaceCounters:
+        counts = _expected([pk])[0].get(pk)
+        if counts is not None:
+            WorkspaceCounters.objects.update_or_create(workspace_id=pk, defaults=counts)
+        return
+    workspace_id = Project.objects.filter(pk=pk).values_list("workspace_id", flat=True).first()
+    if workspace_id is not None:
+        counts = _expected([workspace_id])[1][pk]
+        ProjectCounters.objects.update_or_create(project_id=pk, defaults=counts)
+
+
+def reconcile_counters(workspace_ids=None, repair=True) -> list:
+    """
+    Compares the counters of `workspace_ids` (all workspaces by default) and
+    their projects with the tables. Returns the drift as
+    (model name, pk, field, stored, expected) tuples; repairs it unless
+    repair is False. Missing rows are stored as None.
+    """
+    workspace_counts, project_counts = _expected(workspace_ids)
+    drift = []
+    with transaction.atomic():
+        for model, key, fields, expected in (
+            (WorkspaceCounters, "workspace_id", WORKSPACE_FIELDS, workspace_counts),
+            (ProjectCounters, "project_id", PROJECT_FIELDS, project_counts),
+        ):
+            stored = {
+                row[key]: row for row in model.objects.filter(**{f"{key}__in": list(expected)}).values(key, *fields)
+            }
+            for pk, counts in expected.items():
+                row = stored.get(pk)
+                changed = [
+                    (model.__name__, pk, field, row and row[field], counts[field])
+                    for field in fields if row is None or row[field] != counts[field]
+                ]
+                drift.extend(changed)
+                if changed and repair:
+                    model.objects.update_or_create(**{key: pk}, defaults=counts)
+    return drift
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.workspace.analytics import backfill_task_rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the task analytics rollups from the tasks, e.g. after migrating or to repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace",
+            action="append",
+            dest="workspaces",
+            help="Only rebuild this workspace id (repeatable). Defaults to all workspaces.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Tasks read per database round trip.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = backfill_task_rollups(
+            options["workspaces"], chunk_size=options["chunk_size"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} task rollup rows."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.workspace.activity_archive import apply_retention, ensure_partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the coming monthly ActivityLog partitions and archives and drops "
+        "the months past the retention period. Meant to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=None,
+            help="Months of activity kept in the database. Defaults to ACTIVITY_LOG_RETENTION_MONTHS; 0 keeps all.",
+        )
+        parser.add_argument(
+            "--no-archive",
+            action="store_true",
+            help="Drop expired months without writing them to the archive.",
+        )
+
+    def handle(self, *args, **options):
+        created = ensure_partitions()
+        removed = apply_retention(options["retention_months"], archive=not options["no_archive"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(created)} partitions; "
+            f"{'dropped' if options['no_archive'] else 'archived and dropped'} {len(removed)} months"
+            + (f" ({', '.join(str(month)[:7] for month in removed)})." if removed else ".")
+        ))
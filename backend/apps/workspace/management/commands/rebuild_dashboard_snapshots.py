@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.workspace.utils.dashboard import rebuild_dashboard_snapshots
+
+
+class Command(BaseCommand):
+    help = "Reloads the cached workspace dashboard snapshots, e.g. after a cache flush or deploy."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace",
+            action="append",
+            dest="workspaces",
+            help="Only rebuild this workspace id (repeatable). Defaults to all workspaces.",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_dashboard_snapshots(options["workspaces"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} dashboard snapshots."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.workspace.project_access import rebuild_project_access
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the UserProjectAccess table from workspace roles and project memberships."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace",
+            action="append",
+            dest="workspaces",
+            help="Only rebuild this workspace id (repeatable). Defaults to all workspaces.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = rebuild_project_access(options["workspaces"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} project access rows."))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.workspace.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Compares the workspace and project counters with the tables and repairs any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workspace",
+            action="append",
+            dest="workspaces",
+            help="Only check this workspace id (repeatable). Defaults to all workspaces.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drift without repairing it.",
+        )
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters(options["workspaces"], repair=not options["dry_run"])
+        for model_name, pk, field, stored, expected in drift:
+            self.stdout.write(f"{model_name} {pk} {field}: stored {stored}, expected {expected}")
+        verb = "Found" if options["dry_run"] else "Repaired"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(drift)} drifted counters."))
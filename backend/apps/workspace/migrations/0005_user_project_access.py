@@ -0,0 +1,61 @@
+# Generated by Django 6.1.2 on 2026-10-18 06:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_project_access(apps, schema_editor):
+    Workspace = apps.get_model('workspace', 'Workspace')
+    WorkspaceMember = apps.get_model('workspace', 'WorkspaceMember')
+    Project = apps.get_model('workspace', 'Project')
+    ProjectMember = apps.get_model('workspace', 'ProjectMember')
+    UserProjectAccess = apps.get_model('workspace', 'UserProjectAccess')
+
+    for workspace_id, owner_id in Workspace.objects.values_list('id', 'owner_id').iterator():
+        roles = dict(WorkspaceMember.objects.filter(workspace_id=workspace_id).values_list('user_id', 'role'))
+        roles[owner_id] = 'owner'
+        project_ids = list(Project.objects.filter(workspace_id=workspace_id).values_list('id', flat=True))
+
+        rows = {}
+        for user_id, role in roles.items():
+            if role in ('owner', 'admin'):
+                for project_id in project_ids:
+                    rows[(user_id, project_id)] = True
+        for user_id, project_id, permission in ProjectMember.objects.filter(
+            project__workspace_id=workspace_id
+        ).values_list('user_id', 'project_id', 'permission'):
+            if user_id in roles and (user_id, project_id) not in rows:
+                rows[(user_id, project_id)] = permission == 'write'
+
+        UserProjectAccess.objects.bulk_create([
+            UserProjectAccess(user_id=u, project_id=p, workspace_id=workspace_id, can_write=w)
+            for (u, p), w in rows.items()
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0004_remove_workspace_visibility_workspacedocument'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserProjectAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('can_write', models.BooleanField(default=False)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_access', to='workspace.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_access', to=settings.AUTH_USER_MODEL)),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='workspace.workspace')),
+            ],
+            options={
+                'db_table': 'user_project_access',
+                'indexes': [models.Index(fields=['user', 'workspace'], name='upa_user_workspace_idx')],
+                'constraints': [models.UniqueConstraint(fields=('project', 'user'), name='user_project_access_unique')],
+            },
+        ),
+        migrations.RunPython(populate_project_access, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.1.2 on 2026-10-18 07:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0005_user_project_access'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['workspace', '-created_at', '-id'], name='activity_ws_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', '-created_at', '-id'], name='task_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacedocument',
+            index=models.Index(fields=['workspace', '-created_at', '-id'], name='document_ws_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workspacemember',
+            index=models.Index(fields=['workspace', 'joined_at', 'id'], name='member_ws_joined_idx'),
+        ),
+    ]
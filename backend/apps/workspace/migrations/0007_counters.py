@@ -0,0 +1,78 @@
+# Generated by Django 6.1.2 on 2026-10-18 09:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counters(apps, schema_editor):
+    Workspace = apps.get_model('workspace', 'Workspace')
+    WorkspaceMember = apps.get_model('workspace', 'WorkspaceMember')
+    Project = apps.get_model('workspace', 'Project')
+    ProjectMember = apps.get_model('workspace', 'ProjectMember')
+    Task = apps.get_model('workspace', 'Task')
+    WorkspaceCounters = apps.get_model('workspace', 'WorkspaceCounters')
+    ProjectCounters = apps.get_model('workspace', 'ProjectCounters')
+
+    workspaces = {pk: WorkspaceCounters(workspace_id=pk) for pk in Workspace.objects.values_list('id', flat=True)}
+    projects = {}
+    for pk, workspace_id in Project.objects.values_list('id', 'workspace_id'):
+        projects[pk] = ProjectCounters(project_id=pk)
+        workspaces[workspace_id].projects += 1
+    for workspace_id, n in WorkspaceMember.objects.order_by().values_list('workspace_id').annotate(n=Count('pk')):
+        workspaces[workspace_id].members = n
+    for project_id, n in ProjectMember.objects.order_by().values_list('project_id').annotate(n=Count('pk')):
+        projects[project_id].members = n
+    for project_id, workspace_id, status, n in Task.objects.order_by().values_list(
+        'project_id', 'project__workspace_id', 'status'
+    ).annotate(n=Count('pk')):
+        for counters in (projects[project_id], workspaces[workspace_id]):
+            counters.tasks += n
+            field = f'tasks_{status}'
+            if hasattr(counters, field):
+                setattr(counters, field, getattr(counters, field) + n)
+
+    WorkspaceCounters.objects.bulk_create(workspaces.values(), batch_size=1000)
+    ProjectCounters.objects.bulk_create(projects.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0006_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkspaceCounters',
+            fields=[
+                ('tasks', models.IntegerField(default=0)),
+                ('tasks_pending', models.IntegerField(default=0)),
+                ('tasks_in_progress', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('tasks_cancelled', models.IntegerField(default=0)),
+                ('members', models.IntegerField(default=0)),
+                ('workspace', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to='workspace.workspace')),
+                ('projects', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'workspace_counters',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectCounters',
+            fields=[
+                ('tasks', models.IntegerField(default=0)),
+                ('tasks_pending', models.IntegerField(default=0)),
+                ('tasks_in_progress', models.IntegerField(default=0)),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('tasks_cancelled', models.IntegerField(default=0)),
+                ('members', models.IntegerField(default=0)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to='workspace.project')),
+            ],
+            options={
+                'db_table': 'project_counters',
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
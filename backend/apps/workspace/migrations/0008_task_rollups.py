@@ -0,0 +1,72 @@
+# Generated by Django 6.1.2 on 2026-10-18 10:02
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_started_at(apps, schema_editor):
+    # A task's first start_task activity, for tasks started before the column
+    Task = apps.get_model('workspace', 'Task')
+    ActivityLog = apps.get_model('workspace', 'ActivityLog')
+    first_start = ActivityLog.objects.filter(
+        action_type='start_task', target_id=OuterRef('id'),
+    ).order_by('created_at').values('created_at')[:1]
+    Task.objects.exclude(status='pending').update(started_at=Subquery(first_start))
+
+
+def populate_task_rollups(apps, schema_editor):
+    # Existing tasks are counted now, so that their next write applies its
+    # difference to rows that include them
+    from apps.workspace.analytics import build_workspace_rollups
+
+    Workspace = apps.get_model('workspace', 'Workspace')
+    models = (apps.get_model('workspace', 'Task'), apps.get_model('workspace', 'TaskRollup'))
+    for workspace_id in Workspace.objects.values_list('id', flat=True):
+        models[1].objects.bulk_create(build_workspace_rollups(workspace_id, models=models), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0007_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(populate_started_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='TaskRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week')], max_length=4)),
+                ('bucket', models.DateField()),
+                ('created', models.IntegerField(default=0)),
+                ('started', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('open_delta', models.IntegerField(default=0)),
+                ('overdue_delta', models.IntegerField(default=0)),
+                ('assignee', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='workspace.project')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='workspace.workspace')),
+            ],
+            options={
+                'db_table': 'task_rollups',
+                'indexes': [
+                    models.Index(fields=['workspace', 'period', 'bucket'], name='task_rollup_ws_bucket_idx'),
+                    models.Index(fields=['assignee', 'period', 'bucket'], name='task_rollup_assignee_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(('assignee__isnull', False)), fields=('project', 'assignee', 'period', 'bucket'), name='task_rollup_unique'),
+                    models.UniqueConstraint(condition=models.Q(('assignee__isnull', True)), fields=('project', 'period', 'bucket'), name='task_rollup_unassigned_unique'),
+                ],
+            },
+        ),
+        migrations.RunPython(populate_task_rollups, migrations.RunPython.noop),
+    ]
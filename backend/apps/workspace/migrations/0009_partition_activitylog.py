@@ -0,0 +1,79 @@
+# Generated by Django 6.1.2 on 2026-10-18 10:40
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations
+
+
+def _add_months(month, n):
+    index = month.year * 12 + month.month - 1 + n
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def partition_activitylog(apps, schema_editor):
+    """
+    Rebuilds the ActivityLog table as partitioned by month on created_at
+    (PostgreSQL only; see apps.workspace.activity_archive). The primary key
+    becomes (id, created_at), as PostgreSQL requires the partition key in it.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    ActivityLog = apps.get_model('workspace', 'ActivityLog')
+    Workspace = apps.get_model('workspace', 'Workspace')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    table = ActivityLog._meta.db_table
+    old = f'{table}_unpartitioned'
+
+    with schema_editor.connection.cursor() as cursor:
+        # Reversing leaves the table partitioned; nothing to do when re-applied
+        cursor.execute('SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)', [table])
+        if cursor.fetchone():
+            return
+
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{old}"')
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{old}" INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+        cursor.execute(f'SELECT MIN(created_at) FROM "{old}"')
+        oldest = cursor.fetchone()[0]
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        month = datetime.date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(datetime.date(today.year, today.month, 1), 3)
+        while month <= last:
+            end = _add_months(month, 1)
+            cursor.execute(
+                f'CREATE TABLE "{table}_{month.year}_{month.month:02d}" PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+            )
+            month = end
+
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{old}"')
+        cursor.execute(f'DROP TABLE "{old}"')
+
+        # Keys, indexes and constraints after the old table is gone, so the names are free
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id, created_at)')
+        cursor.execute(
+            f'CREATE INDEX "activity_ws_created_idx" ON "{table}" (workspace_id, created_at DESC, id DESC)'
+        )
+        cursor.execute(f'CREATE INDEX "{table}_actor_id_idx" ON "{table}" (actor_id)')
+        for column, target in (('workspace_id', Workspace), ('actor_id', User)):
+            cursor.execute(
+                f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_{column}_fk" FOREIGN KEY ({column}) '
+                f'REFERENCES "{target._meta.db_table}" (id) DEFERRABLE INITIALLY DEFERRED'
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0008_task_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The partitioned table works with the model as it is, so reversing leaves it in place
+        migrations.RunPython(partition_activitylog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-18 12:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('workspace', '0009_partition_activitylog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # On the partitioned PostgreSQL table these cascade to every partition
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['workspace', 'actor', '-created_at', '-id'], name='activity_ws_actor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['workspace', 'target_id', '-created_at', '-id'], name='activity_ws_target_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from .workspace import Workspace, WorkspaceMember, WorkspaceChannel, WorkspaceInvitation, ActivityLog
-from .project import Project, ProjectMember
+from .project import Project, ProjectMember, UserProjectAccess
 from .task import Task, Comment
-from .document import WorkspaceDocument
\ No newline at end of file
+from .document import WorkspaceDocument
+from .counters import WorkspaceCounters, ProjectCounters
+from .analytics import TaskRollup
\ No newline at end of file
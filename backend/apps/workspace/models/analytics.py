@@ -0,0 +1,57 @@
+from django.db import models
+from django.db.models import Q
+
+from apps.users.models import User
+from apps.workspace.models import Workspace
+from apps.workspace.models.project import Project
+
+
+class TaskRollup(models.Model):
+    """
+    Task analytics of one project and assignee over one day or week (`bucket`
+    is the day, or the Monday of the week). created, started and completed
+    count the events in the bucket; open_delta and overdue_delta are the
+    changes of the open and overdue task counts, so the counts at the end of a
+    bucket are the sums of the deltas up to it. Cancelled tasks are left out.
+
+    Per-workspace and per-assignee series sum these rows. Maintained with
+    upserts by apps.workspace.analytics; `manage.py backfill_task_rollups`
+    rebuilds it from the tasks.
+    """
+    class Period(models.TextChoices):
+        DAY = "day", "Day"
+        WEEK = "week", "Week"
+
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name="+")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="+")
+    assignee = models.ForeignKey(User, on_delete=models.CASCADE, null=True, related_name="+")
+    period = models.CharField(max_length=4, choices=Period.choices)
+    bucket = models.DateField()
+
+    created = models.IntegerField(default=0)
+    started = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    open_delta = models.IntegerField(default=0)
+    overdue_delta = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "task_rollups"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "assignee", "period", "bucket"],
+                condition=Q(assignee__isnull=False),
+                name="task_rollup_unique",
+            ),
+            models.UniqueConstraint(
+                fields=["project", "period", "bucket"],
+                condition=Q(assignee__isnull=True),
+                name="task_rollup_unassigned_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["workspace", "period", "bucket"], name="task_rollup_ws_bucket_idx"),
+            models.Index(fields=["assignee", "period", "bucket"], name="task_rollup_assignee_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.project_id}/{self.assignee_id} {self.period} {self.bucket}"
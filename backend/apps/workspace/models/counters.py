@@ -0,0 +1,44 @@
+from django.db import models
+
+from apps.workspace.models import Workspace
+from apps.workspace.models.project import Project
+
+
+class TaskCounters(models.Model):
+    tasks = models.IntegerField(default=0)
+    tasks_pending = models.IntegerField(default=0)
+    tasks_in_progress = models.IntegerField(default=0)
+    tasks_completed = models.IntegerField(default=0)
+    tasks_cancelled = models.IntegerField(default=0)
+    members = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class WorkspaceCounters(TaskCounters):
+    """
+    Denormalized counts of a workspace: WorkspaceMember rows, projects, and
+    tasks overall and by status. Maintained with F() updates in the same
+    transaction as the write (apps.workspace.counters);
+    `manage.py reconcile_counters` detects and repairs drift.
+    """
+    workspace = models.OneToOneField(Workspace, on_delete=models.CASCADE, primary_key=True, related_name="counters")
+    projects = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "workspace_counters"
+
+    def __str__(self):
+        return f"{self.workspace_id}: {self.projects} projects, {self.tasks} tasks"
+
+
+class ProjectCounters(TaskCounters):
+    """ProjectMember rows and tasks of a project, maintained like WorkspaceCounters."""
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name="counters")
+
+    class Meta:
+        db_table = "project_counters"
+
+    def __str__(self):
+        return f"{self.project_id}: {self.tasks} tasks"
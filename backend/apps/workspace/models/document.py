@@ -1,10 +1,35 @@
 from django.db import models
+from django.db.models import Exists, Q
 from apps.users.models import User
-from apps.workspace.models.workspace import Workspace
+from apps.workspace.models.workspace import Workspace, WorkspaceMember
 import uuid
 import os
 
 
+class WorkspaceDocumentQuerySet(models.QuerySet):
+    def accessible_to(self, user, workspace, role=None):
+        """
+        Documents of `workspace` that `user` can see: admins/owners see all of them,
+        other members see public documents and their own uploads.
+        """
+        user_id = getattr(user, "pk", user)
+        workspace_id = getattr(workspace, "pk", workspace)
+        qs = self.filter(workspace_id=workspace_id)
+        visible = Q(visibility='public') | Q(uploaded_by_id=user_id)
+
+        if role is not None or not user_id:
+            if not role:
+                return qs.none()
+            if role in ('owner', 'admin'):
+                return qs
+            return qs.filter(visible)
+
+        is_owner = Exists(Workspace.objects.filter(id=workspace_id, owner_id=user_id))
+        members = WorkspaceMember.objects.filter(workspace_id=workspace_id, user_id=user_id)
+        is_admin = Q(is_owner) | Q(Exists(members.filter(role__in=('owner', 'admin'))))
+        return qs.filter(Q(is_owner) | Q(Exists(members))).filter(is_admin | visible)
+
+
 class WorkspaceDocument(models.Model):
     VISIBILITY_CHOICES = (
         ('public', 'Public (All Workspace Members)'),
@@ -56,9 +81,14 @@ class WorkspaceDocument(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = WorkspaceDocumentQuerySet.as_manager()
+
     class Meta:
         db_table = 'workspace_documents'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['workspace', '-created_at', '-id'], name='document_ws_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.workspace.name})"
@@ -1,9 +1,52 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Q
 from django.utils import timezone
 import uuid
 
 from apps.users.models import User
-from apps.workspace.models import Workspace
+from apps.workspace.models import Workspace, WorkspaceMember
+
+ADMIN_ROLES = ("owner", "admin")
+
+
+def accessible_projects_q(user, workspace, role=None, prefix=""):
+    """
+    Visibility rule for projects, as a filter on a model reaching Project through `prefix`
+    (e.g. "project__" for tasks). Admins/owners see every project of the workspace,
+    other members see public projects and the ones they belong to.
+
+    Explicit access is a correlated EXISTS on the UserProjectAccess table (one
+    indexed lookup on (project, user)) rather than a join, so rows are never
+    multiplied and no DISTINCT is needed. Pass the user's workspace `role` when it
+    is already known (see RequestAccess) to drop the membership subqueries.
+    """
+    user_id = getattr(user, "pk", user)
+    workspace_id = getattr(workspace, "pk", workspace)
+    in_workspace = Q(**{f"{prefix}workspace_id": workspace_id})
+    is_public = Q(**{f"{prefix}visibility": "public"})
+    has_access = Q(Exists(
+        UserProjectAccess.objects.filter(project_id=OuterRef(f"{prefix}id"), user_id=user_id)
+    ))
+
+    if role is not None or not user_id:
+        if not role:
+            return Q(pk__in=[])
+        if role in ADMIN_ROLES:
+            return in_workspace
+        return in_workspace & (is_public | has_access)
+
+    # Role unknown: admins/owners and project members have rows; public projects
+    # need workspace membership (uncorrelated, evaluated once)
+    is_member = Q(Exists(Workspace.objects.filter(id=workspace_id, owner_id=user_id))) | Q(Exists(
+        WorkspaceMember.objects.filter(workspace_id=workspace_id, user_id=user_id)
+    ))
+    return in_workspace & (has_access | (is_public & is_member))
+
+
+class ProjectQuerySet(models.QuerySet):
+    def accessible_to(self, user, workspace, role=None):
+        """Projects of `workspace` that `user` can see."""
+        return self.filter(accessible_projects_q(user, workspace, role))
 
 
 class Project(models.Model):
@@ -47,6 +90,8 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         db_table = "projects"
         ordering = ["-created_at"]
@@ -83,3 +128,32 @@ class ProjectMember(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.project} - {self.permission}"
+
+
+
+class UserProjectAccess(models.Model):
+    """
+    Denormalized explicit access: one row per (user, project) for workspace
+    admins/owners (every project, can_write) and for project members who belong to
+    the workspace. Public-project visibility for plain members stays a predicate
+    (see accessible_projects_q) so it does not fan out to members x projects.
+
+    Maintained by apps.workspace.project_access, through the membership signals;
+    `manage.py rebuild_project_access` rebuilds it in bulk.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="project_access")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="user_access")
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, related_name="+")
+    can_write = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "user_project_access"
+        constraints = [
+            models.UniqueConstraint(fields=["project", "user"], name="user_project_access_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["user", "workspace"], name="upa_user_workspace_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.project_id} ({'write' if self.can_write else 'read'})"
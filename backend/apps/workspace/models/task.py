@@ -4,6 +4,22 @@ import uuid
 
 from apps.users.models import User
 from apps.workspace.models import Workspace, task, Project
+from apps.workspace.models.project import accessible_projects_q
+
+
+class TaskQuerySet(models.QuerySet):
+    def accessible_to(self, user, workspace, role=None):
+        """Tasks in projects of `workspace` that `user` can see."""
+        return self.filter(accessible_projects_q(user, workspace, role, prefix="project__"))
+
+
+class CommentQuerySet(models.QuerySet):
+    def accessible_to(self, user, workspace, role=None):
+        """Comments on tasks in projects of `workspace` that `user` can see."""
+        return self.filter(accessible_projects_q(user, workspace, role, prefix="task__project__"))
+
+
+ROLLUP_FIELDS = ("project_id", "assigned_to_id", "status", "created_at", "started_at", "completed_at", "due_date")
 
 
 class Task(models.Model):
@@ -65,19 +81,43 @@ class Task(models.Model):
     )
 
     due_date = models.DateField(blank=True, null=True)
+    started_at = models.DateTimeField(blank=True, null=True)
     completed_at = models.DateTimeField(blank=True, null=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         db_table = "tasks"
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of a project's tasks
+            models.Index(fields=["project", "-created_at", "-id"], name="task_project_created_idx"),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored status, so the counters can move the task on save
+        instance._loaded_status = instance.__dict__.get("status")
+        # ... and the state the analytics rollups counted it with
+        instance._loaded_rollup = instance.rollup_state()
+        return instance
+
+    def rollup_state(self):
+        """The fields the analytics rollups depend on, or None when some are deferred."""
+        if any(name not in self.__dict__ for name in ROLLUP_FIELDS):
+            return None
+        return {name: self.__dict__[name] for name in ROLLUP_FIELDS}
+
     def save(self, *args, **kwargs):
+        if self.status == self.StatusChoices.IN_PROGRESS and not self.started_at:
+            self.started_at = timezone.now()
         if self.status == self.StatusChoices.COMPLETED and not self.completed_at:
             self.completed_at = timezone.now()
         elif self.status != self.StatusChoices.COMPLETED and self.completed_at:
@@ -105,8 +145,13 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CommentQuerySet.as_manager()
+
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["task", "created_at", "id"], name="comment_task_created_idx"),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author} on {self.task.title}"
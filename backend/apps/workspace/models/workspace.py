@@ -1,8 +1,23 @@
 from django.db import models
+from django.db.models import Exists, OuterRef, Q
 from apps.users.models import User 
 import uuid
 
 
+class WorkspaceQuerySet(models.QuerySet):
+    def accessible_to(self, user):
+        """
+        Workspaces `user` owns or belongs to. Membership is a correlated EXISTS
+        rather than a join on members, so rows are not multiplied and no
+        DISTINCT is needed.
+        """
+        user_id = getattr(user, "pk", user)
+        return self.filter(
+            Q(owner_id=user_id)
+            | Q(Exists(WorkspaceMember.objects.filter(workspace_id=OuterRef("pk"), user_id=user_id)))
+        )
+
+
 class Workspace(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=120)
@@ -17,6 +32,8 @@ class Workspace(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = WorkspaceQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
 
@@ -53,6 +70,9 @@ class WorkspaceMember(models.Model):
 
     class Meta:
         unique_together = ('workspace', 'user')
+        indexes = [
+            models.Index(fields=['workspace', 'joined_at', 'id'], name='member_ws_joined_idx'),
+        ]
 
 
 class WorkspaceInvitation(models.Model):
@@ -131,7 +151,15 @@ class ActivityLog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
+        # Partitioned by month on PostgreSQL, with retention and archival
+        # (see activity_archive.py)
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['workspace', '-created_at', '-id'], name='activity_ws_created_idx'),
+            # Feed filters (api.views.activity_views)
+            models.Index(fields=['workspace', 'actor', '-created_at', '-id'], name='activity_ws_actor_idx'),
+            models.Index(fields=['workspace', 'target_id', '-created_at', '-id'], name='activity_ws_target_idx'),
+        ]
 
     def __str__(self):
         return f"{self.actor.username} - {self.action_type}"
\ No newline at end of file
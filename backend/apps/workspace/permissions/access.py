@@ -0,0 +1,153 @@
+# permissions/access.py
+"""
+Request-scoped access resolution.
+
+Every permission class, view and serializer asks the same RequestAccess object
+(get_request_access) instead of querying WorkspaceMember / ProjectMember itself:
+
+- Workspace roles come from the user's cached membership map
+  (apps.workspace.utils.membership_cache), at most one query on a cache miss.
+- A project's visibility, the workspace role and the project permission are
+  resolved together in one query per project, and memoized for the request.
+
+So a request costs a constant number of authorization queries whatever the
+endpoint or the number of permission checks.
+"""
+from typing import NamedTuple, Optional
+
+from django.db.models import F, OuterRef, Subquery
+
+from ..models import Project, ProjectMember, WorkspaceMember
+from ..utils.membership_cache import ADMIN_ROLES, EMPTY_MEMBERSHIP, get_request_membership
+
+
+class ProjectAccess(NamedTuple):
+    project_id: str
+    workspace_id: str
+    visibility: str
+    created_by_id: Optional[object]
+    # None when the user is not a member of the project's workspace
+    workspace_role: Optional[str]
+    # None when the user is not an explicit project member
+    permission: Optional[str]
+
+    @property
+    def is_workspace_member(self) -> bool:
+        return self.workspace_role is not None
+
+    @property
+    def is_workspace_admin(self) -> bool:
+        return self.workspace_role in ADMIN_ROLES
+
+    @property
+    def is_project_member(self) -> bool:
+        return self.permission is not None
+
+    @property
+    def can_view(self) -> bool:
+        """Admins/owners see every project, members see public ones and their own."""
+        if not self.is_workspace_member:
+            return False
+        return self.is_workspace_admin or self.visibility == 'public' or self.is_project_member
+
+    @property
+    def can_write(self) -> bool:
+        return self.is_workspace_admin or (self.is_workspace_member and self.permission == 'write')
+
+
+class RequestAccess:
+    """Access decisions for one request's user, memoized for the request."""
+
+    def __init__(self, request):
+        self.request = request
+        user = getattr(request, 'user', None)
+        self.user_id = user.pk if (user is not None and user.is_authenticated) else None
+        self._projects = {}
+
+    @property
+    def membership(self):
+        if self.user_id is None:
+            return EMPTY_MEMBERSHIP
+        return get_request_membership(self.request)
+
+    def workspace_role(self, workspace_id) -> Optional[str]:
+        if workspace_id is None:
+            return None
+        # A resolved project already knows the role in its workspace
+        for access in self._projects.values():
+            if access and access.workspace_id == str(workspace_id):
+                return access.workspace_role
+        return self.membership.role(workspace_id)
+
+    def is_workspace_member(self, workspace_id) -> bool:
+        return self.workspace_role(workspace_id) is not None
+
+    def is_workspace_admin(self, workspace_id) -> bool:
+        return self.workspace_role(workspace_id) in ADMIN_ROLES
+
+    def project(self, project_id, workspace_id=None) -> Optional[ProjectAccess]:
+        """
+        Returns the ProjectAccess for project_id, or None when the project does not
+        exist (or does not belong to workspace_id, when given).
+        """
+        if project_id is None:
+            return None
+        key = str(project_id)
+        if key not in self._projects:
+            self._projects[key] = self._load_project(project_id)
+
+        access = self._projects[key]
+        if access and workspace_id is not None and access.workspace_id != str(workspace_id):
+            return None
+        return access
+
+    def _load_project(self, project_id) -> Optional[ProjectAccess]:
+        if self.user_id is None:
+            return None
+        role = WorkspaceMember.objects.filter(
+            workspace_id=OuterRef('workspace_id'),
+            user_id=self.user_id,
+        ).values('role')[:1]
+        permission = ProjectMember.objects.filter(
+            project_id=OuterRef('pk'),
+            user_id=self.user_id,
+        ).values('permission')[:1]
+
+        row = Project.objects.filter(id=project_id).order_by().values(
+            'id',
+            'workspace_id',
+            'visibility',
+            'created_by_id',
+            workspace_owner_id=F('workspace__owner_id'),
+            member_role=Subquery(role),
+            project_permission=Subquery(permission),
+        ).first()
+        if row is None:
+            return None
+
+        workspace_role = row['member_role']
+        if str(row['workspace_owner_id']) == str(self.user_id):
+            workspace_role = 'owner'
+        return ProjectAccess(
+            project_id=str(row['id']),
+            workspace_id=str(row['workspace_id']),
+            visibility=row['visibility'],
+            created_by_id=row['created_by_id'],
+            workspace_role=workspace_role,
+            permission=row['project_permission'],
+        )
+
+
+def get_request_access(request) -> RequestAccess:
+    """Returns the RequestAccess for a Django or DRF request, created once per request."""
+    django_request = getattr(request, '_request', request)
+    access = getattr(django_request, '_access', None)
+    if access is None or access.user_id != _user_id(request):
+        access = RequestAccess(request)
+        django_request._access = access
+    return access
+
+
+def _user_id(request):
+    user = getattr(request, 'user', None)
+    return user.pk if (user is not None and user.is_authenticated) else None
@@ -1,6 +1,5 @@
 from rest_framework import permissions
-from django.shortcuts import get_object_or_404
-from ..models import WorkspaceMember, ProjectMember, Workspace, Project
+from .access import get_request_access
 
 class IsWorkspaceMemberOrAdmin(permissions.BasePermission):
     """
@@ -24,22 +23,16 @@ class IsWorkspaceMemberOrAdmin(permissions.BasePermission):
             return True
 
         # Check if user is a member of this workspace
-        return WorkspaceMember.objects.filter(
-            workspace_id=workspace_id, 
-            user=request.user
-        ).exists()
+        return get_request_access(request).is_workspace_member(workspace_id)
 
     def has_object_permission(self, request, view, obj):
         # This is called when view.get_object() runs.
         # 'obj' is the actual Workspace instance.
 
         # 1. Verify Membership again (Safeguard)
-        membership = WorkspaceMember.objects.filter(
-            workspace=obj, 
-            user=request.user
-        ).first()
+        role = get_request_access(request).workspace_role(obj.id)
 
-        if not membership:
+        if not role:
             return False
 
         # 2. Safe Methods (GET, HEAD, OPTIONS) -> Allow any member
@@ -47,7 +40,7 @@ class IsWorkspaceMemberOrAdmin(permissions.BasePermission):
             return True
 
         # 3. Unsafe Methods (PUT, DELETE) -> Must be Admin or Owner
-        return membership.role in ['admin', 'owner']
+        return role in ['admin', 'owner']
 
 
 class IsProjectCollaboratorOrWorkspaceAdmin(permissions.BasePermission):
@@ -62,52 +55,33 @@ class IsProjectCollaboratorOrWorkspaceAdmin(permissions.BasePermission):
         if not request.user.is_authenticated:
             return False
 
+        access = get_request_access(request)
         workspace_id = view.kwargs.get('workspace_id')
         if workspace_id:
-            is_workspace_member = WorkspaceMember.objects.filter(
-                workspace_id=workspace_id, 
-                user=request.user
-            ).exists()
-            if not is_workspace_member:
+            if not access.is_workspace_member(workspace_id):
                 return False
 
+        # Nested project routes (e.g. project members) require access to the project itself
+        project_id = view.kwargs.get('project_id')
+        if project_id:
+            project = access.project(project_id, workspace_id)
+            return bool(project and project.can_view)
+
         return True
 
     def has_object_permission(self, request, view, obj):
         # 'obj' here is the PROJECT instance
-        workspace_membership = WorkspaceMember.objects.filter(
-            workspace=obj.workspace,
-            user=request.user
-        ).first()
-
-        if not workspace_membership:
-            return False
-
-        # 1. ADMIN/OWNER OVERRIDE
-        if workspace_membership.role in ['admin', 'owner']:
-            return True
-
-        # 2. Check Project Membership
-        is_project_collaborator = ProjectMember.objects.filter(
-            project=obj,
-            user=request.user
-        ).exists()
+        project = get_request_access(request).project(obj.id)
 
-        # 3. If Private Project -> Only project members (or admins/owners handled above)
-        if obj.visibility == 'private' and not is_project_collaborator:
+        if not project:
             return False
 
-        # 4. Safe Methods (GET, HEAD, OPTIONS) -> Allowed if public or collaborator
+        # Safe Methods (GET, HEAD, OPTIONS) -> Admins/Owners, public projects or collaborators
         if request.method in permissions.SAFE_METHODS:
-            return True
-
-        # 5. Unsafe Methods (PUT, PATCH, DELETE) -> Creator or project members with write permission
-        if is_project_collaborator:
-            pm = ProjectMember.objects.filter(project=obj, user=request.user).first()
-            if pm and pm.permission == 'write':
-                return True
+            return project.can_view
 
-        return False
+        # Unsafe Methods (PUT, PATCH, DELETE) -> Admins/Owners or project members with write permission
+        return project.can_write
 
 
 class IsTaskCollaboratorOrProjectAdmin(permissions.BasePermission):
@@ -126,58 +100,24 @@ class IsTaskCollaboratorOrProjectAdmin(permissions.BasePermission):
             
         workspace_id = view.kwargs.get('workspace_id')
         project_id = view.kwargs.get('project_id')
-        user = request.user
+        access = get_request_access(request)
 
         if workspace_id:
-            workspace_member = WorkspaceMember.objects.filter(
-                workspace_id=workspace_id,
-                user=user
-            ).first()
-            if not workspace_member:
+            if not access.is_workspace_member(workspace_id):
                 return False
 
             if project_id:
-                try:
-                    project = Project.objects.get(id=project_id, workspace_id=workspace_id)
-                    if workspace_member.role in ['admin', 'owner']:
-                        return True
-                    if project.visibility == 'public':
-                        return True
-                    return ProjectMember.objects.filter(project=project, user=user).exists()
-                except Project.DoesNotExist:
-                    return False
+                project = access.project(project_id, workspace_id)
+                return bool(project and project.can_view)
 
         return True
 
     def has_object_permission(self, request, view, obj):
         # 'obj' is the TASK instance
-        project = obj.project
-        workspace = project.workspace
-
-        # 1. Workspace Membership check
-        workspace_member = WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user
-        ).first()
-
-        if not workspace_member:
-            return False
-
-        # 2. ADMIN/OWNER OVERRIDE
-        if workspace_member.role in ['admin', 'owner']:
-            return True
-
-        # 3. Check Project Membership & Visibility
-        is_project_member = ProjectMember.objects.filter(
-            project=project,
-            user=request.user
-        ).exists()
+        project = get_request_access(request).project(obj.project_id)
 
-        if project.visibility == 'private' and not is_project_member:
-            return False
-
-        # If project is public OR user is project member -> can see and interact!
-        return True
+        # If project is public OR user is project member (or admin/owner) -> can see and interact!
+        return bool(project and project.can_view)
 
 
 class IsCommentVisibleToUser(permissions.BasePermission):
@@ -189,27 +129,6 @@ class IsCommentVisibleToUser(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         # obj is Comment
-        task = obj.task
-        project = task.project
-        workspace = project.workspace
-
-        workspace_member = WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user
-        ).first()
-
-        if not workspace_member:
-            return False
-
-        if workspace_member.role in ['admin', 'owner']:
-            return True
-
-        is_project_member = ProjectMember.objects.filter(
-            project=project,
-            user=request.user
-        ).exists()
-        
-        if project.visibility == 'public' or is_project_member:
-            return True
+        project = get_request_access(request).project(obj.task.project_id)
 
-        return False
\ No newline at end of file
+        return bool(project and project.can_view)
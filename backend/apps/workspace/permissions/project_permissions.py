@@ -1,6 +1,6 @@
 # permissions.py
 from rest_framework import permissions
-from ..models import WorkspaceMember, ProjectMember
+from .access import get_request_access
 
 class HasProjectAccess(permissions.BasePermission):
     def has_permission(self, request, view):
@@ -9,11 +9,7 @@ class HasProjectAccess(permissions.BasePermission):
 
         # 2. CHECK WORKSPACE LEVEL (The "God Mode" check)
         # If user is Workspace Owner/Admin, they generally can do anything.
-        is_workspace_admin = WorkspaceMember.objects.filter(
-            user=request.user, 
-            workspace_id=workspace_id, 
-            role__in=['owner', 'admin']
-        ).exists()
+        is_workspace_admin = get_request_access(request).is_workspace_admin(workspace_id)
 
         if is_workspace_admin:
             return True
@@ -28,21 +24,15 @@ class HasProjectAccess(permissions.BasePermission):
         # 'obj' here is the Project instance
         
         # 1. Re-check Workspace Admin (because has_object_permission runs after has_permission)
-        workspace_role = WorkspaceMember.objects.filter(
-            user=request.user, 
-            workspace=obj.workspace
-        ).values_list('role', flat=True).first()
+        project = get_request_access(request).project(obj.id)
+        if not project:
+            return False
 
-        if workspace_role in ['owner', 'admin']:
+        if project.is_workspace_admin:
             return True
 
         # 2. Check Project Membership
-        try:
-            project_member = ProjectMember.objects.get(
-                user=request.user, 
-                project=obj
-            )
-        except ProjectMember.DoesNotExist:
+        if not project.is_project_member:
             return False
 
         # 3. Granular Action Check
@@ -52,6 +42,6 @@ class HasProjectAccess(permissions.BasePermission):
             
         if request.method in ['POST', 'PUT', 'PATCH', 'DELETE']:
             # Only Editors can write
-            return project_member.role == 'write'
+            return project.permission == 'write'
 
         return False
\ No newline at end of file
@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from ..models import WorkspaceMember, Workspace
+from ..models import Workspace
+from .access import get_request_access
 
 
 
@@ -31,15 +32,9 @@ class IsWorkspaceMember(permissions.BasePermission):
         if request.user.is_superuser:
             return True
 
-        workspace = obj if isinstance(obj, Workspace) else obj.workspace
+        workspace_id = obj.id if isinstance(obj, Workspace) else obj.workspace_id
 
-        if workspace.owner == request.user:
-            return True
-
-        return WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user
-        ).exists()
+        return get_request_access(request).is_workspace_member(workspace_id)
 
 
 class IsWorkspaceAdmin(permissions.BasePermission):
@@ -63,14 +58,7 @@ class IsWorkspaceAdmin(permissions.BasePermission):
         workspace = get_workspace_from_obj(obj)
 
         # Workspace owner always has admin rights
-        if workspace.owner == request.user:
-            return True
-
-        return WorkspaceMember.objects.filter(
-            workspace=workspace,
-            user=request.user,
-            role="admin"
-        ).exists()
+        return get_request_access(request).is_workspace_admin(workspace.id)
 
 
 class IsWorkspaceOwner(permissions.BasePermission):
@@ -91,4 +79,4 @@ class IsWorkspaceOwner(permissions.BasePermission):
             return True
 
         workspace = get_workspace_from_obj(obj)
-        return workspace.owner == request.user
+        return str(workspace.owner_id) == str(request.user.pk)
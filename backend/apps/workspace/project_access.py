@@ -0,0 +1,152 @@
+# workspace/project_access.py
+"""
+Maintenance of the UserProjectAccess table.
+
+Rows exist for workspace admins/owners (every project of the workspace, can_write)
+and for project members who belong to the workspace (can_write from their
+ProjectMember permission). Handlers for deletions only remove or downgrade rows,
+so they are safe to run inside cascading deletes.
+"""
+from django.db import transaction
+
+from .models import Project, ProjectMember, UserProjectAccess, Workspace, WorkspaceMember
+from .models.project import ADMIN_ROLES
+
+
+def get_workspace_role(user_id, workspace_id):
+    if Workspace.objects.filter(id=workspace_id, owner_id=user_id).exists():
+        return 'owner'
+    return WorkspaceMember.objects.filter(
+        workspace_id=workspace_id, user_id=user_id
+    ).values_list('role', flat=True).first()
+
+
+def _expected_user_access(user_id, workspace_id) -> dict:
+    """{project_id: can_write} the user should have in the workspace."""
+    role = get_workspace_role(user_id, workspace_id)
+    if role in ADMIN_ROLES:
+        return {pid: True for pid in Project.objects.filter(workspace_id=workspace_id).values_list('id', flat=True)}
+    if role:
+        return {
+            pid: permission == 'write'
+            for pid, permission in ProjectMember.objects.filter(
+                user_id=user_id, project__workspace_id=workspace_id
+            ).values_list('project_id', 'permission')
+        }
+    return {}
+
+
+def _apply(user_id, workspace_id, expected: dict, existing: dict):
+    stale = [pid for pid in existing if pid not in expected]
+    if stale:
+        UserProjectAccess.objects.filter(user_id=user_id, project_id__in=stale).delete()
+
+    UserProjectAccess.objects.bulk_create([
+        UserProjectAccess(user_id=user_id, project_id=pid, workspace_id=workspace_id, can_write=can_write)
+        for pid, can_write in expected.items() if pid not in existing
+    ])
+
+    for can_write in (True, False):
+        changed = [pid for pid, w in expected.items() if pid in existing and existing[pid] != w and w == can_write]
+        if changed:
+            UserProjectAccess.objects.filter(user_id=user_id, project_id__in=changed).update(can_write=can_write)
+
+
+def sync_user_workspace_access(user_id, workspace_id):
+    """Recomputes a user's rows in one workspace (joined, left, role changed)."""
+    with transaction.atomic():
+        existing = dict(
+            UserProjectAccess.objects.filter(user_id=user_id, workspace_id=workspace_id)
+            .values_list('project_id', 'can_write')
+        )
+        _apply(user_id, workspace_id, _expected_user_access(user_id, workspace_id), existing)
+
+
+def revoke_user_workspace_access(user_id, workspace_id):
+    """Drops a user's rows after leaving a workspace, unless they still own it."""
+    if Workspace.objects.filter(id=workspace_id, owner_id=user_id).exists():
+        return
+    UserProjectAccess.objects.filter(user_id=user_id, workspace_id=workspace_id).delete()
+
+
+def sync_project_member_access(project_member):
+    """Creates or updates the row for a saved ProjectMember."""
+    project = project_member.project
+    role = get_workspace_role(project_member.user_id, project.workspace_id)
+    if not role:
+        return
+    UserProjectAccess.objects.update_or_create(
+        user_id=project_member.user_id,
+        project_id=project.id,
+        defaults={
+            'workspace_id': project.workspace_id,
+            'can_write': role in ADMIN_ROLES or project_member.permission == 'write',
+        },
+    )
+
+
+def revoke_project_member_access(project_member):
+    """Removes the row of a deleted ProjectMember; admins keep full access."""
+    rows = UserProjectAccess.objects.filter(user_id=project_member.user_id, project_id=project_member.project_id)
+    workspace_id = rows.values_list('workspace_id', flat=True).first()
+    if workspace_id and get_workspace_role(project_member.user_id, workspace_id) in ADMIN_ROLES:
+        rows.update(can_write=True)
+    else:
+        rows.delete()
+
+
+def grant_new_project_access(project):
+    """Gives the workspace admins/owners access to a newly created project."""
+    admin_ids = set(
+        WorkspaceMember.objects.filter(workspace_id=project.workspace_id, role__in=ADMIN_ROLES)
+        .values_list('user_id', flat=True)
+    )
+    admin_ids.add(Workspace.objects.filter(id=project.workspace_id).values_list('owner_id', flat=True).first())
+    UserProjectAccess.objects.bulk_create(
+        [
+            UserProjectAccess(user_id=uid, project_id=project.id, workspace_id=project.workspace_id, can_write=True)
+            for uid in admin_ids if uid
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def build_workspace_access_rows(workspace_id) -> list:
+    """All UserProjectAccess rows a workspace should have, computed in three queries."""
+    owner_id = Workspace.objects.filter(id=workspace_id).values_list('owner_id', flat=True).first()
+    roles = dict(WorkspaceMember.objects.filter(workspace_id=workspace_id).values_list('user_id', 'role'))
+    if owner_id:
+        roles[owner_id] = 'owner'
+
+    rows = {}
+    project_ids = list(Project.objects.filter(workspace_id=workspace_id).values_list('id', flat=True))
+    for user_id, role in roles.items():
+        if role in ADMIN_ROLES:
+            for pid in project_ids:
+                rows[(user_id, pid)] = True
+
+    for user_id, pid, permission in ProjectMember.objects.filter(
+        project__workspace_id=workspace_id
+    ).values_list('user_id', 'project_id', 'permission'):
+        if user_id in roles and (user_id, pid) not in rows:
+            rows[(user_id, pid)] = permission == 'write'
+
+    return [
+        UserProjectAccess(user_id=uid, project_id=pid, workspace_id=workspace_id, can_write=can_write)
+        for (uid, pid), can_write in rows.items()
+    ]
+
+
+def rebuild_project_access(workspace_ids=None, batch_size=1000) -> int:
+    """Rebuilds the table for the given workspaces (all when None). Returns the row count."""
+    if workspace_ids is None:
+        workspace_ids = Workspace.objects.values_list('id', flat=True)
+
+    total = 0
+    for workspace_id in list(workspace_ids):
+        with transaction.atomic():
+            UserProjectAccess.objects.filter(workspace_id=workspace_id).delete()
+            rows = build_workspace_access_rows(workspace_id)
+            UserProjectAccess.objects.bulk_create(rows, batch_size=batch_size)
+        total += len(rows)
+    return total
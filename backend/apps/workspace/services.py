@@ -1,12 +1,14 @@
 # workspace/services.py
 from django.db import transaction
-from .models import Task, ActivityLog, Project, ProjectMember, WorkspaceMember, Comment
+from .models import Task, Project, ProjectMember, WorkspaceMember, Comment
+from . import counters
+from .utils.activity import log_activity
 from apps.notifications.notification_services import NotificationService
 from django.utils import timezone
 
 
 def create_project_service(user, workspace, project_data):
-    with transaction.atomic():
+    with transaction.atomic(), counters.batched():
         # 1. Create the Project
         project = Project.objects.create(
             created_by=user,
@@ -22,9 +24,9 @@ def create_project_service(user, workspace, project_data):
         )
 
         # 3. Log Activity
-        ActivityLog.objects.create(
-            workspace=workspace,
-            actor=user,
+        log_activity(
+            workspace_id=workspace.id,
+            actor_id=user.pk,
             action_type='create_project',
             target_id=project.id,
             target_text=project.title
@@ -62,9 +64,9 @@ def start_task_service(user, task):
         task.save()
 
         # 2. Log Activity
-        ActivityLog.objects.create(
-            workspace=task.project.workspace,
-            actor=user,
+        log_activity(
+            workspace_id=task.project.workspace_id,
+            actor_id=user.pk,
             action_type='start_task',
             target_id=task.id,
             target_text=task.title
@@ -92,9 +94,9 @@ def complete_task_service(user, task):
         task.completed_at = timezone.now()
         task.save()
 
-        ActivityLog.objects.create(
-            workspace=task.project.workspace,
-            actor=user,
+        log_activity(
+            workspace_id=task.project.workspace_id,
+            actor_id=user.pk,
             action_type='complete_task',
             target_id=task.id,
             target_text=task.title
@@ -126,9 +128,9 @@ def add_project_member_service(actor, project, target_user, role='read'):
         )
 
         # 2. Log Activity
-        ActivityLog.objects.create(
-            workspace=project.workspace,
-            actor=actor,
+        log_activity(
+            workspace_id=project.workspace_id,
+            actor_id=actor.pk,
             action_type='add_project_member',
             target_id=project.id,
             target_text=f"{target_user.profile.username} to {project.title}"
@@ -157,9 +159,9 @@ def create_comment_service(user, task, content):
         )
 
         # 2. Log Activity
-        ActivityLog.objects.create(
-            workspace=task.project.workspace,
-            actor=user,
+        log_activity(
+            workspace_id=task.project.workspace_id,
+            actor_id=user.pk,
             action_type='comment',
             target_id=task.id,
             target_text=f"Comment on {task.title}"
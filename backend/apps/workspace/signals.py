@@ -1,35 +1,234 @@
 # workspace/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, pre_delete
 from django.dispatch import receiver
-from .models import Project, Task, ActivityLog, WorkspaceMember
+from django.contrib.auth import get_user_model
+from apps.notifications.models import Notification
+from apps.users.models import Profile, UserSettings
+from .models import Project, Task, Comment, ActivityLog, Workspace, WorkspaceMember, ProjectMember
+from .utils.membership_cache import invalidate_membership_cache
+from .utils.versions import bump_workspace_versions, bump_user_versions
+from .utils import dashboard
+from .utils.activity import log_activity
+from . import analytics, counters, project_access
+
+User = get_user_model()
 
 @receiver(post_save, sender=Task)
 def log_task_activity(sender, instance, created, **kwargs):
+    # Fallbacks for writes that bypass the services (see utils/activity.py).
+    # Runs before count_task below moves _loaded_status to the new status.
     if created:
-        ActivityLog.objects.create(
-            workspace=instance.project.workspace,
-            actor=instance.created_by,
+        log_activity(
+            workspace_id=instance.project.workspace_id,
+            actor_id=instance.created_by_id,
             action_type='create_task',
             target_id=instance.id,
-            target_text=instance.title
+            target_text=instance.title,
+            fallback=True,
         )
-    elif instance.status == 'completed' and instance.completed_at:
-        # Avoid duplicate logs if saved multiple times
-        ActivityLog.objects.create(
-            workspace=instance.project.workspace,
-            actor=instance.assigned_to or instance.created_by, # Fallback
+    elif instance.status == 'completed' and getattr(instance, '_loaded_status', None) != 'completed':
+        log_activity(
+            workspace_id=instance.project.workspace_id,
+            actor_id=instance.assigned_to_id or instance.created_by_id, # Fallback
             action_type='complete_task',
             target_id=instance.id,
-            target_text=instance.title
+            target_text=instance.title,
+            fallback=True,
         )
 
+@receiver(post_save, sender=Project)
+def grant_project_access(sender, instance, created, **kwargs):
+    if created:
+        project_access.grant_new_project_access(instance)
+
+
 @receiver(post_save, sender=Project)
 def log_project_creation(sender, instance, created, **kwargs):
     if created:
-        ActivityLog.objects.create(
-            workspace=instance.workspace,
-            actor=instance.created_by,
+        log_activity(
+            workspace_id=instance.workspace_id,
+            actor_id=instance.created_by_id,
             action_type='create_project',
             target_id=instance.id,
-            target_text=instance.title
-        )
\ No newline at end of file
+            target_text=instance.title,
+            fallback=True,
+        )
+
+@receiver(post_save, sender=WorkspaceMember)
+@receiver(post_delete, sender=WorkspaceMember)
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def invalidate_member_membership(sender, instance, **kwargs):
+    invalidate_membership_cache([instance.user_id])
+
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def invalidate_owner_membership(sender, instance, **kwargs):
+    # Owners are members through Workspace.owner, not only through WorkspaceMember
+    invalidate_membership_cache([instance.owner_id])
+
+
+@receiver(post_save, sender=WorkspaceMember)
+def sync_member_project_access(sender, instance, **kwargs):
+    project_access.sync_user_workspace_access(instance.user_id, instance.workspace_id)
+
+
+@receiver(post_delete, sender=WorkspaceMember)
+def revoke_member_project_access(sender, instance, **kwargs):
+    project_access.revoke_user_workspace_access(instance.user_id, instance.workspace_id)
+
+
+@receiver(post_save, sender=ProjectMember)
+def sync_project_member_access(sender, instance, **kwargs):
+    project_access.sync_project_member_access(instance)
+
+
+@receiver(post_delete, sender=ProjectMember)
+def revoke_project_member_access(sender, instance, **kwargs):
+    project_access.revoke_project_member_access(instance)
+
+
+@receiver(post_save, sender=Workspace)
+def sync_owner_project_access(sender, instance, created, **kwargs):
+    if not created:
+        project_access.sync_user_workspace_access(instance.owner_id, instance.id)
+
+
+# --- Response versions (see utils/versions.py) ---
+# Deletes of projects, tasks and comments are bumped by their views: a
+# post_delete receiver would turn the cascades into per-row deletes.
+
+@receiver(post_save, sender=Workspace)
+@receiver(post_delete, sender=Workspace)
+def bump_workspace_version(sender, instance, **kwargs):
+    bump_workspace_versions([instance.pk])
+
+
+@receiver(post_save, sender=WorkspaceMember)
+@receiver(post_delete, sender=WorkspaceMember)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=ActivityLog)
+def bump_workspace_version_of(sender, instance, **kwargs):
+    bump_workspace_versions([instance.workspace_id])
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+@receiver(post_save, sender=Task)
+def bump_project_workspace_version(sender, instance, **kwargs):
+    bump_workspace_versions([instance.project.workspace_id])
+
+
+@receiver(post_save, sender=Comment)
+def bump_comment_workspace_version(sender, instance, **kwargs):
+    bump_workspace_versions([instance.task.project.workspace_id])
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=User)
+def bump_versions_showing_user(sender, instance, created=False, update_fields=None, **kwargs):
+    # Names, avatars and emails are rendered in every workspace the user is in
+    # and in the notifications they caused
+    if created:
+        return
+    if sender is User and update_fields is not None and "email" not in update_fields:
+        return  # e.g. logins, which only save last_login
+
+    user_id = instance.pk if sender is User else instance.user_id
+    workspace_ids = set(Workspace.objects.filter(owner_id=user_id).values_list("id", flat=True))
+    workspace_ids.update(WorkspaceMember.objects.filter(user_id=user_id).values_list("workspace_id", flat=True))
+    bump_workspace_versions(workspace_ids)
+    bump_user_versions(
+        Notification.objects.filter(actor_id=user_id).values_list("recipient_id", flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=UserSettings)
+@receiver(post_delete, sender=UserSettings)
+def bump_settings_user_version(sender, instance, **kwargs):
+    # The page size of the user's lists comes from their settings
+    bump_user_versions([instance.user_id])
+
+
+# --- Dashboard snapshots (see utils/dashboard.py) ---
+
+@receiver(post_save, sender=ActivityLog)
+def record_dashboard_activity(sender, instance, created, **kwargs):
+    if created:
+        dashboard.record_activity(instance)
+
+
+@receiver(post_save, sender=WorkspaceMember)
+def record_dashboard_member(sender, instance, created, **kwargs):
+    dashboard.record_member_saved(instance, created)
+
+
+@receiver(post_delete, sender=WorkspaceMember)
+def remove_dashboard_member(sender, instance, **kwargs):
+    dashboard.record_member_removed(instance)
+
+
+@receiver(post_save, sender=Workspace)
+def record_dashboard_header(sender, instance, created, **kwargs):
+    if not created:
+        dashboard.record_workspace_saved(instance)
+
+
+@receiver(post_delete, sender=Workspace)
+def drop_dashboard(sender, instance, **kwargs):
+    dashboard.drop_dashboard_snapshot(instance.pk)
+
+
+# --- Counters (see counters.py) ---
+
+@receiver(post_save, sender=Workspace)
+def create_workspace_counters(sender, instance, created, **kwargs):
+    if created:
+        counters.workspace_created(instance)
+
+
+@receiver(post_save, sender=Project)
+def count_project(sender, instance, created, **kwargs):
+    if created:
+        counters.project_created(instance)
+
+
+@receiver(post_save, sender=Task)
+def count_task(sender, instance, created, **kwargs):
+    counters.task_saved(instance, created)
+
+
+@receiver(post_save, sender=WorkspaceMember)
+def count_workspace_member(sender, instance, created, **kwargs):
+    if created:
+        counters.workspace_member_changed(instance, 1)
+
+
+@receiver(post_delete, sender=WorkspaceMember)
+def uncount_workspace_member(sender, instance, **kwargs):
+    counters.workspace_member_changed(instance, -1)
+
+
+@receiver(post_save, sender=ProjectMember)
+def count_project_member(sender, instance, created, **kwargs):
+    if created:
+        counters.project_member_changed(instance, 1)
+
+
+@receiver(post_delete, sender=ProjectMember)
+def uncount_project_member(sender, instance, **kwargs):
+    counters.project_member_changed(instance, -1)
+
+
+# --- Analytics rollups (see analytics.py) ---
+
+@receiver(post_save, sender=Task)
+def roll_up_task(sender, instance, created, **kwargs):
+    analytics.task_saved(instance, created)
+
+
+@receiver(pre_delete, sender=User)
+def unassign_task_rollups(sender, instance, **kwargs):
+    # Their tasks become unassigned (SET_NULL) without a save
+    analytics.user_deleted(instance)
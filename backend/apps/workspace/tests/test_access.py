@@ -0,0 +1,69 @@
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember
+from apps.workspace.permissions.access import get_request_access
+
+
+@pytest.mark.django_db
+class TestRequestAccess:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.public = Project.objects.create(workspace=self.workspace, title="Public", visibility="public", created_by=self.owner)
+        self.private = Project.objects.create(workspace=self.workspace, title="Private", visibility="private", created_by=self.owner)
+        self.shared = Project.objects.create(workspace=self.workspace, title="Shared", visibility="private", created_by=self.owner)
+        ProjectMember.objects.create(project=self.shared, user=self.member, permission="write")
+
+    def _access(self, user):
+        request = self.factory.get("/")
+        request.user = user
+        return get_request_access(request)
+
+    def test_project_resolved_in_one_query_and_memoized(self, django_assert_num_queries):
+        access = self._access(self.member)
+        with django_assert_num_queries(1):
+            project = access.project(self.shared.id, self.workspace.id)
+        assert project.workspace_role == "member"
+        assert project.permission == "write"
+        with django_assert_num_queries(0):
+            assert access.project(self.shared.id).can_write
+            assert access.workspace_role(self.workspace.id) == "member"
+
+    def test_visibility_rules(self):
+        member = self._access(self.member)
+        assert member.project(self.public.id).can_view
+        assert not member.project(self.public.id).can_write
+        assert not member.project(self.private.id).can_view
+
+        owner = self._access(self.owner)
+        assert owner.project(self.private.id).can_view
+        assert owner.project(self.private.id).can_write
+
+    def test_project_outside_workspace_is_not_found(self):
+        other = Workspace.objects.create(name="Other", owner=self.owner)
+        assert self._access(self.member).project(self.shared.id, other.id) is None
+
+    def test_task_endpoint_authorization_queries_are_constant(self, django_assert_num_queries):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.member)}")
+        url = f"/api/workspaces/{self.workspace.id}/projects/{self.shared.id}/tasks/"
+        client.get(url)  # warm the user, workspace and membership caches
+
+        # Project access, then the task list
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.status_code == 200
+
+        response = client.get(f"/api/workspaces/{self.workspace.id}/projects/{self.private.id}/tasks/")
+        assert response.status_code == 403
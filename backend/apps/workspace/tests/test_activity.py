@@ -0,0 +1,109 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from apps.notifications.notification_services import NotificationService
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, Task, ActivityLog
+from apps.workspace.services import complete_task_service, create_comment_service, create_project_service
+from apps.workspace.utils.activity import log_activity
+
+
+@pytest.mark.django_db
+class TestActivityLogWriter:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, django_capture_on_commit_callbacks, monkeypatch):
+        monkeypatch.setattr(NotificationService, "send_external_push", staticmethod(lambda **kwargs: None))
+        self.commit = lambda: django_capture_on_commit_callbacks(execute=True)
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        with self.commit():
+            self.project = Project.objects.create(workspace=self.workspace, title="API", created_by=self.owner)
+            self.task = Task.objects.create(project=self.project, title="Fix", created_by=self.owner)
+
+    def _logged(self):
+        return list(ActivityLog.objects.order_by("created_at").values_list("action_type", "target_id", "actor_id"))
+
+    def _log(self, action_type, actor=None):
+        log_activity(self.workspace.id, (actor or self.owner).pk, action_type, self.task.id, self.task.title)
+
+    def test_events_are_written_once_on_commit(self):
+        assert self._logged() == [
+            ("create_project", self.project.id, self.owner.id),
+            ("create_task", self.task.id, self.owner.id),
+        ]
+        ActivityLog.objects.all().delete()
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.commit():
+                with transaction.atomic():
+                    self._log("comment")
+                    self._log("comment")
+                    self._log("comment", actor=self.member)
+                    self._log("start_task")
+                    assert self._logged() == []
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith('INSERT INTO "workspace_activitylog"')]
+        assert len(inserts) == 1
+        assert [row[0] for row in self._logged()] == ["comment", "comment", "start_task"]
+
+    def test_rolled_back_savepoints_drop_their_events(self):
+        ActivityLog.objects.all().delete()
+        with self.commit():
+            with transaction.atomic():
+                self._log("comment")
+                try:
+                    with transaction.atomic():
+                        self._log("start_task")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+        assert [row[0] for row in self._logged()] == ["comment"]
+
+    def test_a_rolled_back_last_event_still_flushes_the_rest(self):
+        ActivityLog.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            with self.commit():
+                with transaction.atomic():
+                    self._log("comment")
+                    self._log("start_task")
+                    try:
+                        with transaction.atomic():
+                            self._log("complete_task")
+                            raise RuntimeError
+                    except RuntimeError:
+                        pass
+        inserts = [q for q in queries.captured_queries if q["sql"].startswith('INSERT INTO "workspace_activitylog"')]
+        assert len(inserts) == 1
+        assert [row[0] for row in self._logged()] == ["comment", "start_task"]
+
+    def test_services_and_signals_do_not_duplicate_rows(self):
+        ActivityLog.objects.all().delete()
+        with self.commit():
+            project = create_project_service(self.owner, self.workspace, {"title": "Web"})
+        with self.commit():
+            self.task.assigned_to = self.member
+            self.task.save()
+            complete_task_service(self.owner, self.task)
+        with self.commit():
+            self.task.title = "Fixed"
+            self.task.save()  # already completed: no second complete_task
+        with self.commit():
+            create_comment_service(self.member, self.task, "Done")
+
+        assert self._logged() == [
+            ("create_project", project.id, self.owner.id),
+            ("complete_task", self.task.id, self.owner.id),
+            ("comment", self.task.id, self.member.id),
+        ]
+
+    def test_plain_updates_still_log_completion(self):
+        ActivityLog.objects.all().delete()
+        with self.commit():
+            task = Task.objects.get(pk=self.task.pk)
+            task.assigned_to = self.member
+            task.status = Task.StatusChoices.COMPLETED
+            task.save()
+        assert self._logged() == [("complete_task", self.task.id, self.member.id)]
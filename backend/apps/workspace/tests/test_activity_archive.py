@@ -0,0 +1,80 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from apps.users.models.user import User
+from apps.workspace import activity_archive
+from apps.workspace.models import Workspace, ActivityLog
+
+
+def _at(year, month, day=15):
+    return datetime.datetime(year, month, day, 12, tzinfo=datetime.timezone.utc)
+
+
+@pytest.mark.django_db
+class TestActivityArchive:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, tmp_path):
+        self.storage = FileSystemStorage(location=tmp_path)
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        self.other = Workspace.objects.create(name="Other", owner=self.owner)
+        self.now = _at(2026, 10)
+
+    def _log(self, workspace, created_at, text):
+        log = ActivityLog.objects.create(workspace=workspace, actor=self.owner, action_type="comment", target_text=text)
+        ActivityLog.objects.filter(pk=log.pk).update(created_at=created_at)
+        return log
+
+    def test_retention_archives_and_drops_old_months(self):
+        self._log(self.workspace, _at(2025, 1, 3), "jan-a")
+        self._log(self.workspace, _at(2025, 1, 20), "jan-b")
+        self._log(self.other, _at(2025, 1, 5), "other")
+        self._log(self.workspace, _at(2025, 3), "mar")
+        recent = self._log(self.workspace, _at(2026, 9), "recent")
+
+        removed = activity_archive.apply_retention(months=12, storage=self.storage, now=self.now)
+        assert removed == [datetime.date(2025, 1, 1), datetime.date(2025, 3, 1)]
+        assert list(ActivityLog.objects.values_list("id", flat=True)) == [recent.id]
+        assert activity_archive.archived_months(self.workspace.id, self.storage) == ["2025-03", "2025-01"]
+        # Paths are relative to the archive root
+        assert self.storage.exists(f"{self.workspace.id}/2025-01.jsonl.gz")
+
+        rows, cursor = activity_archive.read_archived_activity(self.other.id, storage=self.storage)
+        assert [row["target_text"] for row in rows] == ["other"]
+        assert cursor is None
+
+    def test_reader_pages_newest_first_across_months(self):
+        for day in (1, 2, 3):
+            self._log(self.workspace, _at(2025, 1, day), f"jan-{day}")
+        for day in (1, 2):
+            self._log(self.workspace, _at(2025, 2, day), f"feb-{day}")
+        activity_archive.apply_retention(months=12, storage=self.storage, now=self.now)
+
+        texts, cursor = [], None
+        while True:
+            rows, cursor = activity_archive.read_archived_activity(
+                self.workspace.id, cursor=cursor, limit=2, storage=self.storage
+            )
+            texts.append([row["target_text"] for row in rows])
+            if cursor is None:
+                break
+        assert texts == [["feb-2", "feb-1"], ["jan-3", "jan-2"], ["jan-1"]]
+
+    def test_rearchiving_a_month_replaces_its_file(self):
+        self._log(self.workspace, _at(2025, 1), "first")
+        activity_archive.archive_month(datetime.date(2025, 1, 1), storage=self.storage)
+        self._log(self.workspace, _at(2025, 1, 16), "second")
+        counts = activity_archive.archive_month(datetime.date(2025, 1, 1), storage=self.storage)
+        assert counts == {self.workspace.id: 2}
+        assert activity_archive.archived_months(self.workspace.id, self.storage) == ["2025-01"]
+
+    def test_command_keeps_everything_with_zero_retention(self):
+        self._log(self.workspace, _at(2020, 1), "old")
+        out = StringIO()
+        call_command("maintain_activity_log", "--retention-months", "0", stdout=out)
+        assert ActivityLog.objects.count() == 1
+        assert "0 months" in out.getvalue()
@@ -0,0 +1,107 @@
+import datetime
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, ActivityLog
+
+
+@pytest.mark.django_db
+class TestWorkspaceActivityFeed:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.outsider = User.objects.create_user(email="outsider@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        other = Workspace.objects.create(name="Other", owner=self.outsider)
+
+        now = timezone.now()
+        rows = [
+            ActivityLog(
+                workspace=self.workspace,
+                actor=self.owner if i % 2 else self.member,
+                action_type="comment" if i % 3 else "create_task",
+                target_id=self.workspace.id if i == 4 else None,
+                target_text=f"Event {i}",
+            )
+            for i in range(9)
+        ]
+        rows.append(ActivityLog(workspace=other, actor=self.outsider, action_type="comment", target_text="Elsewhere"))
+        ActivityLog.objects.bulk_create(rows)
+        # Ties on created_at are broken by id; two events a few days back
+        ActivityLog.objects.filter(target_text__in=["Event 2", "Event 3", "Event 4"]).update(created_at=now)
+        ActivityLog.objects.filter(target_text__in=["Event 0", "Event 1"]).update(
+            created_at=now - datetime.timedelta(days=3)
+        )
+        self.url = f"/api/workspaces/{self.workspace.id}/activity/"
+
+    def _client(self, user=None):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user or self.owner)}")
+        return client
+
+    def _walk(self, url, client=None):
+        client = client or self._client()
+        texts = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            texts += [row["target_text"] for row in response.data["results"]]
+            url = response.data["next"]
+        return texts
+
+    def _expected(self, **filters):
+        return list(ActivityLog.objects.filter(workspace=self.workspace, **filters).order_by(
+            "-created_at", "-id"
+        ).values_list("target_text", flat=True))
+
+    def test_pages_cover_the_workspace_feed_in_order(self):
+        assert self._walk(f"{self.url}?page_size=2") == self._expected()
+        first = self._client(self.member).get(self.url).data["results"][0]
+        assert set(first) == {
+            "id", "actor_name", "actor_username", "actor_avatar", "action_type", "target_text", "created_at"
+        }
+
+    def test_filters(self):
+        assert self._walk(f"{self.url}?action_type=create_task&page_size=2") == self._expected(
+            action_type="create_task"
+        )
+        assert self._walk(f"{self.url}?actor={self.owner.id}") == self._expected(actor=self.owner)
+        assert self._walk(f"{self.url}?target={self.workspace.id}") == ["Event 4"]
+
+        today = timezone.localdate()
+        recent = self._walk(f"{self.url}?start={today - datetime.timedelta(days=1)}")
+        older = self._walk(f"{self.url}?end={today - datetime.timedelta(days=2)}")
+        assert sorted(older) == ["Event 0", "Event 1"]
+        assert len(recent) == 7
+
+    def test_invalid_filters_are_rejected(self):
+        client = self._client()
+        for query in ("action_type=dance", "actor=nobody", "start=yesterday", "start=2026-02-02&end=2026-02-01"):
+            assert client.get(f"{self.url}?{query}").status_code == 400
+
+    def test_non_members_are_denied(self):
+        assert self._client(self.outsider).get(self.url).status_code == 403
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        client = self._client()
+        first_url = f"{self.url}?page_size=2"
+        self._walk(first_url, client)  # warm the user, membership, page size and card caches
+
+        counts = []
+        url = first_url
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                url = client.get(url).data["next"]
+            counts.append(len(queries))
+        assert len(set(counts)) == 1
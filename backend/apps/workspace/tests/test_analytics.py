@@ -0,0 +1,142 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.notifications.notification_services import NotificationService
+from apps.users.models.user import User
+from apps.workspace import analytics
+from apps.workspace.models import Workspace, WorkspaceMember, Project, Task, TaskRollup
+from apps.workspace.services import complete_task_service, start_task_service
+
+
+def _rows(workspace):
+    fields = ("project_id", "assignee_id", "period", "bucket", *analytics.ROLLUP_METRICS)
+    return sorted(
+        tuple(row[f] for f in fields)
+        for row in TaskRollup.objects.filter(workspace=workspace).values(*fields)
+        if any(row[m] for m in analytics.ROLLUP_METRICS)
+    )
+
+
+@pytest.mark.django_db
+class TestTaskRollups:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, monkeypatch):
+        monkeypatch.setattr(NotificationService, "send_external_push", staticmethod(lambda **kwargs: None))
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.project = Project.objects.create(
+            workspace=self.workspace, title="API", created_by=self.owner, visibility="public"
+        )
+        self.private = Project.objects.create(
+            workspace=self.workspace, title="Secret", created_by=self.owner, visibility="private"
+        )
+        self.today = timezone.localdate()
+
+    def _task(self, project=None, **fields):
+        return Task.objects.create(project=project or self.project, title="Task", created_by=self.owner, **fields)
+
+    def _series(self, period="day", start=None, end=None, **filters):
+        rollups = TaskRollup.objects.filter(workspace=self.workspace, **filters)
+        return analytics.task_series(rollups, period, start or self.today, end or self.today)
+
+    def test_writes_match_a_backfill(self):
+        late = self._task(assigned_to=self.member, due_date=self.today - datetime.timedelta(days=3))
+        on_time = self._task(due_date=self.today)
+        cancelled = self._task(project=self.private)
+        start_task_service(self.member, late)
+        complete_task_service(self.member, Task.objects.get(pk=on_time.pk))
+        cancelled.status = Task.StatusChoices.CANCELLED
+        cancelled.save()
+        reopened = Task.objects.get(pk=on_time.pk)
+        reopened.status = Task.StatusChoices.PENDING
+        reopened.assigned_to = self.member
+        reopened.save()
+
+        incremental = _rows(self.workspace)
+        call_command("backfill_task_rollups", stdout=StringIO())
+        assert _rows(self.workspace) == incremental
+
+    def test_migration_counts_existing_tasks(self):
+        from importlib import import_module
+        from django.apps import apps
+
+        task = self._task(assigned_to=self.member)
+        TaskRollup.objects.all().delete()
+        migration = import_module("apps.workspace.migrations.0008_task_rollups")
+        migration.populate_task_rollups(apps, None)
+
+        task.status = Task.StatusChoices.COMPLETED
+        task.completed_at = timezone.now()
+        task.save()
+        assert self._series()[0]["open"] == 0
+        assert self._series()[0]["completed"] == 1
+
+    def test_a_write_is_one_upsert(self):
+        task = self._task()
+        with CaptureQueriesContext(connection) as queries:
+            task.assigned_to = self.member
+            task.save()
+        writes = [q["sql"] for q in queries.captured_queries if "task_rollups" in q["sql"]]
+        # Unassigned rows out, the member's rows in: one statement per kind of assignee
+        assert len(writes) == 2
+        assert self._series(assignee=self.member)[0]["open"] == 1
+        assert self._series(assignee__isnull=True)[0]["open"] == 0
+
+    def test_series(self):
+        task = self._task(due_date=self.today - datetime.timedelta(days=1))
+        self._task(assigned_to=self.member)
+        start_task_service(self.owner, task)
+
+        today = self._series()[0]
+        assert (today["created"], today["started"], today["completed"]) == (2, 1, 0)
+        assert (today["open"], today["overdue"]) == (2, 1)
+
+        complete_task_service(self.owner, task)
+        week = self._series("week")[0]
+        assert week["bucket"] == analytics.bucket_of(self.today, "week")
+        assert (week["completed"], week["open"], week["overdue"]) == (1, 1, 0)
+        assert self._series(assignee=self.member)[0]["open"] == 1
+
+    def test_stocks_carry_over_empty_buckets(self):
+        self._task()
+        series = self._series(end=self.today + datetime.timedelta(days=2))
+        assert [row["open"] for row in series] == [1, 1, 1]
+        assert [row["created"] for row in series] == [1, 0, 0]
+
+    def test_deleting_the_assignee_keeps_workspace_totals(self):
+        self._task(assigned_to=self.member)
+        self.member.delete()
+        assert self._series()[0]["open"] == 1
+        assert not TaskRollup.objects.filter(assignee__isnull=False).exists()
+        incremental = _rows(self.workspace)
+        analytics.backfill_task_rollups([self.workspace.id])
+        assert _rows(self.workspace) == incremental
+
+    def test_endpoints_read_visible_projects(self):
+        self._task()
+        self._task(project=self.private)
+
+        def get(user, route):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+            response = client.get(f"/api/workspaces/{self.workspace.id}/analytics/{route}/")
+            assert response.status_code == 200
+            return response.json()
+
+        assert get(self.owner, "burndown")["results"][-1]["open"] == 2
+        assert get(self.member, "burndown")["results"][-1]["open"] == 1
+        throughput = get(self.owner, "throughput")
+        assert len(throughput["results"]) == 30
+        assert set(throughput["results"][-1]) == {"bucket", "created", "started", "completed"}
+        assert get(self.owner, "velocity")["period"] == "week"
@@ -0,0 +1,123 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.users.models.user import User
+from apps.workspace import counters
+from apps.workspace.models import (
+    Workspace, WorkspaceMember, Project, ProjectMember, Task, WorkspaceCounters, ProjectCounters,
+)
+
+
+@pytest.mark.django_db
+class TestCounters:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, django_capture_on_commit_callbacks):
+        self.commit = lambda: django_capture_on_commit_callbacks(execute=True)
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        self.membership = WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.project = Project.objects.create(workspace=self.workspace, title="API", created_by=self.owner)
+        self.task = Task.objects.create(project=self.project, title="Fix", created_by=self.owner)
+
+    def _workspace(self):
+        return WorkspaceCounters.objects.get(workspace=self.workspace)
+
+    def _project(self, project=None):
+        return ProjectCounters.objects.get(project=project or self.project)
+
+    def test_writes_move_the_counters(self):
+        other = Project.objects.create(workspace=self.workspace, title="Web", created_by=self.owner)
+        Task.objects.create(project=other, title="Ship", created_by=self.owner)
+        pm = ProjectMember.objects.create(project=self.project, user=self.member, permission="read")
+
+        counts = self._workspace()
+        assert (counts.members, counts.projects, counts.tasks, counts.tasks_pending) == (2, 2, 2, 2)
+        assert (self._project().tasks, self._project().members, self._project(other).tasks) == (1, 1, 1)
+
+        pm.delete()
+        self.membership.delete()
+        assert self._project().members == 0
+        assert self._workspace().members == 1
+        assert counters.reconcile_counters(repair=False) == []
+
+    def test_status_changes_move_tasks_between_buckets(self):
+        self.task.status = Task.StatusChoices.COMPLETED
+        self.task.save()
+        self.task.save()  # unchanged status: no second move
+
+        task = Task.objects.get(pk=self.task.pk)
+        task.status = Task.StatusChoices.IN_PROGRESS
+        task.save()
+
+        counts = self._project()
+        assert (counts.tasks, counts.tasks_pending, counts.tasks_in_progress, counts.tasks_completed) == (1, 0, 1, 0)
+        assert self._workspace().tasks_in_progress == 1
+        assert counters.reconcile_counters(repair=False) == []
+
+    def test_deleting_projects_and_tasks_through_the_api(self):
+        Task.objects.create(project=self.project, title="Docs", created_by=self.owner)
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.owner)}")
+        base = f"/api/workspaces/{self.workspace.id}/projects/{self.project.id}"
+
+        with self.commit():
+            assert api.delete(f"{base}/tasks/{self.task.id}/").status_code == 204
+        assert (self._project().tasks, self._workspace().tasks) == (1, 1)
+
+        with self.commit():
+            assert api.delete(f"{base}/").status_code == 204
+        counts = self._workspace()
+        assert (counts.projects, counts.tasks, counts.tasks_pending) == (0, 0, 0)
+        assert counters.reconcile_counters(repair=False) == []
+
+    def test_reconcile_repairs_drift_and_missing_rows(self):
+        WorkspaceCounters.objects.filter(workspace=self.workspace).update(tasks=7)
+        ProjectCounters.objects.filter(project=self.project).delete()
+
+        drift = counters.reconcile_counters(repair=False)
+        assert ("WorkspaceCounters", self.workspace.id, "tasks", 7, 1) in drift
+        assert ("ProjectCounters", self.project.id, "tasks", None, 1) in drift
+
+        out = StringIO()
+        call_command("reconcile_counters", stdout=out)
+        assert "Repaired" in out.getvalue()
+        assert self._workspace().tasks == 1
+        assert self._project().tasks == 1
+        assert counters.reconcile_counters(repair=False) == []
+
+    def test_missing_row_is_recounted_after_commit(self):
+        ProjectCounters.objects.filter(project=self.project).delete()
+        with self.commit():
+            Task.objects.create(project=self.project, title="Docs", created_by=self.owner)
+        assert self._project().tasks == 2
+
+    def test_batched_writes_each_row_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            with counters.batched():
+                project = Project.objects.create(workspace=self.workspace, title="Web", created_by=self.owner)
+                for title in ("A", "B", "C"):
+                    Task.objects.create(project=project, title=title, created_by=self.owner)
+                ProjectMember.objects.create(project=project, user=self.member, permission="read")
+        writes = [q["sql"] for q in queries.captured_queries if "_counters" in q["sql"]]
+        assert len(writes) == 2  # INSERT of the project's row, UPDATE of the workspace's
+
+        assert (self._project(project).tasks, self._project(project).members) == (3, 1)
+        assert (self._workspace().projects, self._workspace().tasks) == (2, 4)
+        assert counters.reconcile_counters(repair=False) == []
+
+    def test_workspace_created_through_the_api_is_counted(self):
+        api = APIClient()
+        api.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.owner)}")
+        response = api.post("/api/workspaces/", {"name": "New", "template": "agile"}, format="json")
+        assert response.status_code == 201
+        counts = WorkspaceCounters.objects.get(workspace_id=response.data["id"])
+        assert (counts.members, counts.projects, counts.tasks) == (1, 1, 3)
+        assert counters.reconcile_counters([response.data["id"]], repair=False) == []
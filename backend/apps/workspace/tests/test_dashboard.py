@@ -0,0 +1,113 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.notifications.notification_services import NotificationService
+from apps.users.models import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, Task
+from apps.workspace.services import create_comment_service, create_project_service, start_task_service
+from apps.workspace.utils.dashboard import (
+    DASHBOARD_MEMBER_SIZE, dashboard_snapshot_key, get_dashboard_snapshot, load_dashboard_snapshot,
+)
+
+
+@pytest.mark.django_db
+class TestDashboardSnapshots:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self, django_capture_on_commit_callbacks, monkeypatch):
+        cache.clear()
+        monkeypatch.setattr(NotificationService, "send_external_push", staticmethod(lambda **kwargs: None))
+        self.commit = lambda: django_capture_on_commit_callbacks(execute=True)
+
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.guest = User.objects.create_user(email="guest@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.owner, role="owner")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.guest, role="guest")
+        self.project = Project.objects.create(workspace=self.workspace, title="Board", created_by=self.owner)
+        self.task = Task.objects.create(project=self.project, title="Fix", created_by=self.owner, assigned_to=self.owner)
+        self.url = f"/api/workspaces/{self.workspace.id}/dashboard/"
+        self.clients = {}
+
+    def _get(self, user=None):
+        user = user or self.owner
+        client = self.clients.get(user.pk)
+        if client is None:
+            # One token per user, as a real client keeps its token between requests
+            client = self.clients[user.pk] = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+        response = client.get(self.url)
+        assert response.status_code == 200
+        return response.json()
+
+    def _assert_current(self):
+        # The patched snapshot is what a rebuild would load
+        assert cache.get(dashboard_snapshot_key(self.workspace.id)) == load_dashboard_snapshot(self.workspace.id)
+
+    def test_writes_patch_the_snapshot_in_place(self):
+        get_dashboard_snapshot(self.workspace.id)
+        newcomer = User.objects.create_user(email="new@example.com", password="password123")
+
+        with self.commit():
+            create_project_service(self.owner, self.workspace, {"title": "Launch", "visibility": "public"})
+        with self.commit():
+            start_task_service(self.owner, self.task)
+        with self.commit():
+            create_comment_service(self.guest, self.task, "On it")
+        with self.commit():
+            WorkspaceMember.objects.create(workspace=self.workspace, user=newcomer, role="member")
+        with self.commit():
+            self.workspace.name = "Renamed"
+            self.workspace.save()
+        self._assert_current()
+
+        snapshot = cache.get(dashboard_snapshot_key(self.workspace.id))
+        assert snapshot["workspace_name"] == "Renamed"
+        assert snapshot["total_members"] == 3
+        assert snapshot["activities"][0]["action_type"] == "comment"
+
+    def test_member_removal_keeps_the_recent_members_complete(self):
+        for i in range(DASHBOARD_MEMBER_SIZE):
+            user = User.objects.create_user(email=f"member{i}@example.com", password="password123")
+            WorkspaceMember.objects.create(workspace=self.workspace, user=user, role="member")
+        get_dashboard_snapshot(self.workspace.id)
+
+        with self.commit():
+            WorkspaceMember.objects.filter(workspace=self.workspace).order_by("-joined_at").first().delete()
+        assert cache.get(dashboard_snapshot_key(self.workspace.id)) is None
+        assert len(get_dashboard_snapshot(self.workspace.id)["members"]) == DASHBOARD_MEMBER_SIZE
+
+    def test_warm_dashboard_reads_no_tables(self):
+        first = self._get()
+        with CaptureQueriesContext(connection) as queries:
+            assert self._get() == first
+        assert len(queries) == 0
+        assert first["my_tasks"][0]["title"] == "Fix"
+        assert first["total_members"] == 2
+
+    def test_process_local_caches_build_the_dashboard_uncached(self, settings):
+        settings.SHARED_CACHE = None
+        self._get()
+        # A write handled by another worker patches nothing in this one
+        Workspace.objects.filter(id=self.workspace.id).update(name="Renamed")
+        Task.objects.filter(id=self.task.id).update(status="completed")
+
+        data = self._get()
+        assert data["workspace_name"] == "Renamed"
+        assert data["my_tasks"] == []
+        assert cache.get(dashboard_snapshot_key(self.workspace.id)) is None
+
+    def test_overlays_follow_role_visibility(self):
+        assert self._get()["total_projects"] == 1
+        assert self._get(self.guest)["total_projects"] == 0
+        assert self._get(self.guest)["activities"] == self._get()["activities"]
+
+    def test_rebuild_command(self):
+        call_command("rebuild_dashboard_snapshots", stdout=StringIO())
+        self._assert_current()
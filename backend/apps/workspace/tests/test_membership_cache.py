@@ -0,0 +1,54 @@
+import pytest
+from django.core.cache import cache
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember
+from apps.workspace.utils.membership_cache import get_membership_map, load_membership_map
+
+
+@pytest.mark.django_db
+class TestMembershipCache:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.project = Project.objects.create(workspace=self.workspace, title="API", created_by=self.owner)
+        ProjectMember.objects.create(project=self.project, user=self.member, permission="write")
+
+    def test_loads_in_one_query(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            membership = load_membership_map(self.member.id)
+        assert membership.role(self.workspace.id) == "member"
+        assert membership.project_permission(self.project.id) == "write"
+        assert membership.project_ids(self.workspace.id) == [str(self.project.id)]
+
+    def test_owner_without_member_row(self):
+        membership = load_membership_map(self.owner.id)
+        assert membership.is_admin(str(self.workspace.id))
+        assert not membership.is_project_member(self.project.id)
+
+    def test_cached_between_calls(self, django_assert_num_queries):
+        get_membership_map(self.member.id)
+        with django_assert_num_queries(0):
+            assert get_membership_map(self.member.id).is_member(self.workspace.id)
+
+    def test_invalidated_by_member_changes(self):
+        assert get_membership_map(self.member.id).role(self.workspace.id) == "member"
+
+        WorkspaceMember.objects.filter(user=self.member).get().delete()
+        assert not get_membership_map(self.member.id).is_member(self.workspace.id)
+
+        pm = ProjectMember.objects.get(user=self.member)
+        pm.permission = "read"
+        pm.save()
+        assert get_membership_map(self.member.id).project_permission(self.project.id) == "read"
+
+    def test_process_local_caches_load_uncached(self, settings, django_assert_num_queries):
+        # LocMemCache is per worker: a demotion in one would not reach the others
+        settings.SHARED_CACHE = None
+        get_membership_map(self.member.id)
+        with django_assert_num_queries(1):
+            assert get_membership_map(self.member.id).is_member(self.workspace.id)
@@ -0,0 +1,72 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, UserProjectAccess
+from apps.workspace.project_access import rebuild_project_access
+
+
+@pytest.mark.django_db
+class TestUserProjectAccess:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        self.membership = WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+        self.project = Project.objects.create(workspace=self.workspace, title="API", created_by=self.owner)
+        self.other = Project.objects.create(workspace=self.workspace, title="Web", created_by=self.owner)
+
+    def _rows(self, user):
+        return dict(UserProjectAccess.objects.filter(user=user).values_list("project_id", "can_write"))
+
+    def _snapshot(self):
+        return sorted(UserProjectAccess.objects.values_list("user_id", "project_id", "can_write"))
+
+    def test_owner_gets_every_new_project(self):
+        assert self._rows(self.owner) == {self.project.id: True, self.other.id: True}
+        assert self._rows(self.member) == {}
+
+    def test_project_membership(self):
+        pm = ProjectMember.objects.create(project=self.project, user=self.member, permission="read")
+        assert self._rows(self.member) == {self.project.id: False}
+
+        pm.permission = "write"
+        pm.save()
+        assert self._rows(self.member) == {self.project.id: True}
+
+        pm.delete()
+        assert self._rows(self.member) == {}
+
+    def test_role_changes(self):
+        ProjectMember.objects.create(project=self.project, user=self.member, permission="read")
+        self.membership.role = "admin"
+        self.membership.save()
+        assert self._rows(self.member) == {self.project.id: True, self.other.id: True}
+
+        self.membership.role = "member"
+        self.membership.save()
+        assert self._rows(self.member) == {self.project.id: False}
+
+        self.membership.delete()
+        assert self._rows(self.member) == {}
+
+    def test_rebuild_matches_incremental_state(self):
+        ProjectMember.objects.create(project=self.project, user=self.member, permission="write")
+        incremental = self._snapshot()
+
+        UserProjectAccess.objects.all().delete()
+        call_command("rebuild_project_access", stdout=StringIO())
+        assert self._snapshot() == incremental
+
+    def test_cascading_deletes(self):
+        ProjectMember.objects.create(project=self.project, user=self.member)
+        ProjectMember.objects.create(project=self.project, user=self.owner, permission="write")
+        self.project.delete()
+        assert self.project.id not in self._rows(self.owner)
+
+        self.workspace.delete()
+        assert not UserProjectAccess.objects.exists()
+        assert rebuild_project_access() == 0
@@ -0,0 +1,91 @@
+import pytest
+from django.test import RequestFactory
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task, Comment
+from api.serializers.project_serializers import (
+    ProjectListSerializer,
+    ProjectSerializer,
+    PROJECT_MEMBER_PREVIEW_SIZE,
+)
+
+
+@pytest.mark.django_db
+class TestProjectSerializerPlans:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        self.request = RequestFactory().get("/")
+        self.request.user = self.owner
+
+        self.users = [
+            User.objects.create_user(email=f"user{i}@example.com", password="password123")
+            for i in range(PROJECT_MEMBER_PREVIEW_SIZE + 2)
+        ]
+        for user in self.users:
+            WorkspaceMember.objects.create(workspace=self.workspace, user=user, role="member")
+
+    def _add_project(self, title, tasks=3, members=2):
+        project = Project.objects.create(workspace=self.workspace, title=title, created_by=self.owner)
+        ProjectMember.objects.create(project=project, user=self.owner, permission="write")
+        for user in self.users[:members]:
+            ProjectMember.objects.create(project=project, user=user)
+        for i in range(tasks):
+            task = Task.objects.create(
+                project=project,
+                title=f"{title} {i}",
+                created_by=self.owner,
+                status="completed" if i == 0 else "pending",
+            )
+            Comment.objects.create(task=task, author=self.owner, content="hi")
+        return project
+
+    def _list(self):
+        queryset = ProjectListSerializer.setup_queryset(
+            Project.objects.filter(workspace=self.workspace).order_by("title"), self.owner
+        )
+        return ProjectListSerializer(queryset, many=True, context={"request": self.request}).data
+
+    def _detail(self):
+        queryset = ProjectSerializer.setup_queryset(
+            Project.objects.filter(workspace=self.workspace).order_by("title"), self.owner
+        )
+        return ProjectSerializer(queryset, many=True, context={"request": self.request}).data
+
+    def test_list_counts_and_member_preview(self):
+        self._add_project("Big", tasks=4, members=len(self.users))
+
+        data = self._list()[0]
+        assert data["task_count"] == 4
+        assert data["completed_count"] == 1
+        assert data["member_count"] == len(self.users) + 1
+        assert len(data["members"]) == PROJECT_MEMBER_PREVIEW_SIZE
+        assert data["user_permission"]["permission"] == "write"
+        assert "tasks" not in data
+
+    def test_list_query_count_is_constant(self, django_assert_num_queries):
+        self._add_project("A")
+        with django_assert_num_queries(4):
+            self._list()
+
+        for i in range(5):
+            self._add_project(f"B{i}", tasks=5, members=len(self.users))
+        with django_assert_num_queries(4):
+            self._list()
+
+    def test_detail_query_count_is_constant(self, django_assert_num_queries):
+        self._add_project("A")
+        with django_assert_num_queries(4):
+            self._detail()
+
+        for i in range(5):
+            self._add_project(f"B{i}", tasks=5, members=len(self.users))
+        with django_assert_num_queries(4):
+            data = self._detail()
+
+        # Comments are opt-in (?expand=tasks.comments)
+        assert all("comments" not in t for p in data for t in p["tasks"])
+
+        assert all(p["task_count"] == len(p["tasks"]) for p in data)
+        assert all(p["user_permission"]["permission"] == "write" for p in data)
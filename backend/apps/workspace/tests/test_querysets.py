@@ -0,0 +1,68 @@
+import pytest
+from django.db.models import Q
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task, Comment, WorkspaceDocument
+
+
+@pytest.mark.django_db
+class TestAccessibleQuerysets:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.owner = User.objects.create_user(email="owner@example.com", password="password123")
+        self.admin = User.objects.create_user(email="admin@example.com", password="password123")
+        self.member = User.objects.create_user(email="member@example.com", password="password123")
+        self.outsider = User.objects.create_user(email="outsider@example.com", password="password123")
+        self.workspace = Workspace.objects.create(name="Team", owner=self.owner)
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.admin, role="admin")
+        WorkspaceMember.objects.create(workspace=self.workspace, user=self.member, role="member")
+
+        self.public = Project.objects.create(workspace=self.workspace, title="Public", visibility="public", created_by=self.owner)
+        self.private = Project.objects.create(workspace=self.workspace, title="Private", created_by=self.owner)
+        self.shared = Project.objects.create(workspace=self.workspace, title="Shared", created_by=self.owner)
+        ProjectMember.objects.create(project=self.shared, user=self.member)
+        ProjectMember.objects.create(project=self.shared, user=self.admin)
+
+        other = Workspace.objects.create(name="Other", owner=self.member)
+        Project.objects.create(workspace=other, title="Elsewhere", visibility="public", created_by=self.member)
+
+        for project in (self.public, self.private, self.shared):
+            task = Task.objects.create(project=project, title=project.title, created_by=self.owner)
+            Comment.objects.create(task=task, author=self.owner, content="hi")
+
+    def _titles(self, qs, field="title"):
+        return sorted(qs.values_list(field, flat=True))
+
+    def test_projects_match_visibility_rule(self):
+        legacy = Project.objects.filter(workspace=self.workspace).filter(
+            Q(visibility='public') | Q(members__user=self.member)
+        ).distinct()
+        assert self._titles(Project.objects.accessible_to(self.member, self.workspace)) == self._titles(legacy)
+        assert self._titles(Project.objects.accessible_to(self.member, self.workspace)) == ["Public", "Shared"]
+        assert Project.objects.accessible_to(self.owner, self.workspace).count() == 3
+        assert Project.objects.accessible_to(self.admin, self.workspace).count() == 3
+        assert not Project.objects.accessible_to(self.outsider, self.workspace).exists()
+
+    def test_known_role_gives_same_result(self):
+        for user, role in ((self.owner, "owner"), (self.member, "member"), (self.outsider, None)):
+            unknown = self._titles(Project.objects.accessible_to(user, self.workspace))
+            known = self._titles(Project.objects.accessible_to(user, self.workspace, role=role or ""))
+            assert unknown == known
+
+    def test_no_distinct_or_member_join(self):
+        sql = str(Project.objects.accessible_to(self.member, self.workspace).query).upper()
+        assert "DISTINCT" not in sql
+        assert "EXISTS" in sql
+
+    def test_tasks_and_comments(self):
+        assert self._titles(Task.objects.accessible_to(self.member, self.workspace)) == ["Public", "Shared"]
+        comments = Comment.objects.accessible_to(self.member, self.workspace.id, role="member")
+        assert self._titles(comments, "task__title") == ["Public", "Shared"]
+
+    def test_documents(self):
+        WorkspaceDocument.objects.create(workspace=self.workspace, title="Pub", uploaded_by=self.owner)
+        WorkspaceDocument.objects.create(workspace=self.workspace, title="Mine", visibility="private", uploaded_by=self.member)
+        WorkspaceDocument.objects.create(workspace=self.workspace, title="Hidden", visibility="private", uploaded_by=self.owner)
+        assert self._titles(WorkspaceDocument.objects.accessible_to(self.member, self.workspace)) == ["Mine", "Pub"]
+        assert WorkspaceDocument.objects.accessible_to(self.admin, self.workspace).count() == 3
+        assert not WorkspaceDocument.objects.accessible_to(self.outsider, self.workspace).exists()
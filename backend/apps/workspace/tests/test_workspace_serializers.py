@@ -0,0 +1,61 @@
+import pytest
+from django.test import RequestFactory
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember
+from api.serializers.workspace_serializers import (
+    WorkspaceSerializer,
+    WORKSPACE_MEMBER_PREVIEW_SIZE,
+)
+
+
+@pytest.mark.django_db
+class TestWorkspaceSerializerPlan:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.user = User.objects.create_user(email="me@example.com", password="password123")
+        self.other = User.objects.create_user(email="other@example.com", password="password123")
+        self.request = RequestFactory().get("/")
+        self.request.user = self.user
+
+    def _add_workspace(self, name, owner, role=None, members=2):
+        workspace = Workspace.objects.create(name=name, owner=owner)
+        WorkspaceMember.objects.create(workspace=workspace, user=owner, role="owner")
+        if role:
+            WorkspaceMember.objects.create(workspace=workspace, user=self.user, role=role)
+        for i in range(members):
+            user = User.objects.create_user(
+                email=f"{name.lower()}{i}@example.com", password="password123"
+            )
+            WorkspaceMember.objects.create(workspace=workspace, user=user, role="member")
+        return workspace
+
+    def _list(self):
+        queryset = WorkspaceSerializer.setup_queryset(
+            Workspace.objects.accessible_to(self.user).order_by("name"), self.user
+        )
+        return WorkspaceSerializer(queryset, many=True, context={"request": self.request}).data
+
+    def test_role_count_and_member_preview(self):
+        self._add_workspace("Mine", self.user)
+        self._add_workspace("Theirs", self.other, role="admin", members=WORKSPACE_MEMBER_PREVIEW_SIZE + 3)
+        self._add_workspace("Hidden", self.other)
+
+        mine, theirs = self._list()
+        assert (mine["name"], mine["user_role"], mine["member_count"]) == ("Mine", "owner", 3)
+        assert (theirs["name"], theirs["user_role"]) == ("Theirs", "admin")
+        assert theirs["member_count"] == WORKSPACE_MEMBER_PREVIEW_SIZE + 5
+        assert len(theirs["members"]) == WORKSPACE_MEMBER_PREVIEW_SIZE
+
+    def test_list_query_count_is_constant(self, django_assert_num_queries):
+        self._add_workspace("A", self.user)
+        with django_assert_num_queries(3):
+            self._list()
+
+        for i in range(5):
+            self._add_workspace(f"B{i}", self.other, role="member", members=8)
+        with django_assert_num_queries(3):
+            data = self._list()
+
+        assert len(data) == 6
+        assert all(w["user_role"] == "member" for w in data if w["name"] != "A")
@@ -0,0 +1,157 @@
+# utils/activity.py
+"""
+Batched ActivityLog writes.
+
+log_activity() queues an event instead of inserting it. The events of a
+transaction are deduplicated by (workspace, action, target, actor) and
+written with one bulk_create once it commits; a rolled back transaction or
+savepoint drops the events queued in it. Outside a transaction an event is
+written straight away.
+
+Events logged with fallback=True (the model signals, covering writes that
+bypass the services) are dropped when the same transaction also logs the
+action on the target explicitly, e.g. complete_task_service.
+
+bulk_create sends no post_save, so a flush applies what the ActivityLog
+receivers in signals.py do (dashboard snapshot, workspace version) once per
+batch. With ACTIVITY_LOG_ASYNC the flush runs on a background thread instead
+of delaying the response.
+"""
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.workspace.models import ActivityLog
+from apps.workspace.utils import dashboard
+from apps.workspace.utils.versions import bump_workspace_versions
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_LOG_ASYNC = getattr(settings, "ACTIVITY_LOG_ASYNC", False)
+
+_local = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class _Batch:
+    """The events of one transaction; see log_activity."""
+
+    def __init__(self):
+        self.events = []
+        # Weak references to the batch's _Commit hooks, in registration order.
+        # Only on_commit holds the hooks, so a rolled back savepoint's hooks
+        # are freed with it and their references go dead.
+        self.hooks = []
+
+    def pending(self, start=0) -> bool:
+        return any(hook() is not None for hook in self.hooks[start:])
+
+
+class _Commit:
+    """The on_commit hook of one event: stages it, and the batch's last hook flushes."""
+
+    def __init__(self, batch, event):
+        self.batch = batch
+        self.event = event
+        self.position = len(batch.hooks)
+
+    def __call__(self):
+        batch = self.batch
+        batch.events.append(self.event)
+        if batch.pending(self.position + 1):
+            return  # a later event's hook will flush
+        if getattr(_local, "batch", None) is batch:
+            _local.batch = None
+        events, batch.events = batch.events, []
+        _dispatch(events)
+
+
+def _dedupe(events) -> list:
+    explicit = {(e["action_type"], e["target_id"]) for e in events if not e["fallback"]}
+    seen = set()
+    unique = []
+    for event in events:
+        if event["fallback"] and (event["action_type"], event["target_id"]) in explicit:
+            continue
+        key = (event["workspace_id"], event["action_type"], event["target_id"], event["actor_id"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(event)
+    return unique
+
+
+def _write(events):
+    logs = ActivityLog.objects.bulk_create([
+        ActivityLog(
+            workspace_id=e["workspace_id"],
+            actor_id=e["actor_id"],
+            action_type=e["action_type"],
+            target_id=e["target_id"],
+            target_text=e["target_text"],
+        )
+        for e in _dedupe(events)
+    ])
+    if logs:
+        dashboard.record_activities(logs)
+        bump_workspace_versions({log.workspace_id for log in logs})
+    return logs
+
+
+def _write_in_background(events):
+    try:
+        _write(events)
+    except Exception:
+        logger.exception("Failed to write %d activity log rows", len(events))
+    finally:
+        connection.close()
+
+
+def _dispatch(events):
+    global _executor
+    if not events:
+        return
+    if not ACTIVITY_LOG_ASYNC:
+        _write(events)
+        return
+    with _executor_lock:
+        if _executor is None:
+            # One worker, so batches are written in commit order
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="activity-log")
+    _executor.submit(_write_in_background, events)
+
+
+def _current_batch() -> _Batch:
+    batch = getattr(_local, "batch", None)
+    # A batch without pending hooks was flushed or rolled back
+    if batch is None or not batch.pending():
+        batch = _local.batch = _Batch()
+    return batch
+
+
+def log_activity(workspace_id, actor_id, action_type, target_id=None, target_text="", fallback=False):
+    """Queues an ActivityLog row for the current transaction (see the module docstring)."""
+    if actor_id is None:
+        return  # e.g. a task whose creator was deleted; ActivityLog needs an actor
+    event = {
+        "workspace_id": workspace_id,
+        "actor_id": actor_id,
+        "action_type": action_type,
+        "target_id": target_id,
+        "target_text": target_text[:200],
+        "fallback": fallback,
+    }
+    if not connection.in_atomic_block:
+        _dispatch([event])
+        return
+
+    batch = _current_batch()
+    # A rolled back savepoint drops its events' hooks, and the last hook to
+    # run writes what the others staged
+    hook = _Commit(batch, event)
+    batch.hooks.append(weakref.ref(hook))
+    transaction.on_commit(hook)
@@ -0,0 +1,179 @@
+# utils/dashboard.py
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.workspace.models import Workspace, WorkspaceMember, ActivityLog
+from apps.workspace.counters import get_workspace_counters
+from apps.workspace.utils.shared_cache import is_cache_shared
+
+# Seconds a dashboard snapshot stays cached; also bounds how long an update
+# lost to a concurrent writer can show
+DASHBOARD_SNAPSHOT_TIMEOUT = getattr(settings, "DASHBOARD_SNAPSHOT_TIMEOUT", 3600)
+
+
+def dashboard_cache_enabled() -> bool:
+    """
+    Whether snapshots and overlays are cached. Writes patch the snapshot and
+    bump the overlay's version in this process's cache only, so on a
+    process-local backend (see is_cache_shared) the dashboard is built uncached.
+    """
+    return bool(DASHBOARD_SNAPSHOT_TIMEOUT) and is_cache_shared()
+
+DASHBOARD_ACTIVITY_SIZE = 10
+DASHBOARD_MEMBER_SIZE = 5
+
+
+def dashboard_snapshot_key(workspace_id) -> str:
+    return f"ws_dashboard:{workspace_id}"
+
+
+def dashboard_overlay_key(workspace_id, user_id, version) -> str:
+    return f"ws_dashboard:{workspace_id}:{user_id}:{version}"
+
+
+def _row(instance) -> dict:
+    # Concrete columns only, so the row pickles small and rebuilds the instance
+    return {field.attname: getattr(instance, field.attname) for field in instance._meta.concrete_fields}
+
+
+def _rows(queryset) -> list:
+    return list(queryset.values(*(field.attname for field in queryset.model._meta.concrete_fields)))
+
+
+def _header(workspace) -> dict:
+    return {
+        "workspace_name": workspace.name,
+        "workspace_logo": workspace.logo.url if workspace.logo else None,
+        "workspace_description": workspace.description,
+    }
+
+
+def load_dashboard_snapshot(workspace_id) -> Optional[dict]:
+    """
+    The part of a workspace's dashboard that is the same for every member:
+    its header, member count, recent activity and recent members (as column
+    dicts, see activities() / members()). None when the workspace is gone.
+    """
+    workspace = Workspace.objects.filter(id=workspace_id).first()
+    if workspace is None:
+        return None
+    members = WorkspaceMember.objects.filter(workspace_id=workspace.id)
+    return {
+        **_header(workspace),
+        "total_members": get_workspace_counters(workspace.id).members,
+        "activities": _rows(
+            ActivityLog.objects.filter(workspace_id=workspace.id).order_by("-created_at")[:DASHBOARD_ACTIVITY_SIZE]
+        ),
+        "members": _rows(members.order_by("-joined_at")[:DASHBOARD_MEMBER_SIZE]),
+    }
+
+
+def get_dashboard_snapshot(workspace_id) -> Optional[dict]:
+    """
+    Returns the cached snapshot of workspace_id, loading it on a miss.
+    Writes keep it current in place (record_* below) rather than dropping it.
+    """
+    if not dashboard_cache_enabled():
+        return load_dashboard_snapshot(workspace_id)
+    key = dashboard_snapshot_key(workspace_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = load_dashboard_snapshot(workspace_id)
+        if snapshot is not None:
+            cache.set(key, snapshot, timeout=DASHBOARD_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def activities(snapshot) -> list:
+    return [ActivityLog(**row) for row in snapshot["activities"]]
+
+
+def members(snapshot) -> list:
+    return [WorkspaceMember(**row) for row in snapshot["members"]]
+
+
+def rebuild_dashboard_snapshots(workspace_ids: Optional[Iterable] = None) -> int:
+    """Reloads the snapshots of `workspace_ids` (all workspaces by default), e.g. after a cache flush."""
+    if workspace_ids is None:
+        workspace_ids = Workspace.objects.values_list("id", flat=True).iterator()
+    count = 0
+    for workspace_id in workspace_ids:
+        snapshot = load_dashboard_snapshot(workspace_id)
+        if snapshot is None:
+            continue
+        cache.set(dashboard_snapshot_key(workspace_id), snapshot, timeout=DASHBOARD_SNAPSHOT_TIMEOUT)
+        count += 1
+    return count
+
+
+# --- Incremental maintenance ---
+# Applied after commit to the cached snapshot, if any: a missing snapshot is
+# loaded whole by the next read.
+
+def _update(workspace_id, apply):
+    def update():
+        key = dashboard_snapshot_key(workspace_id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            return
+        if apply(snapshot) is False:
+            cache.delete(key)  # can't be patched, e.g. a recent member left
+        else:
+            cache.set(key, snapshot, timeout=DASHBOARD_SNAPSHOT_TIMEOUT)
+
+    if dashboard_cache_enabled():
+        transaction.on_commit(update)
+
+
+def record_activity(activity):
+    record_activities([activity])
+
+
+def record_activities(activities: Iterable):
+    """Prepends `activities` (oldest first, e.g. one bulk insert) to their workspaces' snapshots."""
+    rows = defaultdict(list)
+    for activity in activities:
+        rows[activity.workspace_id].append(_row(activity))
+
+    for workspace_id, new_rows in rows.items():
+        def apply(snapshot, new_rows=new_rows):
+            snapshot["activities"] = [*reversed(new_rows), *snapshot["activities"]][:DASHBOARD_ACTIVITY_SIZE]
+        _update(workspace_id, apply)
+
+
+def record_member_saved(member, created):
+    row = _row(member)
+
+    def apply(snapshot):
+        rows = snapshot["members"]
+        if created:
+            snapshot["total_members"] += 1
+            snapshot["members"] = [row, *rows][:DASHBOARD_MEMBER_SIZE]
+        else:
+            snapshot["members"] = [row if r["id"] == row["id"] else r for r in rows]
+    _update(member.workspace_id, apply)
+
+
+def record_member_removed(member):
+    member_id = member.pk  # reset to None once the delete completes
+
+    def apply(snapshot):
+        rows = [r for r in snapshot["members"] if r["id"] != member_id]
+        snapshot["total_members"] -= 1
+        if len(rows) < len(snapshot["members"]) and snapshot["total_members"] > len(rows):
+            return False  # the next most recent member isn't in the snapshot
+        snapshot["members"] = rows
+    _update(member.workspace_id, apply)
+
+
+def record_workspace_saved(workspace):
+    header = _header(workspace)
+    _update(workspace.pk, lambda snapshot: snapshot.update(header))
+
+
+def drop_dashboard_snapshot(workspace_id):
+    cache.delete(dashboard_snapshot_key(workspace_id))
@@ -0,0 +1,153 @@
+# utils/membership_cache.py
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast
+
+from apps.workspace.models import Workspace, WorkspaceMember, ProjectMember
+from apps.workspace.models.project import ADMIN_ROLES
+from apps.workspace.utils.shared_cache import is_cache_shared
+
+# Seconds a membership map stays cached; 0 disables the cache. Invalidation
+# only reaches other processes through a shared cache, so on a process-local
+# backend (see is_cache_shared) maps are loaded uncached on every request.
+WORKSPACE_MEMBERSHIP_CACHE_TIMEOUT = getattr(settings, "WORKSPACE_MEMBERSHIP_CACHE_TIMEOUT", 300)
+
+
+def membership_version_key(user_id) -> str:
+    return f"ws_membership_version:{user_id}"
+
+
+def membership_cache_key(user_id, version) -> str:
+    return f"ws_membership:{user_id}:{version}"
+
+
+class MembershipMap:
+    """
+    Everything a user belongs to:
+    - workspaces: {workspace_id: role}
+    - projects: {project_id: (workspace_id, permission)}
+    Ids are strings so lookups work with both UUIDs and URL kwargs.
+    """
+
+    def __init__(self, workspaces: Dict[str, str], projects: Dict[str, Tuple[str, str]]):
+        self.workspaces = workspaces
+        self.projects = projects
+
+    def role(self, workspace_id) -> Optional[str]:
+        return self.workspaces.get(str(workspace_id))
+
+    def is_member(self, workspace_id) -> bool:
+        return str(workspace_id) in self.workspaces
+
+    def is_admin(self, workspace_id) -> bool:
+        return self.role(workspace_id) in ADMIN_ROLES
+
+    def project_permission(self, project_id) -> Optional[str]:
+        entry = self.projects.get(str(project_id))
+        return entry[1] if entry else None
+
+    def is_project_member(self, project_id) -> bool:
+        return str(project_id) in self.projects
+
+    def project_ids(self, workspace_id=None) -> list:
+        if workspace_id is None:
+            return list(self.projects)
+        workspace_id = str(workspace_id)
+        return [pid for pid, (ws_id, _) in self.projects.items() if ws_id == workspace_id]
+
+
+EMPTY_MEMBERSHIP = MembershipMap({}, {})
+
+
+def load_membership_map(user_id) -> MembershipMap:
+    """Loads workspace roles and project permissions for user_id in a single UNION query."""
+    text = CharField()
+    owned = Workspace.objects.filter(owner_id=user_id).order_by().values_list(
+        Value('workspace', output_field=text),
+        Cast('id', text),
+        Value('', output_field=text),
+        Value('owner', output_field=text),
+    )
+    workspaces = WorkspaceMember.objects.filter(user_id=user_id).order_by().values_list(
+        Value('workspace', output_field=text),
+        Cast('workspace_id', text),
+        Value('', output_field=text),
+        F('role'),
+    )
+    projects = ProjectMember.objects.filter(user_id=user_id).order_by().values_list(
+        Value('project', output_field=text),
+        Cast('project__workspace_id', text),
+        Cast('project_id', text),
+        F('permission'),
+    )
+
+    workspace_roles, project_permissions = {}, {}
+    for kind, workspace_id, project_id, value in owned.union(workspaces, projects, all=True).order_by():
+        workspace_id = _normalize_id(workspace_id)
+        if kind == 'project':
+            project_permissions[_normalize_id(project_id)] = (workspace_id, value)
+        elif workspace_roles.get(workspace_id) != 'owner':
+            workspace_roles[workspace_id] = value
+    return MembershipMap(workspace_roles, project_permissions)
+
+
+def _normalize_id(value) -> str:
+    # SQLite stores UUIDs as 32-char hex, Postgres casts them to the dashed form
+    value = str(value)
+    if len(value) == 32:
+        value = f"{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}"
+    return value
+
+
+def get_membership_map(user_id) -> MembershipMap:
+    """
+    Returns the cached MembershipMap for user_id.
+    Maps are keyed by a per-user version, so a map loaded concurrently with an
+    invalidation is written under the old version and never read again.
+    Without a shared cache a removed or demoted member would keep their rights
+    in the other workers until the timeout, so the map is loaded uncached.
+    """
+    if not user_id:
+        return EMPTY_MEMBERSHIP
+    if not WORKSPACE_MEMBERSHIP_CACHE_TIMEOUT or not is_cache_shared():
+        return load_membership_map(user_id)
+
+    version_key = membership_version_key(user_id)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), timeout=None)
+        version = cache.get(version_key)
+
+    key = membership_cache_key(user_id, version)
+    cached = cache.get(key)
+    if cached is not None:
+        return MembershipMap(*cached)
+
+    membership = load_membership_map(user_id)
+    cache.set(key, (membership.workspaces, membership.projects), timeout=WORKSPACE_MEMBERSHIP_CACHE_TIMEOUT)
+    return membership
+
+
+def invalidate_membership_cache(user_ids: Iterable):
+    """Moves each user to a new version; their old maps expire unread."""
+    version = time.time_ns()
+    cache.set_many({membership_version_key(uid): version for uid in user_ids if uid}, timeout=None)
+
+
+def get_request_membership(request) -> MembershipMap:
+    """
+    Returns the membership map of the request's user, resolved once per request.
+    WorkspaceEnforcementMiddleware sets request.workspace_membership; other
+    callers fall back to loading it for request.user.
+    """
+    membership = getattr(request, 'workspace_membership', None)
+    if membership is None:
+        user = getattr(request, 'user', None)
+        user_id = user.pk if (user is not None and user.is_authenticated) else None
+        membership = get_membership_map(user_id)
+        request.workspace_membership = membership
+    return membership
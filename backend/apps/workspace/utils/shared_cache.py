@@ -0,0 +1,27 @@
+# utils/shared_cache.py
+"""
+Whether the default cache is shared by every server process.
+
+Version keys are invalidated by writing to the cache. With a process-local
+backend (LocMemCache) only the process that handled the write sees it, so
+under several workers the others keep answering from what it replaced.
+Features that depend on such invalidation check is_cache_shared() and skip
+the cache when it is False. DummyCache stores nothing, so it counts as not
+shared either.
+
+SHARED_CACHE overrides the detection: True for a single-process server on
+LocMemCache (runserver, the test runner), False to opt out.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_cache_shared(alias="default") -> bool:
+    shared = getattr(settings, "SHARED_CACHE", None)
+    if shared is not None:
+        return bool(shared)
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
@@ -0,0 +1,63 @@
+# utils/versions.py
+import time
+import uuid
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _canonical(value) -> str:
+    # URL kwargs and model ids must name the same key
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        return str(value)
+
+
+def workspace_version_key(workspace_id) -> str:
+    return f"ws_version:{_canonical(workspace_id)}"
+
+
+def user_version_key(user_id) -> str:
+    return f"user_version:{_canonical(user_id)}"
+
+
+def get_versions(keys) -> list:
+    """
+    Current versions of `keys` (workspace_version_key / user_version_key), in
+    order, from a single cache round trip. A version is the clock time (ns) of
+    the last change, so it only moves forward: a key that was evicted comes
+    back newer than any value a client may still hold.
+    """
+    keys = list(keys)
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def _bump(keys):
+    version = time.time_ns()
+    cache.set_many({key: version for key in keys}, timeout=None)
+
+
+def bump_workspace_versions(workspace_ids: Iterable):
+    """
+    Moves each workspace to a new version once the current transaction
+    commits, so a reader never pairs the new version with the old rows.
+    """
+    keys = {workspace_version_key(wid) for wid in workspace_ids if wid}
+    if keys:
+        transaction.on_commit(lambda: _bump(keys))
+
+
+def bump_user_versions(user_ids: Iterable):
+    """Per-user counterpart of bump_workspace_versions (notifications, settings)."""
+    keys = {user_version_key(uid) for uid in user_ids if uid}
+    if keys:
+        transaction.on_commit(lambda: _bump(keys))
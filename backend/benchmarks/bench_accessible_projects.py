@@ -0,0 +1,88 @@
+"""
+Accessible-project filtering on a synthetic workspace: the old join + DISTINCT rule
+against Project.objects.accessible_to (correlated EXISTS).
+
+Not collected by the default test run; run explicitly from backend/:
+
+    pytest benchmarks/bench_accessible_projects.py -s
+
+BENCH_PROJECTS / BENCH_MEMBERS size the workspace (defaults 10000 / 200).
+"""
+import os
+import random
+import time
+
+import pytest
+from django.db.models import Q
+
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, WorkspaceMember, Project, ProjectMember, Task
+from apps.workspace.project_access import rebuild_project_access
+
+PROJECTS = int(os.environ.get("BENCH_PROJECTS", 10000))
+MEMBERS = int(os.environ.get("BENCH_MEMBERS", 200))
+REPEAT = 5
+
+
+def _best_ms(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+@pytest.mark.django_db
+def test_bench_accessible_projects():
+    rng = random.Random(42)
+    owner = User.objects.create_user(email="bench-owner@example.com", password="password123")
+    users = User.objects.bulk_create(
+        [User(email=f"bench-{i}@example.com") for i in range(MEMBERS)]
+    )
+    workspace = Workspace.objects.create(name="Bench", owner=owner)
+    WorkspaceMember.objects.bulk_create(
+        [WorkspaceMember(workspace=workspace, user=u, role="member") for u in users]
+    )
+    projects = Project.objects.bulk_create([
+        Project(workspace=workspace, title=f"P{i}", visibility=rng.choice(["public", "private"]), created_by=owner)
+        for i in range(PROJECTS)
+    ])
+    # Each member collaborates on ~5% of the projects
+    ProjectMember.objects.bulk_create([
+        ProjectMember(project=p, user=u)
+        for p in projects for u in rng.sample(users, max(1, MEMBERS // 20))
+    ])
+    Task.objects.bulk_create([Task(project=p, title="T", created_by=owner) for p in projects])
+    # bulk_create skips the signals that maintain UserProjectAccess
+    rebuild_project_access([workspace.id])
+
+    user = users[0]
+
+    def legacy_projects():
+        return list(Project.objects.filter(workspace=workspace).filter(
+            Q(visibility='public') | Q(members__user=user)
+        ).distinct().values_list("id", flat=True))
+
+    def exists_projects():
+        return list(Project.objects.accessible_to(user, workspace).values_list("id", flat=True))
+
+    def legacy_task_count():
+        accessible = Project.objects.filter(workspace=workspace).filter(
+            Q(visibility='public') | Q(members__user=user)
+        ).distinct()
+        return Task.objects.filter(project__in=accessible).count()
+
+    def exists_task_count():
+        return Task.objects.accessible_to(user, workspace, role="member").count()
+
+    assert sorted(legacy_projects()) == sorted(exists_projects())
+    assert legacy_task_count() == exists_task_count()
+
+    print(f"\n{PROJECTS} projects, {MEMBERS} members")
+    for name, before, after in (
+        ("project list", legacy_projects, exists_projects),
+        ("task count", legacy_task_count, exists_task_count),
+    ):
+        b, a = _best_ms(before), _best_ms(after)
+        print(f"{name}: join+DISTINCT {b:.1f}ms, EXISTS {a:.1f}ms ({b / a:.1f}x)")
@@ -0,0 +1,57 @@
+"""
+Per-request JWT authentication overhead, before and after the verified-token cache.
+
+Not collected by the default test run; run explicitly from backend/:
+
+    pytest benchmarks/bench_auth.py -s
+"""
+import time
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.models.user import User
+from middleware.authentication import authenticate_request, verified_tokens
+
+ITERATIONS = 2000
+
+
+def _per_request_us(fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn()
+    return (time.perf_counter() - start) / ITERATIONS * 1e6
+
+
+@pytest.mark.django_db
+def test_bench_request_authentication():
+    cache.clear()
+    verified_tokens.clear()
+    user = User.objects.create_user(email="bench@example.com", password="password123")
+    token = str(AccessToken.for_user(user))
+    factory = RequestFactory()
+
+    def make_request():
+        return factory.get("/api/projects/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def baseline():
+        # Before: the middleware and DRF each verified the token and loaded the user
+        request = make_request()
+        auth = JWTAuthentication()
+        auth.get_user(auth.get_validated_token(token))
+        auth.authenticate(Request(request))
+
+    def cached():
+        request = make_request()
+        authenticate_request(request)
+
+    before = _per_request_us(baseline)
+    after = _per_request_us(cached)
+    print(f"\nJWT auth per request: before {before:.1f}us, after {after:.1f}us "
+          f"({before / after:.1f}x)")
+    assert after < before
@@ -0,0 +1,89 @@
+"""
+Rows per second through TaskSerializer and NotificationSerializer, as a
+ModelSerializer over instances against their compiled values() plans, and the
+JSON encoding of the result with DRF's JSONRenderer against ORJSONRenderer.
+
+Not collected by the default test run; run explicitly from backend/:
+
+    pytest benchmarks/bench_values_serializers.py -s
+
+BENCH_ROWS sizes each list (default 2000).
+"""
+import os
+import time
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.renderers import ORJSONRenderer
+from api.serializers.notification_serializers import NotificationSerializer
+from api.serializers.project_serializers import TaskSerializer
+from api.serializers.values import get_values_plan
+from apps.notifications.models import Notification
+from apps.users.models.user import User
+from apps.workspace.models import Workspace, Project, Task
+
+ROWS = int(os.environ.get("BENCH_ROWS", 2000))
+REPEAT = 5
+
+
+def _best_ms(fn):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+@pytest.mark.django_db
+def test_bench_values_serializers():
+    owner = User.objects.create_user(email="bench-owner@example.com", password="password123")
+    member = User.objects.create_user(email="bench-member@example.com", password="password123")
+    workspace = Workspace.objects.create(name="Bench", owner=owner)
+    project = Project.objects.create(workspace=workspace, title="Bench", created_by=owner)
+    Task.objects.bulk_create([
+        Task(project=project, title=f"T{i}", created_by=owner, assigned_to=member if i % 2 else None)
+        for i in range(ROWS)
+    ])
+    project_type = ContentType.objects.get_for_model(Project)
+    Notification.objects.bulk_create([
+        Notification(
+            recipient=member, actor=owner, content_type=project_type, object_id=project.id,
+            title=f"N{i}", message="Bench",
+        )
+        for i in range(ROWS)
+    ])
+
+    request = Request(APIRequestFactory().get("/"))
+    request.user = owner
+    context = {"request": request}
+
+    print(f"\n{ROWS} rows")
+    for serializer_class, queryset in (
+        (TaskSerializer, Task.objects.select_related("assigned_to__profile", "started_by__profile")),
+        (NotificationSerializer, Notification.objects.select_related("actor__profile", "content_type")),
+    ):
+        plan = get_values_plan(serializer_class(context=context))
+        queryset = queryset.order_by("-created_at", "-id")
+
+        def serializer():
+            # .all(): a fresh queryset per run, not the previous run's result cache
+            return serializer_class(queryset.all(), many=True, context=context).data
+
+        def values():
+            return plan.render(plan.values(queryset))
+
+        assert values() == serializer()
+        b, a = _best_ms(serializer), _best_ms(values)
+        print(
+            f"{serializer_class.__name__}: serializer {ROWS / b * 1000:,.0f} rows/s, "
+            f"values plan {ROWS / a * 1000:,.0f} rows/s ({b / a:.1f}x)"
+        )
+
+        data = values()
+        b, a = _best_ms(lambda: JSONRenderer().render(data)), _best_ms(lambda: ORJSONRenderer().render(data))
+        print(f"  render: JSONRenderer {b:.1f}ms, ORJSONRenderer {a:.1f}ms ({b / a:.1f}x)")
@@ -0,0 +1,304 @@
+"""
+Request-scoped JWT authentication shared by JWTAuthenticationMiddleware and DRF.
+
+The middleware decodes the token and loads the user once per request and stores
+the result on the request. CachedJWTAuthentication (the DRF authentication class)
+reuses that result when DRF sees the same token, so a request costs one decode
+and at most one user lookup. Users are loaded through the user cache
+(apps.users.utils.user_cache), which is invalidated when a user is saved or deleted.
+
+Token verification and user loading are separate steps: get_request_token only
+verifies the token, and get_request_user_id reads the user id from its claims, so
+middleware stages that only need an id never touch the database.
+
+Verified tokens are kept in a bounded, TTL-aware LRU (VerifiedTokenCache), so hot
+tokens skip signature verification and claim parsing. Revoked tokens are recorded
+in RevokedToken and checked on every request, LRU hit or not: with a shared cache
+the answer for a token is cached and fetched in the same round trip as the user,
+otherwise it is evaluated in the user query.
+"""
+import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from django.core.cache import cache
+from django.db.models import Exists
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.users.models import RevokedToken
+from apps.users.utils.user_cache import get_cached_user_with
+from apps.workspace.utils.shared_cache import is_cache_shared
+from .config import JWT_CACHE_SIZE, JWT_CACHE_TTL
+
+
+class RequestToken(NamedTuple):
+    raw_token: str
+    validated_token: object
+
+    @property
+    def user_id(self) -> Optional[str]:
+        user_id = self.validated_token.get(api_settings.USER_ID_CLAIM)
+        return str(user_id) if user_id is not None else None
+
+
+class RequestAuthResult(NamedTuple):
+    raw_token: str
+    validated_token: object
+    user: object
+
+
+def get_raw_token_from_request(request) -> Optional[str]:
+    """Extracts the JWT from the Bearer header, or the session / access cookies."""
+    auth_header = request.headers.get('Authorization') or request.META.get('HTTP_AUTHORIZATION')
+    if auth_header and auth_header.startswith('Bearer '):
+        return auth_header.split(' ')[1]
+    if 'session_access_token' in request.COOKIES:
+        return request.COOKIES.get('session_access_token')
+    if 'access_token' in request.COOKIES:
+        return request.COOKIES.get('access_token')
+    return None
+
+
+class VerifiedTokenCache:
+    """
+    Process-local LRU mapping sha256(raw token) to its validated token.
+    Entries expire at the token's `exp` claim or after `ttl` seconds, whichever
+    comes first, so signing key rotation propagates within `ttl`. Revocation is
+    checked per request in get_user, hit or miss.
+    """
+
+    def __init__(self, max_size: int = JWT_CACHE_SIZE, ttl: int = JWT_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(raw_token) -> bytes:
+        if isinstance(raw_token, str):
+            raw_token = raw_token.encode()
+        return hashlib.sha256(raw_token).digest()
+
+    def get(self, raw_token):
+        if not self.max_size:
+            return None
+        key = self.digest(raw_token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            validated_token, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return validated_token
+
+    def put(self, raw_token, validated_token):
+        if not self.max_size:
+            return
+        expires_at = time.time() + self.ttl
+        exp = validated_token.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        key = self.digest(raw_token)
+        with self._lock:
+            self._entries[key] = (validated_token, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, raw_token):
+        with self._lock:
+            self._entries.pop(self.digest(raw_token), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
+def revoked_token_key(jti) -> str:
+    return f"jwt_revoked:{jti}"
+
+
+def _seconds_left(validated_token) -> int:
+    return max(1, int(float(validated_token.get("exp", time.time() + JWT_CACHE_TTL)) - time.time()))
+
+
+def revoke_token(validated_token, raw_token=None):
+    """
+    Revokes a token until it expires, by recording it in RevokedToken; every
+    process rejects it on its next request. A shared cache also gets the answer
+    for its jti, and the local verified-token entry is dropped immediately.
+    LogoutView calls it for the request's access token.
+    """
+    jti = validated_token.get(api_settings.JTI_CLAIM)
+    if jti is None:
+        return
+    timeout = _seconds_left(validated_token)
+    RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    RevokedToken.objects.get_or_create(
+        jti=jti, defaults={"expires_at": timezone.now() + datetime.timedelta(seconds=timeout)}
+    )
+    if is_cache_shared():
+        cache.set(revoked_token_key(jti), True, timeout=timeout)
+    if raw_token is not None:
+        verified_tokens.discard(raw_token)
+
+
+def _is_revoked(jti, validated_token, found) -> bool:
+    """
+    Whether jti has a RevokedToken row: from the cache, else from the user query
+    when the user was loaded, else from its own query. A shared cache then keeps
+    the answer until the token expires; add() never overwrites a revocation
+    written meanwhile.
+    """
+    key = revoked_token_key(jti)
+    if key in found:
+        return bool(found[key])
+    revoked = found.get("token_revoked")
+    if revoked is None:
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+    if is_cache_shared():
+        cache.add(key, revoked, timeout=_seconds_left(validated_token))
+    return revoked
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    SimpleJWT authentication that reuses the result already computed for this
+    request by JWTAuthenticationMiddleware, and loads users through the user cache.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        django_request = getattr(request, '_request', request)
+        result = getattr(django_request, '_jwt_auth', None)
+        raw_token = raw_token.decode() if isinstance(raw_token, bytes) else raw_token
+        if result is None or result.raw_token != raw_token:
+            token = getattr(django_request, '_jwt_token', None)
+            if token and token.raw_token == raw_token:
+                validated_token = token.validated_token
+            else:
+                validated_token = self.get_validated_token(raw_token)
+            result = RequestAuthResult(raw_token, validated_token, self.get_user(validated_token))
+            django_request._jwt_auth = result
+
+        return result.user, result.validated_token
+
+    def get_validated_token(self, raw_token):
+        """Returns the cached verification of a raw token, verifying it on a miss."""
+        validated_token = verified_tokens.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            verified_tokens.put(raw_token, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token):
+        """
+        Same checks as JWTAuthentication.get_user, with a cached user lookup and a
+        revocation check sharing its cache round trip or its query.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        extra_keys, annotations = (), None
+        if jti:
+            extra_keys = [revoked_token_key(jti)] if is_cache_shared() else ()
+            annotations = {"token_revoked": Exists(RevokedToken.objects.filter(jti=jti))}
+        try:
+            user, found = get_cached_user_with(user_id, extra_keys=extra_keys, annotations=annotations)
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+
+        if jti and _is_revoked(jti, validated_token, found):
+            raise InvalidToken(_("Token has been revoked"))
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+def get_request_token(request) -> Optional[RequestToken]:
+    """
+    Verifies the request's JWT without loading the user, memoized on the request.
+    Returns None when there is no token or it is invalid.
+    """
+    token = getattr(request, '_jwt_token', False)
+    if token is not False:
+        return token
+
+    token = None
+    raw_token = get_raw_token_from_request(request)
+    if raw_token:
+        try:
+            token = RequestToken(raw_token, CachedJWTAuthentication().get_validated_token(raw_token))
+        except Exception:
+            token = None
+    request._jwt_token = token
+    return token
+
+
+def get_request_user_id(request) -> Optional[str]:
+    """
+    Returns the authenticated user id for the request: the JWT user id claim when a
+    valid token is present, else the id of an already authenticated request.user.
+    """
+    token = get_request_token(request)
+    if token is not None:
+        return token.user_id
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return str(user.pk)
+    return None
+
+
+def authenticate_request(request) -> Optional[RequestAuthResult]:
+    """
+    Authenticates the request's JWT once and memoizes the result on the request.
+    Returns None when there is no token or it is invalid.
+    """
+    result = getattr(request, '_jwt_auth', None)
+    if result is not None:
+        return result
+
+    token = get_request_token(request)
+    if token is None:
+        return None
+
+    try:
+        user = CachedJWTAuthentication().get_user(token.validated_token)
+    except Exception:
+        # Let DRF handle invalid token responses if view is protected
+        return None
+
+    request._jwt_auth = RequestAuthResult(token.raw_token, token.validated_token, user)
+    return request._jwt_auth
@@ -17,6 +17,22 @@ RATE_LIMIT_WORKSPACE = getattr(settings, "MIDDLEWARE_RATE_LIMIT_WORKSPACE", "300
 # Throttling / Burst Limit (e.g., max 15 requests in a 1-second burst window)
 THROTTLE_BURST_LIMIT = getattr(settings, "MIDDLEWARE_THROTTLE_BURST_LIMIT", "15/second")
 
+# Limiter engine evaluating all limits of a request in one atomic step:
+# "auto" (pick from the cache backend), "redis", "local", "cache" (legacy fixed window)
+# or a dotted path to a BaseLimiterEngine subclass.
+RATE_LIMIT_ENGINE = getattr(settings, "MIDDLEWARE_RATE_LIMIT_ENGINE", "auto")
+RATE_LIMIT_CACHE_ALIAS = getattr(settings, "MIDDLEWARE_RATE_LIMIT_CACHE_ALIAS", "default")
+
+# Process-local (L1) token bucket in front of a shared limiter engine.
+# None enables it automatically when the engine is shared (e.g. Redis).
+RATE_LIMIT_L1_ENABLED = getattr(settings, "MIDDLEWARE_RATE_LIMIT_L1_ENABLED", None)
+# Seconds between background reconciliations of locally admitted requests
+RATE_LIMIT_L1_SYNC_INTERVAL = getattr(settings, "MIDDLEWARE_RATE_LIMIT_L1_SYNC_INTERVAL", 1.0)
+# Max requests admitted locally per key before an inline authoritative check
+RATE_LIMIT_L1_MAX_DEBT = getattr(settings, "MIDDLEWARE_RATE_LIMIT_L1_MAX_DEBT", 10)
+# Fraction of each limit below which every request goes to the shared engine
+RATE_LIMIT_L1_HEADROOM = getattr(settings, "MIDDLEWARE_RATE_LIMIT_L1_HEADROOM", 0.2)
+
 # Path Exclusion Regex Patterns (Always skip workspace enforcement and rate limiting for these)
 EXCLUDED_PATH_PATTERNS = getattr(
     settings,
@@ -45,21 +61,45 @@ WORKSPACE_OPTIONAL_PATH_PATTERNS = getattr(
     ]
 )
 
+# Route-level rate limit policies: list of (path regex, policy name), first match wins.
+# Paths without a match use the "default" policy.
+RATE_LIMIT_ROUTE_POLICIES = getattr(settings, "MIDDLEWARE_RATE_LIMIT_ROUTE_POLICIES", [])
+
+# Rate overrides per policy, e.g. {"polling": {"user": "3000/minute", "burst": "30/second"}}.
+# Keys: "burst", "workspace", "user", "anon". Missing keys fall back to the global rates.
+RATE_LIMIT_POLICIES = getattr(settings, "MIDDLEWARE_RATE_LIMIT_POLICIES", {})
+
+# Verified JWT cache: max tokens kept per process and seconds a verification is reused
+JWT_CACHE_SIZE = getattr(settings, "MIDDLEWARE_JWT_CACHE_SIZE", 10000)
+JWT_CACHE_TTL = getattr(settings, "MIDDLEWARE_JWT_CACHE_TTL", 300)
+
 # Postgres RLS Configuration
 RLS_ENABLED = getattr(settings, "MIDDLEWARE_RLS_ENABLED", True)
 
 
+def compile_alternation(patterns, named: bool = False):
+    """
+    Compiles a list of regex patterns into one alternation regex, so a path is
+    matched against all of them in a single scan. With `named`, each pattern is
+    wrapped in group "p<index>" and `match.lastgroup` identifies the winner.
+    """
+    if not patterns:
+        return None
+    if named:
+        return re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate(patterns)))
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+EXCLUDED_PATH_RE = compile_alternation(EXCLUDED_PATH_PATTERNS)
+WORKSPACE_OPTIONAL_PATH_RE = compile_alternation(WORKSPACE_OPTIONAL_PATH_PATTERNS)
+RATE_LIMIT_ROUTE_POLICY_RE = compile_alternation([p for p, _ in RATE_LIMIT_ROUTE_POLICIES], named=True)
+
+
 def is_path_excluded(path: str) -> bool:
     """Check if request path is excluded from middleware enforcement."""
-    for pattern in EXCLUDED_PATH_PATTERNS:
-        if re.match(pattern, path):
-            return True
-    return False
+    return bool(EXCLUDED_PATH_RE and EXCLUDED_PATH_RE.match(path))
 
 
 def is_workspace_optional(path: str) -> bool:
     """Check if request path does not strictly mandate a workspace_id unless supplied."""
-    for pattern in WORKSPACE_OPTIONAL_PATH_PATTERNS:
-        if re.match(pattern, path):
-            return True
-    return False
+    return bool(WORKSPACE_OPTIONAL_PATH_RE and WORKSPACE_OPTIONAL_PATH_RE.match(path))
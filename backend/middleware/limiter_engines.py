@@ -0,0 +1,404 @@
+"""
+Pluggable rate limiter engines.
+
+Every engine evaluates ALL limits that apply to a request (burst, workspace,
+user / anon) in one atomic step and only consumes capacity when every limit
+admits the request. The Redis and local engines use GCRA (generic cell rate
+algorithm), a true sliding-window limiter that stores a single "theoretical
+arrival time" per key instead of fixed counter buckets.
+"""
+import math
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from .config import (
+    RATE_LIMIT_ENGINE,
+    RATE_LIMIT_CACHE_ALIAS,
+    RATE_LIMIT_L1_ENABLED,
+    RATE_LIMIT_L1_SYNC_INTERVAL,
+    RATE_LIMIT_L1_MAX_DEBT,
+    RATE_LIMIT_L1_HEADROOM,
+)
+
+
+class LimitRule(NamedTuple):
+    """A single limit applied to a request, e.g. 15 requests / 1 second per IP."""
+    key: str
+    limit: int
+    window: int
+    limit_type: str
+
+    @property
+    def interval(self) -> float:
+        """Emission interval: seconds of capacity consumed by one request."""
+        return self.window / self.limit
+
+
+class LimitResult(NamedTuple):
+    """Outcome of evaluating a set of rules for one request."""
+    allowed: bool
+    rule: LimitRule
+    remaining: int
+    reset_seconds: int
+    retry_after: int
+
+
+def gcra_result(rule: LimitRule, offset: float, cost: int = 1) -> LimitResult:
+    """
+    Builds a LimitResult from a GCRA offset, i.e. (new_tat - now) in seconds.
+    The request is denied when the new theoretical arrival time lies more than
+    one window in the future.
+    """
+    if offset > rule.window:
+        return LimitResult(
+            allowed=False,
+            rule=rule,
+            remaining=0,
+            reset_seconds=max(1, math.ceil(offset - rule.interval * cost)),
+            retry_after=max(1, math.ceil(offset - rule.window)),
+        )
+    remaining = int((rule.window - offset) / rule.interval + 1e-9)
+    return LimitResult(
+        allowed=True,
+        rule=rule,
+        remaining=max(0, min(rule.limit, remaining)),
+        reset_seconds=max(0, math.ceil(offset)),
+        retry_after=0,
+    )
+
+
+class BaseLimiterEngine:
+    """
+    Interface for limiter engines.
+
+    `check_all` receives the rules in hierarchy order and returns one result per
+    evaluated rule; evaluation stops at the first rule that denies the request.
+    Capacity is consumed for every rule, or for none.
+
+    `debt` is capacity already used elsewhere (requests admitted by a local
+    pre-filter). It is charged to every rule unconditionally, in the same
+    atomic step, before `cost` is evaluated.
+    """
+
+    def check_all(self, rules: List[LimitRule], cost: int = 1, debt: int = 0) -> List[LimitResult]:
+        raise NotImplementedError
+
+    def check(self, rules: List[LimitRule], cost: int = 1) -> LimitResult:
+        """Returns the result of the denying rule, or of the last rule when all admit."""
+        return self.check_all(rules, cost)[-1]
+
+    @property
+    def is_shared(self) -> bool:
+        """True when counters live outside the process (e.g. Redis)."""
+        return True
+
+
+class LocalLimiterEngine(BaseLimiterEngine):
+    """
+    GCRA on a process-local cache backend (LocMemCache).
+
+    All keys are read and written inside one lock, so the multi-limit check is
+    a single atomic update without any network round trip.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, cache_alias: str = RATE_LIMIT_CACHE_ALIAS):
+        self.cache = caches[cache_alias]
+
+    @property
+    def is_shared(self) -> bool:
+        return False
+
+    def check_all(self, rules: List[LimitRule], cost: int = 1, debt: int = 0) -> List[LimitResult]:
+        with self._lock:
+            now = time.time()
+            stored = self.cache.get_many([rule.key for rule in rules])
+
+            tats = {
+                rule: max(float(stored.get(rule.key, now)), now) + rule.interval * debt
+                for rule in rules
+            }
+            results = []
+            for rule in rules:
+                new_tat = tats[rule] + rule.interval * cost
+                results.append(gcra_result(rule, new_tat - now, cost))
+                if not results[-1].allowed:
+                    break
+            else:
+                tats = {rule: tat + rule.interval * cost for rule, tat in tats.items()}
+
+            if debt or results[-1].allowed:
+                for rule, tat in tats.items():
+                    self.cache.set(rule.key, tat, timeout=max(1, math.ceil(tat - now)))
+            return results
+
+
+# KEYS: limiter keys. ARGV: cost, debt, then (limit, window) pairs per key.
+# Returns {allowed, denied_index, offset_1, offset_2, ...} where offset is
+# (new_tat - now) as a string, for every key evaluated. The debt is written
+# even when the request is denied.
+GCRA_LUA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local debt = tonumber(ARGV[2])
+local tats = {}
+local intervals = {}
+local result = {1, 0}
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[i * 2 + 1])
+    local window = tonumber(ARGV[i * 2 + 2])
+    local tat = tonumber(redis.call('GET', KEYS[i]) or now)
+    if tat < now then tat = now end
+    intervals[i] = window / limit
+    tats[i] = tat + intervals[i] * debt
+    if result[1] == 1 then
+        local new_tat = tats[i] + intervals[i] * cost
+        result[i + 2] = tostring(new_tat - now)
+        if new_tat - now > window then
+            result[1] = 0
+            result[2] = i
+        end
+    end
+end
+if result[1] == 1 then
+    for i = 1, #KEYS do
+        tats[i] = tats[i] + intervals[i] * cost
+    end
+end
+if result[1] == 1 or debt > 0 then
+    for i = 1, #KEYS do
+        redis.call('SET', KEYS[i], tostring(tats[i]), 'EX', math.max(1, math.ceil(tats[i] - now)))
+    end
+end
+return result
+"""
+
+
+class RedisLimiterEngine(BaseLimiterEngine):
+    """
+    GCRA evaluated server-side by a Lua script: one EVALSHA round trip per
+    request regardless of how many limits apply. Requires django-redis.
+    """
+
+    def __init__(self, cache_alias: str = RATE_LIMIT_CACHE_ALIAS):
+        from django_redis import get_redis_connection
+
+        self.cache = caches[cache_alias]
+        self.client = get_redis_connection(cache_alias)
+        self.script = self.client.register_script(GCRA_LUA_SCRIPT)
+
+    def check_all(self, rules: List[LimitRule], cost: int = 1, debt: int = 0) -> List[LimitResult]:
+        args = [cost, debt]
+        for rule in rules:
+            args.extend([rule.limit, rule.window])
+
+        reply = self.script(keys=[self.cache.make_key(rule.key) for rule in rules], args=args)
+        offsets = reply[2:]
+        return [gcra_result(rule, float(offset), cost) for rule, offset in zip(rules, offsets)]
+
+
+class FixedWindowCacheEngine(BaseLimiterEngine):
+    """
+    Legacy fixed-window counters on any Django cache backend (e.g. memcached).
+    Used when the cache offers neither server-side scripting nor process-local
+    locking. Not atomic across limits.
+    """
+
+    def __init__(self, cache_alias: str = RATE_LIMIT_CACHE_ALIAS):
+        self.cache = caches[cache_alias]
+
+    def check_all(self, rules: List[LimitRule], cost: int = 1, debt: int = 0) -> List[LimitResult]:
+        from .rate_limiting import RateLimiter
+
+        if debt:
+            for rule in rules:
+                RateLimiter.evaluate_sliding_window(
+                    rule.key, rule.limit, rule.window, cost=debt, cache_backend=self.cache
+                )
+        results = []
+        for rule in rules:
+            allowed, limit, remaining, reset = RateLimiter.evaluate_sliding_window(
+                rule.key, rule.limit, rule.window, cost=cost, cache_backend=self.cache
+            )
+            results.append(LimitResult(allowed, rule, remaining, reset, 0 if allowed else reset))
+            if not allowed:
+                break
+        return results
+
+
+class _LocalBucket:
+    """
+    L1 view of one rule set: the per-rule remaining capacity last reported by the
+    shared engine, and the requests admitted locally since then (the debt).
+    """
+    __slots__ = ("rules", "remaining", "synced_at", "pending")
+
+    def __init__(self, rules: List[LimitRule]):
+        self.rules = rules
+        self.remaining = None
+        self.synced_at = 0.0
+        self.pending = 0
+
+    def tokens(self, rule_index: int, now: float) -> float:
+        """Estimated capacity left for a rule, refilled since the last sync."""
+        rule = self.rules[rule_index]
+        refilled = self.remaining[rule_index] + (now - self.synced_at) / rule.interval
+        return min(rule.limit, refilled) - self.pending
+
+    def sync(self, results: List[LimitResult], now: float):
+        self.remaining = [result.remaining for result in results]
+        self.synced_at = now
+
+
+class PrefilterLimiterEngine(BaseLimiterEngine):
+    """
+    Process-local token bucket (L1) in front of a shared engine.
+
+    Requests are admitted locally while every limit of the rule set has more than
+    `headroom` of its capacity left. Locally admitted requests are charged to the
+    shared counters as debt, either by the background reconciler every
+    `sync_interval` seconds or inline with the next shared check once `max_debt`
+    requests are pending. Debt is always charged, even when the shared check
+    denies, so a denial never carries it into later requests. Close to a limit
+    every request goes to the shared engine.
+
+    Each process can overshoot a limit by at most `max_debt` requests per key.
+    """
+
+    def __init__(
+        self,
+        engine: BaseLimiterEngine,
+        sync_interval: float = RATE_LIMIT_L1_SYNC_INTERVAL,
+        max_debt: int = RATE_LIMIT_L1_MAX_DEBT,
+        headroom: float = RATE_LIMIT_L1_HEADROOM,
+        background: bool = True,
+    ):
+        self.engine = engine
+        self.sync_interval = sync_interval
+        self.max_debt = max_debt
+        self.headroom = headroom
+        self.background = background
+        self.buckets = {}
+        self._lock = threading.Lock()
+        self._reconciler = None
+
+    def check_all(self, rules: List[LimitRule], cost: int = 1, debt: int = 0) -> List[LimitResult]:
+        bucket_key = tuple(rule.key for rule in rules)
+        now = time.time()
+
+        with self._lock:
+            bucket = self.buckets.get(bucket_key)
+            if bucket is None:
+                bucket = self.buckets[bucket_key] = _LocalBucket(rules)
+            if not debt and self._can_admit_locally(bucket, now, cost):
+                bucket.pending += cost
+                self._ensure_reconciler()
+                return [
+                    LimitResult(True, rule, int(bucket.tokens(i, now)), math.ceil(rule.window), 0)
+                    for i, rule in enumerate(rules)
+                ]
+            # Authoritative check charging the local debt in the same round trip
+            debt += bucket.pending
+            bucket.pending = 0
+
+        try:
+            results = self.engine.check_all(rules, cost, debt)
+        except Exception:
+            with self._lock:
+                bucket.pending += debt
+            raise
+        with self._lock:
+            self._sync(bucket, results, now)
+        return results
+
+    def _can_admit_locally(self, bucket: _LocalBucket, now: float, cost: int) -> bool:
+        if bucket.remaining is None or bucket.pending + cost > self.max_debt:
+            return False
+        for i, rule in enumerate(bucket.rules):
+            if bucket.tokens(i, now) - cost < math.ceil(rule.limit * self.headroom):
+                return False
+        return True
+
+    def reconcile(self):
+        """Charges all pending local debt to the shared engine and refreshes snapshots."""
+        now = time.time()
+        with self._lock:
+            due = []
+            for bucket_key, bucket in list(self.buckets.items()):
+                if bucket.pending:
+                    due.append((bucket, bucket.pending))
+                    bucket.pending = 0
+                elif now - bucket.synced_at > max(rule.window for rule in bucket.rules):
+                    # Idle bucket, the shared counters have fully refilled
+                    del self.buckets[bucket_key]
+
+        for bucket, debt in due:
+            try:
+                results = self.engine.check_all(bucket.rules, 0, debt)
+            except Exception:
+                with self._lock:
+                    bucket.pending += debt
+                continue
+            with self._lock:
+                self._sync(bucket, results, now)
+
+    @staticmethod
+    def _sync(bucket: _LocalBucket, results: List[LimitResult], now: float):
+        if results[-1].allowed:
+            bucket.sync(results, now)
+        else:
+            bucket.remaining = [0] * len(bucket.rules)
+            bucket.synced_at = now
+
+    def _ensure_reconciler(self):
+        if not self.background or (self._reconciler and self._reconciler.is_alive()):
+            return
+        self._reconciler = threading.Thread(target=self._reconcile_forever, daemon=True)
+        self._reconciler.start()
+
+    def _reconcile_forever(self):
+        while True:
+            time.sleep(self.sync_interval)
+            self.reconcile()
+
+
+ENGINES = {
+    "local": LocalLimiterEngine,
+    "redis": RedisLimiterEngine,
+    "cache": FixedWindowCacheEngine,
+}
+
+_engine: Optional[BaseLimiterEngine] = None
+
+
+def resolve_engine_class(name: str = RATE_LIMIT_ENGINE):
+    """Maps the MIDDLEWARE_RATE_LIMIT_ENGINE setting to an engine class."""
+    if name == "auto":
+        backend = settings.CACHES.get(RATE_LIMIT_CACHE_ALIAS, {}).get("BACKEND", "")
+        if backend.startswith("django_redis."):
+            return RedisLimiterEngine
+        if backend.endswith("LocMemCache"):
+            return LocalLimiterEngine
+        return FixedWindowCacheEngine
+    if name in ENGINES:
+        return ENGINES[name]
+    return import_string(name)
+
+
+def get_limiter_engine() -> BaseLimiterEngine:
+    """
+    Returns the process-wide limiter engine, creating it on first use.
+    Shared engines get the L1 pre-filter unless MIDDLEWARE_RATE_LIMIT_L1_ENABLED is False.
+    """
+    global _engine
+    if _engine is None:
+        engine = resolve_engine_class()()
+        l1_enabled = engine.is_shared if RATE_LIMIT_L1_ENABLED is None else RATE_LIMIT_L1_ENABLED
+        _engine = PrefilterLimiterEngine(engine) if l1_enabled else engine
+    return _engine
@@ -1,42 +1,44 @@
 import logging
+from django.contrib.auth.models import AnonymousUser
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.utils.functional import SimpleLazyObject
 
+from .authentication import authenticate_request, get_request_token, get_request_user_id
 from .rate_limiting import RateLimiter
-from .workspace_enforcement import WorkspaceEnforcer
+from .workspace_enforcement import WorkspaceEnforcer, extract_workspace_id, request_membership
 from .rls import set_postgres_rls_session_vars
-from .config import is_path_excluded
+from .routing import get_route_classification
 
 logger = logging.getLogger(__name__)
 
 
+def _resolve_jwt_user(request, fallback):
+    result = authenticate_request(request)
+    if result and result.user:
+        return result.user
+    return fallback if fallback is not None else AnonymousUser()
+
+
 class JWTAuthenticationMiddleware(MiddlewareMixin):
     """
     Ensures request.user is populated from JWT Bearer header or cookie
     before downstream middlewares process authentication context.
+
+    The token is verified here, but the user is only loaded when request.user is
+    first used; downstream stages work from the token's user id claim
+    (get_request_user_id). Excluded paths are not authenticated at all.
+    The result is kept on the request and reused by DRF (CachedJWTAuthentication).
     """
     def process_request(self, request):
-        if not hasattr(request, 'user') or not request.user.is_authenticated:
-            token = None
-            auth_header = request.headers.get('Authorization') or request.META.get('HTTP_AUTHORIZATION')
-            if auth_header and auth_header.startswith('Bearer '):
-                token = auth_header.split(' ')[1]
-            elif 'session_access_token' in request.COOKIES:
-                token = request.COOKIES.get('session_access_token')
-            elif 'access_token' in request.COOKIES:
-                token = request.COOKIES.get('access_token')
-
-            if token:
-                try:
-                    jwt_auth = JWTAuthentication()
-                    validated_token = jwt_auth.get_validated_token(token)
-                    user = jwt_auth.get_user(validated_token)
-                    if user:
-                        request.user = user
-                except Exception as e:
-                    # Let DRF handle invalid token responses if view is protected
-                    pass
+        if get_route_classification(request).excluded:
+            return None
+
+        if get_request_token(request) is None:
+            return None
+
+        fallback = getattr(request, 'user', None)
+        request.user = SimpleLazyObject(lambda: _resolve_jwt_user(request, fallback))
 
 
 class RateLimitMiddleware(MiddlewareMixin):
@@ -44,15 +46,21 @@ class RateLimitMiddleware(MiddlewareMixin):
     Django Middleware to enforce sliding window rate limiting and throttling.
     """
     def process_request(self, request):
-        path = request.path_info
-        if is_path_excluded(path):
+        route = get_route_classification(request)
+        if route.excluded:
             return None
 
-        workspace_id = getattr(request, 'workspace_id', None)
-        
+        # Runs before workspace enforcement. Only members are charged to a workspace's
+        # bucket, or anyone naming the workspace could drain it; the membership map is
+        # cached, and enforcement reuses it
+        workspace_id = extract_workspace_id(request)
+        if workspace_id and not request_membership(request).is_member(workspace_id):
+            workspace_id = None
+
         allowed, limit, remaining, reset_secs, retry_after, limit_type = RateLimiter.check_request(
             request, 
-            workspace_id=workspace_id
+            workspace_id=workspace_id,
+            policy=route.rate_limit_policy,
         )
 
         request._rate_limit_info = {
@@ -112,18 +120,17 @@ class PostgresRLSMiddleware(MiddlewareMixin):
     """
     def process_request(self, request):
         ws_id = getattr(request, 'workspace_id', None)
-        user = getattr(request, 'user', None)
-        user_id = str(user.id) if (user and user.is_authenticated) else None
-        
+        user_id = get_request_user_id(request)
+
         set_postgres_rls_session_vars(workspace_id=ws_id, user_id=user_id)
 
 
 class BaseMiddlewareSuite(MiddlewareMixin):
     """
     Unified All-in-One Middleware Suite executing:
-    1. JWT Resolution
-    2. Workspace Enforcement
-    3. Rate Limiting & Throttling
+    1. JWT Resolution (lazy user)
+    2. Rate Limiting & Throttling (membership from the cached map)
+    3. Workspace Enforcement
     4. PostgreSQL RLS Session Variable Setup
     """
     def __init__(self, get_response=None):
@@ -137,16 +144,16 @@ class BaseMiddlewareSuite(MiddlewareMixin):
         # 1. JWT Resolution
         self.jwt_middleware.process_request(request)
 
-        # 2. Workspace Enforcement
-        ws_resp = self.workspace_middleware.process_request(request)
-        if ws_resp:
-            return ws_resp
-
-        # 3. Rate Limiting & Throttling
+        # 2. Rate Limiting & Throttling
         rl_resp = self.rate_limit_middleware.process_request(request)
         if rl_resp:
             return rl_resp
 
+        # 3. Workspace Enforcement
+        ws_resp = self.workspace_middleware.process_request(request)
+        if ws_resp:
+            return ws_resp
+
         # 4. PostgreSQL RLS
         self.rls_middleware.process_request(request)
 
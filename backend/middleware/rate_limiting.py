@@ -1,14 +1,17 @@
 import time
 import math
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 from django.core.cache import cache
 from django.conf import settings
+from .authentication import get_request_user_id
+from .limiter_engines import LimitRule, get_limiter_engine
 from .config import (
     RATE_LIMIT_ENABLED,
     RATE_LIMIT_ANON,
     RATE_LIMIT_USER,
     RATE_LIMIT_WORKSPACE,
     THROTTLE_BURST_LIMIT,
+    RATE_LIMIT_POLICIES,
 )
 
 
@@ -46,32 +49,49 @@ def get_client_ip(request) -> str:
 
 class RateLimiter:
     """
-    Sliding window rate limiter and burst throttler using Django cache (Redis/LocMem).
+    Rate limiter and burst throttler. All limits applying to a request are checked
+    in a single atomic operation by the configured limiter engine (see limiter_engines).
     """
-    
+
+    # Rates are parsed once at import instead of on every request
+    BURST_RATE = parse_rate(THROTTLE_BURST_LIMIT)
+    WORKSPACE_RATE = parse_rate(RATE_LIMIT_WORKSPACE)
+    USER_RATE = parse_rate(RATE_LIMIT_USER)
+    ANON_RATE = parse_rate(RATE_LIMIT_ANON)
+
+    # Parsed rate overrides per route policy (see MIDDLEWARE_RATE_LIMIT_POLICIES)
+    POLICY_RATES = {
+        name: {scope: parse_rate(rate) for scope, rate in overrides.items()}
+        for name, overrides in RATE_LIMIT_POLICIES.items()
+    }
+
     @classmethod
     def evaluate_sliding_window(
         cls, 
         cache_key: str, 
         max_requests: int, 
-        window_seconds: int
+        window_seconds: int,
+        cost: int = 1,
+        cache_backend=None,
     ) -> Tuple[bool, int, int, int]:
         """
-        Evaluates a sliding window for a given cache key.
+        Evaluates a fixed window counter for a given cache key.
+        Used by the legacy FixedWindowCacheEngine.
         Returns: (allowed, limit, remaining, reset_seconds)
         """
+        cache_backend = cache_backend or cache
         now = time.time()
         current_window_bucket = int(now // window_seconds)
         sub_key = f"{cache_key}:{current_window_bucket}"
         
         # Use cache increment pattern
         try:
-            current_count = cache.get_or_set(sub_key, 0, timeout=window_seconds * 2)
-            current_count = cache.incr(sub_key)
+            current_count = cache_backend.get_or_set(sub_key, 0, timeout=window_seconds * 2)
+            current_count = cache_backend.incr(sub_key, cost)
         except Exception:
             # Fallback if cache fails or incr on new key raises error
-            cache.set(sub_key, 1, timeout=window_seconds * 2)
-            current_count = 1
+            cache_backend.set(sub_key, cost, timeout=window_seconds * 2)
+            current_count = cost
 
         reset_seconds = int(((current_window_bucket + 1) * window_seconds) - now)
         remaining = max(0, max_requests - current_count)
@@ -80,7 +100,45 @@ class RateLimiter:
         return allowed, max_requests, remaining, reset_seconds
 
     @classmethod
-    def check_request(cls, request, workspace_id: Optional[str] = None) -> Tuple[bool, int, int, int, int, Optional[str]]:
+    def build_rules(
+        cls,
+        ip: str,
+        user_id: Optional[str],
+        workspace_id: Optional[str],
+        policy: Optional[str] = None,
+    ) -> List[LimitRule]:
+        """
+        Builds the limits applying to a request, in hierarchy order:
+        1. Burst Throttling (IP based)
+        2. Workspace Limit (if workspace_id provided)
+        3. User Limit (if authenticated)
+        4. Anon IP Limit (if unauthenticated)
+
+        Scopes overridden by a route policy get their own counters.
+        """
+        overrides = cls.POLICY_RATES.get(policy, {})
+
+        def rule(scope, key, default_rate, limit_type):
+            if scope in overrides:
+                return LimitRule(f"{key}:{policy}", *overrides[scope], limit_type)
+            return LimitRule(key, *default_rate, limit_type)
+
+        rules = [rule("burst", f"throttle:burst:{ip}", cls.BURST_RATE, "burst_throttle")]
+        if workspace_id:
+            rules.append(rule("workspace", f"rate_limit:ws:{workspace_id}", cls.WORKSPACE_RATE, "workspace_rate_limit"))
+        if user_id:
+            rules.append(rule("user", f"rate_limit:user:{user_id}", cls.USER_RATE, "user_rate_limit"))
+        else:
+            rules.append(rule("anon", f"rate_limit:anon:{ip}", cls.ANON_RATE, "anon_rate_limit"))
+        return rules
+
+    @classmethod
+    def check_request(
+        cls,
+        request,
+        workspace_id: Optional[str] = None,
+        policy: Optional[str] = None,
+    ) -> Tuple[bool, int, int, int, int, Optional[str]]:
         """
         Checks rate limits and burst throttling for an incoming request.
         
@@ -96,38 +154,11 @@ class RateLimiter:
             return True, 999999, 999999, 0, 0, None
 
         ip = get_client_ip(request)
-        user = getattr(request, 'user', None)
-        user_id = str(user.id) if (user and user.is_authenticated) else None
-
-        # 1. Burst Throttling Check (Short window protection e.g. 15 requests / second)
-        burst_limit, burst_window = parse_rate(THROTTLE_BURST_LIMIT)
-        burst_key = f"throttle:burst:{ip}"
-        b_allowed, b_limit, b_rem, b_reset = cls.evaluate_sliding_window(burst_key, burst_limit, burst_window)
-        if not b_allowed:
-            return False, b_limit, 0, b_reset, b_reset, "burst_throttle"
+        user_id = get_request_user_id(request)
 
-        # 2. Workspace Level Rate Limit
-        if workspace_id:
-            ws_limit, ws_window = parse_rate(RATE_LIMIT_WORKSPACE)
-            ws_key = f"rate_limit:ws:{workspace_id}"
-            w_allowed, w_limit, w_rem, w_reset = cls.evaluate_sliding_window(ws_key, ws_limit, ws_window)
-            if not w_allowed:
-                return False, w_limit, 0, w_reset, w_reset, "workspace_rate_limit"
+        rules = cls.build_rules(ip, user_id, workspace_id, policy)
+        result = get_limiter_engine().check(rules)
 
-        # 3. User Level Rate Limit
-        if user_id:
-            usr_limit, usr_window = parse_rate(RATE_LIMIT_USER)
-            usr_key = f"rate_limit:user:{user_id}"
-            u_allowed, u_limit, u_rem, u_reset = cls.evaluate_sliding_window(usr_key, usr_limit, usr_window)
-            if not u_allowed:
-                return False, u_limit, 0, u_reset, u_reset, "user_rate_limit"
-            return True, u_limit, u_rem, u_reset, 0, "user"
-
-        # 4. Anonymous IP Level Rate Limit
-        anon_limit, anon_window = parse_rate(RATE_LIMIT_ANON)
-        anon_key = f"rate_limit:anon:{ip}"
-        a_allowed, a_limit, a_rem, a_reset = cls.evaluate_sliding_window(anon_key, anon_limit, anon_window)
-        if not a_allowed:
-            return False, a_limit, 0, a_reset, a_reset, "anon_rate_limit"
-        
-        return True, a_limit, a_rem, a_reset, 0, "anon"
+        if not result.allowed:
+            return False, result.rule.limit, 0, result.reset_seconds, result.retry_after, result.rule.limit_type
+        return True, result.rule.limit, result.remaining, result.reset_seconds, 0, "user" if user_id else "anon"
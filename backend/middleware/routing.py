@@ -0,0 +1,90 @@
+"""
+Route classification shared by all middleware stages.
+
+A request path is classified once: excluded from enforcement, workspace-optional,
+workspace id embedded in the path, and rate limit policy. Patterns are compiled
+into single alternation regexes (see config) and classifications are memoized
+per path template, where every UUID segment is replaced by the nil UUID.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from .config import (
+    EXCLUDED_PATH_RE,
+    WORKSPACE_OPTIONAL_PATH_RE,
+    RATE_LIMIT_ROUTE_POLICY_RE,
+    RATE_LIMIT_ROUTE_POLICIES,
+)
+
+UUID_PATTERN = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+UUID_SEGMENT_RE = re.compile(UUID_PATTERN, re.IGNORECASE)
+
+# UUIDs are replaced by a placeholder of the same length, so offsets in the
+# template are offsets in the original path.
+TEMPLATE_UUID = "00000000-0000-0000-0000-000000000000"
+WORKSPACE_PATH_PREFIX = f"/api/workspaces/{TEMPLATE_UUID}"
+
+DEFAULT_RATE_LIMIT_POLICY = "default"
+
+
+class RouteClassification(NamedTuple):
+    path_template: str
+    excluded: bool
+    workspace_optional: bool
+    # Workspace id taken from an /api/workspaces/<uuid>/... path, if any
+    workspace_id: Optional[str]
+    # None when the path is exempt from rate limiting
+    rate_limit_policy: Optional[str]
+
+
+class _TemplateClassification(NamedTuple):
+    excluded: bool
+    workspace_optional: bool
+    workspace_id_offset: int
+    rate_limit_policy: Optional[str]
+
+
+@lru_cache(maxsize=4096)
+def _classify_template(template: str) -> _TemplateClassification:
+    excluded = bool(EXCLUDED_PATH_RE and EXCLUDED_PATH_RE.match(template))
+    optional = bool(WORKSPACE_OPTIONAL_PATH_RE and WORKSPACE_OPTIONAL_PATH_RE.match(template))
+
+    policy = None
+    if not excluded:
+        policy = DEFAULT_RATE_LIMIT_POLICY
+        match = RATE_LIMIT_ROUTE_POLICY_RE and RATE_LIMIT_ROUTE_POLICY_RE.match(template)
+        if match:
+            policy = RATE_LIMIT_ROUTE_POLICIES[int(match.lastgroup[1:])][1]
+
+    offset = template.find(WORKSPACE_PATH_PREFIX)
+    if offset != -1:
+        offset += len("/api/workspaces/")
+    return _TemplateClassification(excluded, optional, offset, policy)
+
+
+def classify_path(path: str) -> RouteClassification:
+    """Classifies a request path; the regex work is memoized per path template."""
+    template = UUID_SEGMENT_RE.sub(TEMPLATE_UUID, path)
+    cls = _classify_template(template)
+
+    workspace_id = None
+    if cls.workspace_id_offset != -1:
+        workspace_id = path[cls.workspace_id_offset:cls.workspace_id_offset + len(TEMPLATE_UUID)]
+
+    return RouteClassification(
+        path_template=template,
+        excluded=cls.excluded,
+        workspace_optional=cls.workspace_optional,
+        workspace_id=workspace_id,
+        rate_limit_policy=cls.rate_limit_policy,
+    )
+
+
+def get_route_classification(request) -> RouteClassification:
+    """Returns the classification of request.path_info, computed once per request."""
+    route = getattr(request, '_route_classification', None)
+    if route is None:
+        route = classify_path(request.path_info)
+        request._route_classification = route
+    return route
@@ -0,0 +1,157 @@
+import time
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test import RequestFactory
+from rest_framework.request import Request
+from rest_framework_simplejwt.tokens import AccessToken
+from apps.users.models.user import User
+from backend.middleware.middleware import JWTAuthenticationMiddleware
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from backend.middleware.authentication import (
+    CachedJWTAuthentication,
+    get_request_user_id,
+    VerifiedTokenCache,
+    revoke_token,
+    verified_tokens,
+)
+
+
+@pytest.mark.django_db
+class TestRequestAuthentication:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        cache.clear()
+        verified_tokens.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(email="auth@example.com", password="password123")
+        self.token = str(AccessToken.for_user(self.user))
+
+    def _request(self):
+        return self.factory.get("/api/projects/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_drf_reuses_middleware_result(self, django_assert_num_queries):
+        request = self._request()
+        JWTAuthenticationMiddleware(lambda r: None).process_request(request)
+        assert request.user == self.user
+
+        with django_assert_num_queries(0):
+            user, validated_token = CachedJWTAuthentication().authenticate(Request(request))
+        assert user == self.user
+        assert validated_token is request._jwt_auth.validated_token
+
+    def test_user_cached_across_requests(self, django_assert_num_queries):
+        middleware = JWTAuthenticationMiddleware(lambda r: None)
+        for expected_queries in (1, 0):
+            request = self._request()
+            with django_assert_num_queries(expected_queries):
+                middleware.process_request(request)
+                assert request.user == self.user
+
+    def test_user_save_invalidates_cache(self, django_assert_num_queries):
+        middleware = JWTAuthenticationMiddleware(lambda r: None)
+        middleware.process_request(self._request())
+
+        self.user.is_active = False
+        self.user.save()
+
+        request = self._request()
+        with django_assert_num_queries(1):
+            middleware.process_request(request)
+            assert not request.user.is_authenticated
+
+    def test_process_local_caches_load_users_uncached(self, settings, django_assert_num_queries):
+        # LocMemCache is per worker: a deactivation in one would not reach the others
+        settings.SHARED_CACHE = None
+        middleware = JWTAuthenticationMiddleware(lambda r: None)
+        for _ in range(2):
+            request = self._request()
+            with django_assert_num_queries(1):
+                middleware.process_request(request)
+                assert request.user == self.user
+
+    def test_user_is_loaded_lazily(self, django_assert_num_queries):
+        request = self._request()
+        with django_assert_num_queries(0):
+            JWTAuthenticationMiddleware(lambda r: None).process_request(request)
+            assert get_request_user_id(request) == str(self.user.id)
+        with django_assert_num_queries(1):
+            assert request.user == self.user
+
+    def test_excluded_path_is_not_authenticated(self, django_assert_num_queries):
+        request = self.factory.get("/static/app.js", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        with django_assert_num_queries(0):
+            JWTAuthenticationMiddleware(lambda r: None).process_request(request)
+        assert not hasattr(request, 'user')
+        assert not hasattr(request, '_jwt_token')
+
+
+@pytest.mark.django_db
+class TestVerifiedTokenCache:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        cache.clear()
+        verified_tokens.clear()
+        self.user = User.objects.create_user(email="lru@example.com", password="password123")
+        self.token = str(AccessToken.for_user(self.user))
+
+    def test_hit_skips_verification(self):
+        auth = CachedJWTAuthentication()
+        first = auth.get_validated_token(self.token)
+        with mock.patch.object(JWTAuthentication, 'get_validated_token') as verify:
+            assert auth.get_validated_token(self.token) is first
+        verify.assert_not_called()
+
+    def test_expired_entries_are_dropped(self):
+        lru = VerifiedTokenCache(max_size=10, ttl=60)
+        lru.put("raw", {"exp": time.time() - 1})
+        assert lru.get("raw") is None
+
+        lru.put("raw", {"exp": time.time() + 3600})
+        with mock.patch("backend.middleware.authentication.time.time", return_value=time.time() + 61):
+            assert lru.get("raw") is None
+
+    def test_evicts_least_recently_used(self):
+        lru = VerifiedTokenCache(max_size=2, ttl=60)
+        lru.put("a", {})
+        lru.put("b", {})
+        lru.get("a")
+        lru.put("c", {})
+        assert lru.get("b") is None
+        assert lru.get("a") == {} and lru.get("c") == {}
+
+    def test_revoked_token_is_rejected(self):
+        auth = CachedJWTAuthentication()
+        validated_token = auth.get_validated_token(self.token)
+        assert auth.get_user(validated_token) == self.user
+
+        revoke_token(validated_token, self.token)
+        assert verified_tokens.get(self.token) is None
+        with pytest.raises(InvalidToken):
+            auth.get_user(auth.get_validated_token(self.token))
+
+    def test_revocation_outlives_the_cache(self, settings):
+        auth = CachedJWTAuthentication()
+        revoke_token(auth.get_validated_token(self.token), self.token)
+
+        # Evicted markers and process-local caches fall back to RevokedToken
+        cache.clear()
+        with pytest.raises(InvalidToken):
+            auth.get_user(auth.get_validated_token(self.token))
+        settings.SHARED_CACHE = None
+        with pytest.raises(InvalidToken):
+            auth.get_user(auth.get_validated_token(self.token))
+
+    def test_logout_revokes_the_access_token(self):
+        from rest_framework.test import APIClient
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        assert client.get("/api/workspaces/").status_code == 200
+
+        assert client.post("/api/auth/logout/").status_code == 200
+        assert client.get("/api/workspaces/").status_code == 401
@@ -1,3 +1,6 @@
+import time
+from unittest import mock
+
 import pytest
 from django.test import RequestFactory
 from django.core.cache import cache
@@ -31,8 +34,146 @@ class TestRateLimiting:
                 assert "X-RateLimit-Limit" in response
                 break
 
+    def test_workspace_bucket_is_only_charged_to_members(self, monkeypatch):
+        from rest_framework_simplejwt.tokens import AccessToken
+        from apps.users.models.user import User
+        from apps.workspace.models import Workspace
+
+        owner = User.objects.create_user(email="owner@example.com", password="password123")
+        outsider = User.objects.create_user(email="outsider@example.com", password="password123")
+        workspace = Workspace.objects.create(name="Team", owner=owner)
+
+        charged = []
+        original = RateLimiter.check_request.__func__
+
+        def recording_check_request(cls, request, workspace_id=None, policy=None):
+            charged.append(workspace_id)
+            return original(cls, request, workspace_id=workspace_id, policy=policy)
+
+        monkeypatch.setattr(RateLimiter, "check_request", classmethod(recording_check_request))
+        middleware = RateLimitMiddleware(lambda r: None)
+        url = f"/api/workspaces/{workspace.id}/projects/"
+        for user in (None, outsider, owner):
+            headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"} if user else {}
+            request = self.factory.get(url, **headers)
+            assert middleware.process_request(request) is None
+
+        assert charged == [None, None, str(workspace.id)]
+
     def test_parse_rate_strings(self):
         from backend.middleware.rate_limiting import parse_rate
         assert parse_rate("60/minute") == (60, 60)
         assert parse_rate("10/second") == (10, 1)
         assert parse_rate("1000/hour") == (1000, 3600)
+
+
+class TestLimiterEngines:
+
+    def setup_method(self):
+        cache.clear()
+
+    def test_gcra_admits_limit_then_denies(self):
+        from backend.middleware.limiter_engines import LocalLimiterEngine, LimitRule
+        engine = LocalLimiterEngine()
+        rule = LimitRule("test:gcra", 5, 60, "user_rate_limit")
+
+        results = [engine.check([rule]) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[-1].retry_after >= 1
+
+    def test_denied_request_consumes_no_capacity(self):
+        from backend.middleware.limiter_engines import LocalLimiterEngine, LimitRule
+        engine = LocalLimiterEngine()
+        burst = LimitRule("test:burst", 1, 60, "burst_throttle")
+        user = LimitRule("test:user", 10, 60, "user_rate_limit")
+
+        assert engine.check([burst, user]).remaining == 9
+        denied = engine.check([burst, user])
+        assert not denied.allowed
+        assert denied.rule.limit_type == "burst_throttle"
+
+        # The user limit was not charged for the denied request
+        assert engine.check([user]).remaining == 8
+
+    def test_check_request_returns_governing_limit(self):
+        request = RequestFactory().get("/api/some-endpoint/")
+        allowed, limit, remaining, reset, retry_after, limit_type = RateLimiter.check_request(request)
+        assert allowed
+        assert limit_type == "anon"
+        assert limit == RateLimiter.ANON_RATE[0]
+        assert remaining == limit - 1
+
+
+class TestPrefilterLimiterEngine:
+
+    def setup_method(self):
+        from backend.middleware.limiter_engines import LocalLimiterEngine, PrefilterLimiterEngine
+        cache.clear()
+        self.shared = LocalLimiterEngine()
+        self.calls = []
+        original = self.shared.check_all
+
+        def counting_check_all(rules, cost=1, debt=0):
+            self.calls.append(cost + debt)
+            return original(rules, cost, debt)
+
+        self.shared.check_all = counting_check_all
+        self.engine = PrefilterLimiterEngine(self.shared, max_debt=5, headroom=0.2, background=False)
+
+    def test_admits_locally_far_from_limit(self):
+        from backend.middleware.limiter_engines import LimitRule
+        rule = LimitRule("test:l1", 100, 60, "user_rate_limit")
+
+        for _ in range(6):
+            assert self.engine.check([rule]).allowed
+
+        # First request syncs, the next five are admitted locally
+        assert self.calls == [1]
+
+        # Debt limit reached: the next check charges the debt in the same round trip
+        assert self.engine.check([rule]).allowed
+        assert self.calls == [1, 6]
+
+    def test_reconcile_charges_pending_debt(self):
+        from backend.middleware.limiter_engines import LimitRule
+        rule = LimitRule("test:l1:sync", 100, 60, "user_rate_limit")
+
+        for _ in range(4):
+            self.engine.check([rule])
+        self.engine.reconcile()
+
+        assert self.calls == [1, 3]
+        assert self.shared.check([rule]).remaining == 95
+
+    def test_falls_back_to_shared_engine_near_limit(self):
+        from backend.middleware.limiter_engines import LimitRule
+        rule = LimitRule("test:l1:tight", 5, 60, "user_rate_limit")
+
+        results = [self.engine.check([rule]) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        # Locally admitted requests were charged before the limit was hit
+        assert sum(self.calls[:-1]) == 5
+        assert self.calls[-1] == 1
+
+    def test_denied_request_still_charges_the_debt(self):
+        from backend.middleware.limiter_engines import LimitRule
+        rule = LimitRule("test:l1:debt", 10, 60, "user_rate_limit")
+
+        # One sync, then five requests admitted locally
+        for _ in range(6):
+            assert self.engine.check([rule]).allowed
+        # Other processes use up the rest of the shared capacity
+        for _ in range(4):
+            self.shared.check([rule])
+
+        assert not self.engine.check([rule]).allowed
+        assert self.engine.buckets[(rule.key,)].pending == 0
+        assert self.shared.check([rule], cost=0).remaining == 0
+
+        # Once one request's worth has refilled, the next request is admitted
+        later = time.time() + 7
+        with mock.patch("time.time", return_value=later):
+            assert self.engine.check([rule]).allowed
@@ -0,0 +1,39 @@
+from django.test import RequestFactory
+from backend.middleware import routing
+from backend.middleware.routing import classify_path, get_route_classification, TEMPLATE_UUID
+
+WS_ID = "11111111-2222-3333-4444-555555555555"
+
+
+class TestRouteClassification:
+
+    def test_excluded_paths(self):
+        for path in ["/admin/", "/static/app.js", "/api/auth/login/", "/favicon.ico"]:
+            route = classify_path(path)
+            assert route.excluded
+            assert route.rate_limit_policy is None
+
+    def test_workspace_optional_paths(self):
+        assert classify_path("/api/workspaces/").workspace_optional
+        assert classify_path("/api/notifications/").workspace_optional
+        assert not classify_path("/api/projects/").workspace_optional
+
+    def test_workspace_id_from_path(self):
+        route = classify_path(f"/api/workspaces/{WS_ID}/projects/")
+        assert route.workspace_id == WS_ID
+        assert route.path_template == f"/api/workspaces/{TEMPLATE_UUID}/projects/"
+        assert route.rate_limit_policy == "default"
+        assert classify_path("/api/workspaces/invitations/").workspace_id is None
+
+    def test_memoized_per_template(self):
+        routing._classify_template.cache_clear()
+        other_ws = "99999999-8888-7777-6666-555555555555"
+        classify_path(f"/api/workspaces/{WS_ID}/dashboard/")
+        route = classify_path(f"/api/workspaces/{other_ws}/dashboard/")
+
+        assert routing._classify_template.cache_info().hits == 1
+        assert route.workspace_id == other_ws
+
+    def test_classification_cached_on_request(self):
+        request = RequestFactory().get(f"/api/workspaces/{WS_ID}/dashboard/")
+        assert get_route_classification(request) is get_route_classification(request)
@@ -1,6 +1,8 @@
 import uuid
 import pytest
+from django.core.cache import cache
 from django.test import RequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
 from apps.users.models.user import User
 from apps.workspace.models import Workspace, WorkspaceMember
 from backend.middleware.middleware import WorkspaceEnforcementMiddleware, JWTAuthenticationMiddleware
@@ -81,3 +83,17 @@ class TestWorkspaceEnforcement:
         assert response is None  # Allowed to proceed
         assert request.workspace_id == ws_id
         assert request.workspace == self.workspace
+
+    def test_jwt_member_checked_without_loading_user(self, django_assert_num_queries):
+        cache.clear()
+        token = str(AccessToken.for_user(self.member))
+        request = self.factory.get(
+            "/api/projects/",
+            HTTP_X_WORKSPACE_ID=str(self.workspace.id),
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        JWTAuthenticationMiddleware(lambda r: None).process_request(request)
+        # Workspace lookup and membership check only, no user query
+        with django_assert_num_queries(2):
+            response = WorkspaceEnforcementMiddleware(lambda r: None).process_request(request)
+        assert response is None
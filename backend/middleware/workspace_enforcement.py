@@ -3,8 +3,11 @@ import uuid
 from typing import Tuple, Optional
 from django.core.cache import cache
 from django.http import JsonResponse
-from apps.workspace.models import Workspace, WorkspaceMember
-from .config import is_path_excluded, is_workspace_optional
+from django.utils.functional import SimpleLazyObject
+from apps.workspace.models import Workspace
+from apps.workspace.utils.membership_cache import EMPTY_MEMBERSHIP, get_membership_map
+from .authentication import get_request_user_id
+from .routing import get_route_classification
 
 # Regex pattern for UUID validation
 UUID_REGEX = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
@@ -31,14 +34,9 @@ def extract_workspace_id(request) -> Optional[str]:
         if UUID_REGEX.match(ws_id):
             return ws_id
 
-    # 3. URL Path Resolver / Regex Check
-    # Resolves pattern like /api/workspaces/<workspace_id>/...
-    path = request.path_info
-    match = re.search(r'/api/workspaces/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', path, re.IGNORECASE)
-    if match:
-        return match.group(1)
-
-    return None
+    # 3. URL Path Check
+    # Resolves pattern like /api/workspaces/<workspace_id>/... from the route classification
+    return get_route_classification(request).workspace_id
 
 
 def get_cached_workspace(workspace_id: str) -> Optional[Workspace]:
@@ -55,34 +53,54 @@ def get_cached_workspace(workspace_id: str) -> Optional[Workspace]:
     return ws
 
 
+def is_platform_admin(user) -> bool:
+    return bool(
+        getattr(user, 'is_superuser', False) or
+        getattr(user, 'is_staff', False) or
+        getattr(user, 'role', '') == 'platform_admin'
+    )
+
+
+def request_membership(request):
+    """
+    Memberships of the token's user, resolved on first use and kept on
+    request.workspace_membership for the rest of the request.
+    """
+    membership = getattr(request, 'workspace_membership', None)
+    if membership is None:
+        user_id = get_request_user_id(request)
+        membership = SimpleLazyObject(lambda: get_membership_map(user_id)) if user_id else EMPTY_MEMBERSHIP
+        request.workspace_membership = membership
+    return membership
+
+
+def check_user_id_workspace_membership(user_id, workspace: Workspace, membership=None) -> bool:
+    """
+    Checks whether user_id owns or is a member of workspace, without loading the user.
+    Membership comes from the user's cached membership map (apps.workspace.utils.membership_cache).
+    """
+    if not user_id:
+        return False
+
+    # Owner check (safely compare string representations to prevent UUID vs str mismatch)
+    if str(workspace.owner_id) == str(user_id):
+        return True
+
+    if membership is None:
+        membership = get_membership_map(user_id)
+    return membership.is_member(workspace.id)
+
+
 def check_user_workspace_membership(user, workspace: Workspace) -> bool:
     """Checks whether authenticated user belongs to workspace (Owner or Member)."""
     if not user or not user.is_authenticated:
         return False
 
     # Platform admins / superusers / staff check
-    if (
-        getattr(user, 'is_superuser', False) or 
-        getattr(user, 'is_staff', False) or 
-        getattr(user, 'role', '') == 'platform_admin'
-    ):
+    if is_platform_admin(user):
         return True
 
-    # Owner check (safely compare string representations to prevent UUID vs str mismatch)
-    if str(workspace.owner_id) == str(user.id):
-        return True
-
-    # Member check cached for 60s
-    cache_key = f"ws_member:{workspace.id}:{user.id}"
-    is_member = cache.get(cache_key)
-    if is_member is None:
-        is_member = WorkspaceMember.objects.filter(
-            workspace=workspace, 
-            user=user
-        ).exists()
-        cache.set(cache_key, is_member, timeout=60)
-
-    return bool(is_member)
+    return check_user_id_workspace_membership(user.id, workspace)
 
 
 class WorkspaceEnforcer:
@@ -98,10 +116,13 @@ class WorkspaceEnforcer:
         Returns:
             (success: bool, response_on_failure: JsonResponse|None, workspace_id: str|None, workspace_obj: Workspace|None)
         """
-        path = request.path_info
+        route = get_route_classification(request)
+
+        user_id = get_request_user_id(request)
+        request_membership(request)
 
         # Skip checks for excluded paths (admin, auth, static, etc.)
-        if is_path_excluded(path):
+        if route.excluded:
             return True, None, None, None
 
         # Check if bypass decorator was set on view function
@@ -112,7 +133,7 @@ class WorkspaceEnforcer:
 
         # Handle missing workspace_id
         if not workspace_id:
-            if is_workspace_optional(path):
+            if route.workspace_optional:
                 return True, None, None, None
             
             # If path requires a workspace and none was provided
@@ -137,10 +158,14 @@ class WorkspaceEnforcer:
                 status=404
             ), None, None
 
-        # Validate Access Permission if User is Authenticated
-        user = getattr(request, 'user', None)
-        if user and user.is_authenticated:
-            if not check_user_workspace_membership(user, workspace):
+        # Validate Access Permission if User is Authenticated.
+        # Owners and members are recognised from the user id alone; the User is only
+        # loaded to check for platform admins.
+        if user_id:
+            if not (
+                check_user_id_workspace_membership(user_id, workspace, request.workspace_membership) or
+                is_platform_admin(request.user)
+            ):
                 return False, JsonResponse(
                     {
                         "error": "Forbidden",
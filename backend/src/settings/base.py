@@ -72,8 +72,8 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "middleware.middleware.JWTAuthenticationMiddleware",
-    "middleware.middleware.WorkspaceEnforcementMiddleware",
     "middleware.middleware.RateLimitMiddleware",
+    "middleware.middleware.WorkspaceEnforcementMiddleware",
     "middleware.middleware.PostgresRLSMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
@@ -95,13 +95,24 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         # "rest_framework.authentication.TokenAuthentication",  # Basic static token auth
         # "rest_framework.authentication.SessionAuthentication",  # Django admin & templates
-        "rest_framework_simplejwt.authentication.JWTAuthentication",  # SPA & mobile apps
+        "middleware.authentication.CachedJWTAuthentication",  # SPA & mobile apps (SimpleJWT, reuses the middleware result)
 
     ],
 
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+
+    # Same output as DRF's JSON renderer/parser, encoded/decoded with orjson
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',  # For guests (not logged in)
@@ -95,6 +95,11 @@ STORAGES = {
 #     }
 # }
 
+# runserver and the test runner are a single process, so the default
+# LocMemCache is shared (see apps.workspace.utils.shared_cache); drop this
+# when serving dev settings from several workers.
+SHARED_CACHE = True
+
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
 
@@ -37,7 +37,12 @@ DATABASES = {
 }
 
 
-# Free-tier friendly cache
+# Free-tier friendly cache. It is per process, and the Procfile runs two
+# workers, so every cache kept current by invalidation is bypassed (see
+# apps.workspace.utils.shared_cache): ETags, membership maps, users and their
+# page sizes, user cards, and dashboard snapshots and overlays. Token
+# revocations are stored in RevokedToken. A shared backend such as Redis turns
+# the caches on.
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
@@ -34,6 +34,7 @@ import Header from "@/components/Header";
 
 import {
   useGetWorkspace,
+  useGetWorkspaceMembers,
   useUpdateWorkspace,
   useUploadWorkspaceImage,
   useUpdateWorkspaceMemberRole,
@@ -63,6 +64,7 @@ const WorkspaceSettingsPage = () => {
 
   const { data: workspace, isLoading: workspaceLoading } =
     useGetWorkspace(workspaceId);
+  const { data: members } = useGetWorkspaceMembers(workspaceId);
   const { data: pendingInvites, isLoading: invitesLoading } =
     useGetWorkspacePendingInvitations(workspaceId);
 
@@ -220,7 +222,7 @@ const WorkspaceSettingsPage = () => {
   };
 
   // Filtered members list
-  const filteredMembers = (workspace.members || []).filter((m: any) => {
+  const filteredMembers = (members || []).filter((m: any) => {
     const email = m.user?.email || "";
     const role = m.role || "";
     return (
@@ -323,7 +325,7 @@ const WorkspaceSettingsPage = () => {
                 <span>•</span>
                 <span className="flex items-center gap-1.5">
                   <Users className="w-4 h-4 text-primary" />
-                  {workspace.members?.length || 0} Members
+                  {workspace.member_count ?? 0} Members
                 </span>
               </div>
             </div>
@@ -363,7 +365,7 @@ const WorkspaceSettingsPage = () => {
             variant="secondary"
             className="px-1.5 py-0 text-[10px] rounded-full"
           >
-            {workspace.members?.length || 0}
+            {workspace.member_count ?? 0}
           </Badge>
         </button>
 
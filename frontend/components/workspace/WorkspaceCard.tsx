@@ -36,7 +36,7 @@ const WorkspaceCard = ({ workspace }: { workspace: any }) => {
           <div className="flex items-center gap-3 text-xs text-muted-foreground">
             <div className="flex items-center gap-1">
               <Users className="w-3.5 h-3.5" />
-              {workspace.members?.length || 0} members
+              {workspace.member_count ?? workspace.members?.length ?? 0} members
             </div>
             <span>•</span>
             <span className="capitalize">{workspace.visibility}</span>
@@ -37,7 +37,7 @@ const ProjectCard = ({ project, workspaceId }: ProjectCardProps) => {
   };
 
   // Calculations
-  const totalTasks = project.tasks?.length || 0;
+  const totalTasks = project.task_count ?? project.tasks?.length ?? 0;
   const completionPercentage =
     totalTasks > 0
       ? Math.round(((project.completed_count || 0) / totalTasks) * 100)
@@ -122,6 +122,7 @@ const ProjectCard = ({ project, workspaceId }: ProjectCardProps) => {
             const membersList = project.members?.length
               ? project.members
               : project.collaborators || [];
+            const memberCount = project.member_count ?? membersList.length;
 
             return (
               <>
@@ -143,9 +144,9 @@ const ProjectCard = ({ project, workspaceId }: ProjectCardProps) => {
                     </Avatar>
                   );
                 })}
-                {membersList.length > 3 && (
+                {memberCount > 3 && (
                   <div className="w-7 h-7 rounded-full bg-secondary border-2 border-card flex items-center justify-center text-[9px] font-bold text-muted-foreground">
-                    +{membersList.length - 3}
+                    +{memberCount - 3}
                   </div>
                 )}
               </>
@@ -158,7 +159,7 @@ const ProjectCard = ({ project, workspaceId }: ProjectCardProps) => {
           <div className="flex items-center gap-1 bg-secondary/40 px-2 py-1 rounded-md">
             <CheckCircle2 className="w-3.5 h-3.5 text-green-500" />
             <span>
-              {project.completed_count || 0}/{project.tasks?.length || 0}
+              {project.completed_count || 0}/{totalTasks}
             </span>
           </div>
         </div>
@@ -3,10 +3,9 @@ import { getAccessToken } from "../actions/auth.actions";
 
 export const documentApi = {
   getDocuments: async (workspaceId: string) => {
-    const res = await apiService.get(
-      `/workspaces/${workspaceId}/documents/`
+    return apiService.getAllPages(
+      `/workspaces/${workspaceId}/documents/?page_size=100`
     );
-    return res;
   },
 
   uploadDocument: async (workspaceId: string, formData: FormData) => {
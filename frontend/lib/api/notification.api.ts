@@ -3,8 +3,9 @@ import { ProfilePType } from "../types/user.types";
 
 export const notificationApi = {
   getAllNotifications: async () => {
+    // Latest page only (unread first)
     const res: any = await apiService.get("/notifications/");
-    return res;
+    return res.results;
   },
   getUnreadNotifications: async () => {
     const res: any = await apiService.get("/notifications/unread/");
@@ -10,7 +10,7 @@ export const projectApi = {
 
   getProject: async (workspaceId: string, projectId: string) => {
     const res = await apiService.get(
-      `/workspaces/${workspaceId}/projects/${projectId}/`,
+      `/workspaces/${workspaceId}/projects/${projectId}/?expand=tasks.comments`,
     );
     return res;
   },
@@ -1,4 +1,5 @@
 import { apiService } from "../services/apiService";
+import { MembersType } from "../types/workspace.types";
 
 export const workspaceApi = {
   createWorkspace: async (serverData: any) => {
@@ -33,7 +34,7 @@ export const workspaceApi = {
     return res;
   },
   getWorkspaceInvitations: async () => {
-    const res = await apiService.get(`/workspaces/invitations/`);
+    const res = await apiService.get(`/workspaces/invitations/?expand=workspace`);
     return res;
   },
   getWorkspacePendingInvitations: async (workspaceId: string) => {
@@ -94,7 +95,8 @@ export const workspaceApi = {
   },
 
   getWorkspaceMembers: async (workspaceId: string) => {
-    const res = await apiService.get(`/workspaces/${workspaceId}/members/`);
-    return res;
+    return apiService.getAllPages<MembersType>(
+      `/workspaces/${workspaceId}/members/?page_size=100`
+    );
   },
 };
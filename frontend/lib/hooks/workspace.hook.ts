@@ -233,6 +233,7 @@ export const useUpdateWorkspaceMemberRole = () => {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["workspaces"] });
       queryClient.invalidateQueries({ queryKey: ["workspace"] });
+      queryClient.invalidateQueries({ queryKey: ["workspace-members"] });
       queryClient.invalidateQueries({ queryKey: ["servers"] });
     },
   });
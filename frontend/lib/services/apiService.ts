@@ -5,6 +5,7 @@ import {
   refreshToken,
 } from "../actions/auth.actions";
 import { extractApiError } from "../utils/api-error";
+import { CursorPageType } from "../types/api.types";
 
 export const getBackendErrorMessage = extractApiError;
 
@@ -140,6 +141,18 @@ export const apiService = {
     return fetchWithCatch(url, options);
   },
 
+  // Follows the `next` cursors of a paginated list and returns every row
+  getAllPages: async function <T = any>(url: string): Promise<T[]> {
+    const rows: T[] = [];
+    let next: string | null = url;
+    while (next) {
+      const page: CursorPageType<T> = await apiService.get(next);
+      rows.push(...page.results);
+      next = page.next ? next.split("?")[0] + new URL(page.next).search : null;
+    }
+    return rows;
+  },
+
   delete: async function (url: string): Promise<any> {
     const token = await getAccessToken();
     return fetchWithCatch(url, {
@@ -0,0 +1,6 @@
+// A page of a cursor-paginated list; follow `next` / `previous` as given
+export type CursorPageType<T> = {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+};
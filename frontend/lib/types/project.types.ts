@@ -43,7 +43,10 @@ export type ProjectType = {
   title: string;
   priority: string;
   description: string;
+  // Lists carry task_count / member_count and a members preview instead of tasks
   tasks: TaskType[];
+  task_count?: number;
+  member_count?: number;
   status: "planning" | "active" | "on_hold" | "completed" | "archived";
   item_count: any;
   visibility: string;
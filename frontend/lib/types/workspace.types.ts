@@ -16,9 +16,12 @@ export type WorkspaceType = {
   logo: string;
   created_at: string;
   user_role: "admin" | "member" | "guest" | "owner";
+  // Preview of the first few members; the full list is paginated under /members/
+  member_count: number;
   members: MembersType[];
 };
 
+
 export interface InvitesType {
   server_name: string;
   invited_by: string;